@@ -0,0 +1,459 @@
+from __future__ import annotations
+
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+import copy
+import json
+import random
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from soma.cogs.memory.ann import LSHIndex
+from soma.cogs.memory.memory import MemorySystem
+from soma.compat import np, require_numpy
+from soma.cogs.perception.embedder import PerceptionEmbedderV2
+from soma.cogs.perception.features import extract_features
+from soma.core.binlog import BinaryEventLog, BinaryEventReader
+from soma.core.events import JsonlEventLog
+from soma.core.sinks import open_sinks, parse_sinks
+from soma.core.store import DURABILITY, EventStore
+from soma.sandbox import make_env
+
+app = typer.Typer(add_completion=False, no_args_is_help=True)
+console = Console()
+
+
+@app.callback()
+def main() -> None:
+    """Micro-benchmarks for SOMA hot paths."""
+
+
+def _perception_vectors(n: int, *, seed: int, env: str, size: int, n_objects: int, view_radius: int) -> List[List[float]]:
+    """Embeddings from a random walk, i.e. the same distribution run_loop stores."""
+    rng = random.Random(seed)
+    e = make_env(env, size=size, n_objects=n_objects, view_radius=view_radius)
+    embedder = PerceptionEmbedderV2(dim=64)
+    obs = e.reset(seed)
+    out: List[List[float]] = []
+    for _ in range(n):
+        out.append(embedder.embed(extract_features(obs, grid_size=size)))
+        obs, _ = e.step(rng.choice(["up", "down", "left", "right", "ping"]))
+    return out
+
+
+@app.command()
+def recall(
+    episodes: int = typer.Option(50_000, help="Episodes stored in memory"),
+    queries: int = typer.Option(200, help="Queries to time"),
+    top_k: int = typer.Option(3, help="k for recall@k"),
+    min_score: float = typer.Option(0.5, help="Minimum cosine, as in run_loop"),
+    bits: List[int] = typer.Option([16, 24], help="LSH bits per table (repeatable)"),
+    tables: List[int] = typer.Option([2, 4], help="LSH tables (repeatable)"),
+    probes: List[int] = typer.Option([0, 4], help="Multi-probe flips per table (repeatable)"),
+    seed: int = typer.Option(0, help="Walk / hyperplane seed"),
+    env: str = typer.Option("grid-v1", help="Environment generating the views"),
+    size: int = typer.Option(41, help="Grid size"),
+    n_objects: int = typer.Option(400, help="Objects in the world"),
+    view_radius: int = typer.Option(2, help="Agent view radius"),
+):
+    """Recall@k and latency of LSH-indexed recall against the exact scan."""
+    backend = "numpy" if np is not None else "list"
+    n = episodes
+    vecs = _perception_vectors(n + queries, seed=seed, env=env, size=size, n_objects=n_objects, view_radius=view_radius)
+    stored, qs = vecs[:n], vecs[n:]
+
+    exact = MemorySystem(dim=64, max_items=n, backend=backend)
+    for t, v in enumerate(stored):
+        exact.add_vector(tick=t, vector=v)
+    t0 = time.perf_counter()
+    truth = [exact.query(q, top_k=top_k, min_score=min_score) for q in qs]
+    exact_ms = 1000.0 * (time.perf_counter() - t0) / max(1, len(qs))
+
+    table = Table(title=f"Recall@{top_k} vs exact scan — n={n}, backend={backend}")
+    for col in ("bits", "tables", "probes", "recall@k", "ms/query", "speedup", "build s"):
+        table.add_column(col, justify="right")
+    table.add_row("-", "-", "-", "1.000", f"{exact_ms:.3f}", "1.0x", "-")
+
+    for b in bits:
+        for nt in tables:
+            t0 = time.perf_counter()
+            mem = MemorySystem(dim=64, max_items=n, backend=backend, index=LSHIndex(64, n_tables=nt, n_bits=b, seed=seed))
+            for t, v in enumerate(stored):
+                mem.add_vector(tick=t, vector=v)
+            build_s = time.perf_counter() - t0
+            for p in probes:
+                t0 = time.perf_counter()
+                got = [mem.query(q, top_k=top_k, min_score=min_score, probes=p) for q in qs]
+                ms = 1000.0 * (time.perf_counter() - t0) / max(1, len(qs))
+                hits, total = _overlap(truth, got)
+                table.add_row(
+                    str(b), str(nt), str(p),
+                    f"{(hits / total) if total else 1.0:.3f}",
+                    f"{ms:.3f}",
+                    f"{exact_ms / ms if ms else 0.0:.1f}x",
+                    f"{build_s:.1f}",
+                )
+    console.print(table)
+
+
+def _overlap(truth: List[List[Tuple[int, float]]], got: List[List[Tuple[int, float]]]) -> Tuple[int, int]:
+    hits = total = 0
+    for a, b in zip(truth, got):
+        want = {t for t, _ in a}
+        total += len(want)
+        hits += len(want & {t for t, _ in b})
+    return hits, total
+
+
+def _tick_event(tick: int) -> Dict[str, Any]:
+    """A payload shaped like run_loop's tick event (≈1.5 KB of JSON)."""
+    return {
+        "type": "tick",
+        "tick": tick,
+        "rng_seed": 1013904223 * tick % (2**32),
+        "planner": {"behavior": "explore", "action_proposed": "left"},
+        "action_final": "left",
+        "reflex": [],
+        "curiosity": {"novelty": 0.412345, "change": 0.5, "rarity": 0.31, "attention": ["G^", "Ro"]},
+        "recall": [{"tick": max(0, tick - 7), "score": 0.91}, {"tick": max(0, tick - 30), "score": 0.77}],
+        "motivation": {"drives": {"curiosity": 0.61, "stability": 0.42, "pattern_completion": 0.2}, "dominant": "curiosity"},
+        "staleness": {"novelty_ema": 0.55, "noop_streak": 0, "repeat_view_streak": 1, "boredom": 0.23},
+        "perception": {"features": {"density": 0.25, "diversity": 0.25, "entropy": 1.0, "unique": ["G^", "Ro"], "counts": {"G^": 1, "Ro": 1}}},
+        "state": {"tick": tick, "drive": "curiosity", "behavior": "explore", "action": "left", "coverage": 0.4},
+        "channel": {"tokens": [], "gloss": [], "caregiver_gloss": []},
+        "view_after": {"unique": ["G^"], "pos": {"x": 3, "y": 4}},
+    }
+
+
+@app.command()
+def store(
+    events: int = typer.Option(20_000, help="Events written per durability setting"),
+    durability: List[str] = typer.Option(list(DURABILITY), help="Settings to compare (repeatable)"),
+    full_cap: int = typer.Option(2_000, help="Cap for 'full' (one fsync per event is slow)"),
+):
+    """Events/sec written to EventStore under each durability setting."""
+    table = Table(title="EventStore throughput")
+    for col in ("durability", "events", "events/s", "rows"):
+        table.add_column(col, justify="right")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in durability:
+            n = min(events, full_cap) if name == "full" else events
+            db = Path(tmp) / f"{name}.sqlite"
+            st = EventStore(db, run_id="bench", **DURABILITY[name])
+            t0 = time.perf_counter()
+            for t in range(n):
+                st.write(event_type="tick", tick=t, payload=_tick_event(t))
+            st.close()
+            dt = time.perf_counter() - t0
+            with closing(sqlite3.connect(str(db))) as conn:
+                rows = conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+            table.add_row(name, str(n), f"{n / dt:,.0f}", str(rows))
+    console.print(table)
+
+
+@app.command()
+def sinks(
+    events: int = typer.Option(20_000, help="Tick events emitted per configuration"),
+    combos: List[str] = typer.Option(
+        ["jsonl,sqlite", "jsonl", "sqlite", "binary", "null"], help="Sink sets to compare (repeatable)"
+    ),
+    durability: str = typer.Option("normal", help="SQLite durability for the sqlite sink"),
+):
+    """Events/sec through EventSinks (one encoding per event) vs writing log and store separately."""
+    table = Table(title=f"Event sinks — {events:,} tick events, durability={durability}")
+    for col in ("sinks", "events/s"):
+        table.add_column(col, justify="right")
+    payloads = [_tick_event(t) for t in range(events)]
+    with tempfile.TemporaryDirectory() as tmp:
+        run_dir = Path(tmp) / "legacy"
+        run_dir.mkdir()
+        log = JsonlEventLog(run_dir / "events.jsonl")
+        st = EventStore(run_dir / "events.sqlite", run_id="bench", **DURABILITY[durability])
+        t0 = time.perf_counter()
+        for t, e in enumerate(payloads):
+            log.write(e)
+            st.write(event_type="tick", tick=t, payload=e)
+        log.close()
+        st.close()
+        table.add_row("jsonl,sqlite (encode twice)", f"{events / (time.perf_counter() - t0):,.0f}")
+        for i, spec in enumerate(combos):
+            run_dir = Path(tmp) / f"c{i}"
+            run_dir.mkdir()
+            out = open_sinks(run_dir, "bench", parse_sinks(spec), durability=durability)
+            t0 = time.perf_counter()
+            for e in payloads:
+                out.emit(e)
+            out.close()
+            table.add_row(spec, f"{events / (time.perf_counter() - t0):,.0f}")
+    console.print(table)
+
+
+@app.command()
+def embed(
+    views: int = typer.Option(20_000, help="Observations embedded per path"),
+    batch: int = typer.Option(16, help="Observations per embed_many call"),
+    seed: int = typer.Option(0, help="Walk seed"),
+    env: str = typer.Option("grid-v0", help="Environment generating the views (grid-v0 reports token counts)"),
+    size: int = typer.Option(41, help="Grid size"),
+    n_objects: int = typer.Option(400, help="Objects in the world"),
+    view_radius: int = typer.Option(2, help="Agent view radius"),
+):
+    """Embeddings/sec: uncached token hashing vs memoized slots, reusable buffers and embed_many."""
+    rng = random.Random(seed)
+    e = make_env(env, size=size, n_objects=n_objects, view_radius=view_radius)
+    obs = e.reset(seed)
+    feats = []
+    for _ in range(views):
+        feats.append(extract_features(obs, grid_size=size))
+        obs, _ = e.step(rng.choice(["up", "down", "left", "right", "ping"]))
+    embedder = PerceptionEmbedderV2(dim=64)
+    ref = [embedder.embed(f) for f in feats]
+
+    def cold() -> None:
+        for f in feats:
+            embedder._slots.clear()  # every token re-hashed, as before memoization
+            embedder.embed(f)
+
+    def warm() -> None:
+        for f in feats:
+            embedder.embed(f)
+
+    def buffered() -> None:
+        buf = [0.0] * embedder.dim
+        for f in feats:
+            embedder.embed(f, out=buf)
+
+    paths = [("embed (no slot cache)", cold), ("embed", warm), ("embed(out=list)", buffered)]
+    if np is not None:
+        arr = np.zeros((batch, embedder.dim))
+
+        def batched() -> None:
+            for i in range(0, len(feats), batch):
+                embedder.embed_many(feats[i : i + batch], out=arr)
+
+        paths.append((f"embed_many(out=array), B={batch}", batched))
+        got = np.vstack([embedder.embed_many(feats[i : i + batch], out=arr).copy() for i in range(0, len(feats), batch)])
+        if not np.array_equal(got, np.asarray(ref)):
+            raise typer.Exit(code=1)
+
+    table = Table(title=f"Perception embedding — {views:,} views, env={env}")
+    for col in ("path", "embeds/s"):
+        table.add_column(col, justify="right")
+    for name, fn in paths:
+        t0 = time.perf_counter()
+        fn()
+        table.add_row(name, f"{views / (time.perf_counter() - t0):,.0f}")
+    console.print(table)
+
+
+@app.command()
+def perceive(
+    steps: int = typer.Option(5_000, help="Env steps per configuration"),
+    radii: List[int] = typer.Option([1, 3, 7], help="View radii to compare (repeatable)"),
+    env: List[str] = typer.Option(["grid-v0", "grid-v1"], help="Environments (repeatable)"),
+    size: int = typer.Option(41, help="Grid size"),
+    n_objects: int = typer.Option(300, help="Objects in the world"),
+    seed: int = typer.Option(0, help="Walk seed"),
+):
+    """env.step + extract_features per second with token-string vs integer-array views."""
+    table = Table(title=f"Perception — {steps:,} steps, size={size}")
+    for col in ("env", "radius", "tokens steps/s", "array steps/s"):
+        table.add_column(col, justify="right")
+    for name in env:
+        for r in radii:
+            rates = []
+            for mode in ("tokens", "array"):
+                e = make_env(name, size=size, n_objects=n_objects, view_radius=r, obs_mode=mode)
+                e.reset(seed)
+                rng = random.Random(seed)
+                acts = [rng.choice(["up", "down", "left", "right", "ping"]) for _ in range(steps)]
+                t0 = time.perf_counter()
+                for a in acts:
+                    obs, _ = e.step(a)
+                    extract_features(obs, grid_size=size)
+                rates.append(f"{steps / (time.perf_counter() - t0):,.0f}")
+            table.add_row(name, str(r), *rates)
+    console.print(table)
+
+
+@app.command()
+def vecenv(
+    steps: int = typer.Option(200, help="Ticks per configuration"),
+    batch: List[int] = typer.Option([64, 1024, 8192], help="Worlds per VecGridWorld (repeatable)"),
+    env: List[str] = typer.Option(["grid-v0", "grid-v1"], help="Environments (repeatable)"),
+    size: int = typer.Option(41, help="Grid size"),
+    n_objects: int = typer.Option(300, help="Objects in the world"),
+    view_radius: int = typer.Option(1, help="View radius"),
+    seed: int = typer.Option(0, help="Action seed"),
+):
+    """Env steps per second: a loop over single envs vs one VecGridWorld.step per tick."""
+    require_numpy("bench vecenv")
+    table = Table(title=f"Batched envs — {steps:,} ticks, size={size}")
+    for col in ("env", "batch", "single steps/s", "vec steps/s"):
+        table.add_column(col, justify="right")
+    rng = np.random.default_rng(seed)
+    for name in env:
+        for B in batch:
+            acts = rng.integers(0, 6, size=(steps, B))
+            singles = [make_env(name, size=size, n_objects=n_objects, view_radius=view_radius, obs_mode="array") for _ in range(B)]
+            for b, e in enumerate(singles):
+                e.reset(b)
+            names = ["noop", "up", "down", "left", "right", "ping"]
+            t_steps = max(1, steps * 64 // B)  # the single-env loop is slow; time fewer ticks
+            t0 = time.perf_counter()
+            for t in range(min(t_steps, steps)):
+                for e, a in zip(singles, acts[t].tolist()):
+                    e.step(names[a])
+            single = min(t_steps, steps) * B / (time.perf_counter() - t0)
+            vec = make_env(name, size=size, n_objects=n_objects, view_radius=view_radius, batch=B)
+            vec.reset(list(range(B)))
+            t0 = time.perf_counter()
+            for t in range(steps):
+                vec.step(acts[t])
+            table.add_row(name, str(B), f"{single:,.0f}", f"{steps * B / (time.perf_counter() - t0):,.0f}")
+    console.print(table)
+
+
+@app.command()
+def world(
+    sizes: List[int] = typer.Option([201, 1001, 3001], help="Grid sizes to compare (repeatable, odd)"),
+    density: float = typer.Option(0.3, help="Objects per cell"),
+    chunk: int = typer.Option(64, help="Chunk side for the chunked mode"),
+    steps: int = typer.Option(2_000, help="Random-walk steps after reset"),
+    view_radius: int = typer.Option(3, help="View radius"),
+    seed: int = typer.Option(0, help="World / walk seed"),
+):
+    """grid-v0 reset + walk time and peak memory: dense grid vs lazily generated chunks."""
+    table = Table(title=f"grid-v0 world generation — density {density}, {steps:,} steps")
+    for col in ("size", "mode", "reset s", "walk s", "peak MB", "chunks"):
+        table.add_column(col, justify="right")
+    for size in sizes:
+        for c in (0, chunk):
+            env = make_env("grid-v0", size=size, n_objects=int(density * size * size), view_radius=view_radius, chunk=c)
+            rng = random.Random(seed)
+            acts = [rng.choice(["up", "down", "left", "right"]) for _ in range(steps)]
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            env.reset(seed)
+            t1 = time.perf_counter()
+            for a in acts:
+                env.step(a)
+            t2 = time.perf_counter()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            loaded = str(env.chunk_stats()["generated"]) if c else "-"
+            table.add_row(str(size), f"chunk={c}" if c else "dense", f"{t1 - t0:.3f}", f"{t2 - t1:.3f}", f"{peak / 1e6:.1f}", loaded)
+            del env
+    console.print(table)
+
+
+@app.command()
+def snapshot(
+    forks: int = typer.Option(2_000, help="Snapshot/restore round trips per configuration"),
+    env: List[str] = typer.Option(["grid-v0", "grid-v1"], help="Environments (repeatable)"),
+    size: int = typer.Option(41, help="Grid size"),
+    n_objects: List[int] = typer.Option([14, 300], help="Objects in the world (repeatable)"),
+    seed: int = typer.Option(0, help="World / walk seed"),
+):
+    """Forking an env: copy.deepcopy vs snapshot() + restore()."""
+    table = Table(title=f"Env forks — {forks:,} round trips, size={size}")
+    for col in ("env", "objects", "deepcopy µs", "snapshot µs", "restore µs"):
+        table.add_column(col, justify="right")
+    for name in env:
+        for n in n_objects:
+            e = make_env(name, size=size, n_objects=n, view_radius=1)
+            e.reset(seed)
+            rng = random.Random(seed)
+            for _ in range(50):
+                e.step(rng.choice(["up", "down", "left", "right", "ping"]))
+            t0 = time.perf_counter()
+            for _ in range(max(1, forks // 10)):
+                copy.deepcopy(e)
+            t_copy = (time.perf_counter() - t0) / max(1, forks // 10)
+            t0 = time.perf_counter()
+            for _ in range(forks):
+                snap = e.snapshot()
+            t_snap = (time.perf_counter() - t0) / forks
+            t0 = time.perf_counter()
+            for _ in range(forks):
+                e.step("ping")
+                e.restore(snap)
+            t_restore = (time.perf_counter() - t0) / forks
+            t0 = time.perf_counter()
+            for _ in range(forks):
+                e.step("ping")
+            t_restore -= (time.perf_counter() - t0) / forks  # minus the step in the loop above
+            e.restore(snap)
+            table.add_row(name, str(n), f"{t_copy * 1e6:,.1f}", f"{t_snap * 1e6:,.1f}", f"{t_restore * 1e6:,.1f}")
+    console.print(table)
+
+
+def _files_size(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.parent.glob(path.name + "*"))
+
+
+@app.command()
+def eventlog(
+    ticks: int = typer.Option(1_000_000, help="Tick events written to each format"),
+    reads: int = typer.Option(1_000, help="Random single-tick reads from the binary log"),
+    jsonl_reads: int = typer.Option(5, help="Random single-tick reads from JSONL (full scans)"),
+    seed: int = typer.Option(0, help="Payload / read-order seed"),
+):
+    """Size, write and read speed of JsonlEventLog vs the binary event log."""
+    rng = random.Random(seed)
+    table = Table(title=f"Event log formats — {ticks:,} tick events")
+    for col in ("format", "bytes", "bytes/event", "write s", "scan s", "tick read ms"):
+        table.add_column(col, justify="right")
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for name, cls in (("jsonl", JsonlEventLog), ("binary", BinaryEventLog)):
+            path = Path(tmp) / ("events.jsonl" if name == "jsonl" else "events.bin")
+            log = cls(path)
+            r = random.Random(seed)
+            t0 = time.perf_counter()
+            for t in range(ticks):
+                e = _tick_event(t)
+                e["curiosity"]["novelty"] = round(r.random(), 6)
+                e["staleness"]["boredom"] = round(r.random(), 3)
+                log.write(e)
+            log.close()
+            results[name] = (path, time.perf_counter() - t0)
+
+        jpath, jwrite = results["jsonl"]
+        t0 = time.perf_counter()
+        with jpath.open("r", encoding="utf-8") as f:
+            n = sum(1 for line in f if json.loads(line))
+        jscan = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for _ in range(jsonl_reads):
+            want = rng.randrange(ticks)
+            with jpath.open("r", encoding="utf-8") as f:
+                for line in f:
+                    if json.loads(line)["tick"] == want:
+                        break
+        jread = 1000.0 * (time.perf_counter() - t0) / max(1, jsonl_reads)
+        jsize = jpath.stat().st_size
+        table.add_row("jsonl", f"{jsize:,}", f"{jsize / max(1, n):.0f}", f"{jwrite:.1f}", f"{jscan:.1f}", f"{jread:.3f}")
+
+        bpath, bwrite = results["binary"]
+        reader = BinaryEventReader(bpath)
+        t0 = time.perf_counter()
+        n = sum(1 for _ in reader)
+        bscan = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for _ in range(reads):
+            reader.events_at(rng.randrange(ticks))
+        bread = 1000.0 * (time.perf_counter() - t0) / max(1, reads)
+        bsize = _files_size(bpath)  # includes .keys and .idx sidecars
+        table.add_row("binary", f"{bsize:,}", f"{bsize / max(1, n):.0f}", f"{bwrite:.1f}", f"{bscan:.1f}", f"{bread:.3f}")
+    console.print(table)
+
+
+if __name__ == "__main__":
+    app()
@@ -5,9 +5,18 @@ from typing import List
 import json
 import typer
 
+from soma.core.catalog import resolve_run
+
 app = typer.Typer(add_completion=False, no_args_is_help=True)
 
 
+def _resolve(runs_dir: Path, ref: str) -> Path:
+    try:
+        return resolve_run(runs_dir, ref)
+    except FileNotFoundError as e:
+        raise typer.BadParameter(str(e))
+
+
 def _load_jsonl(path: Path):
     if not path.exists():
         return []
@@ -22,9 +31,12 @@ def _load_jsonl(path: Path):
 
 
 @app.command()
-def ls(run_dir: Path = typer.Argument(..., help="Run directory, e.g. runs/m10care_2025...")):
+def ls(
+    run: str = typer.Argument(..., help="Run directory (e.g. runs/m10care_2025...), a run id, or 'last'"),
+    runs_dir: Path = typer.Option(Path("runs"), help="Runs directory (catalog) for ids and 'last'"),
+):
     """List outstanding queries."""
-    run_dir = Path(run_dir)
+    run_dir = _resolve(runs_dir, run)
     queries = _load_jsonl(run_dir / "caregiver_queries.jsonl")
     answers = _load_jsonl(run_dir / "caregiver_answers.jsonl")
     answered = {a.get("qid") for a in answers}
@@ -54,7 +66,7 @@ def _parse_tags(items: List[str]) -> dict:
 
 @app.command()
 def answer(
-    run_dir: Path = typer.Argument(..., help="Run directory"),
+    run: str = typer.Argument(..., help="Run directory, a run id, or 'last'"),
     qid: str = typer.Option(..., help="Query id to answer (from ls)"),
     tag: List[str] = typer.Option(
         None,
@@ -62,9 +74,10 @@ def answer(
              "Ex: --tag N!=sudden-color-change --tag ?=object-behaved-different",
     ),
     note: str = typer.Option("", help="Optional note for this answer"),
+    runs_dir: Path = typer.Option(Path("runs"), help="Runs directory (catalog) for ids and 'last'"),
 ):
     """Answer a query with token->gloss tags."""
-    run_dir = Path(run_dir)
+    run_dir = _resolve(runs_dir, run)
     tags = _parse_tags(tag)
     path_a = run_dir / "caregiver_answers.jsonl"
     obj = {
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from soma.core.catalog import find_runs, rebuild as rebuild_catalog
+
+app = typer.Typer(add_completion=False, no_args_is_help=True)
+console = Console()
+
+
+@app.command()
+def ls(
+    runs_dir: Path = typer.Option(Path("runs"), help="Runs directory"),
+    env: Optional[str] = typer.Option(None, help="Only this environment"),
+    seed_min: Optional[int] = typer.Option(None, help="Seed >= this"),
+    seed_max: Optional[int] = typer.Option(None, help="Seed <= this"),
+    since: Optional[str] = typer.Option(None, help="Created at/after (UTC ISO date or time, e.g. 2026-10-01)"),
+    until: Optional[str] = typer.Option(None, help="Created before (UTC ISO date or time)"),
+    status: Optional[str] = typer.Option(None, help="running | done | failed | unknown"),
+    limit: int = typer.Option(50, help="Max runs to list (newest first)"),
+) -> None:
+    """List catalogued runs matching the filters."""
+    rows = find_runs(
+        runs_dir, env=env, seed_min=seed_min, seed_max=seed_max, since=since, until=until, status=status, limit=limit
+    )
+    table = Table(title=f"Runs — {runs_dir}")
+    for col in ("run_id", "created_at", "env", "size", "seed", "ticks", "status"):
+        table.add_column(col)
+    for r in rows:
+        table.add_row(*(str(r[c]) if r[c] is not None else "-" for c in ("run_id", "created_at", "env", "size", "seed", "ticks", "status")))
+    console.print(table)
+
+
+@app.command()
+def rebuild(runs_dir: Path = typer.Option(Path("runs"), help="Runs directory")) -> None:
+    """Re-scan runs_dir and add runs missing from the catalog (e.g. made before it existed)."""
+    typer.echo(f"Catalogued {rebuild_catalog(runs_dir)} runs in {runs_dir}")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional
+import time
+import typer
+
+from soma.core.binlog import binary_to_jsonl, jsonl_to_binary
+
+app = typer.Typer(add_completion=False, no_args_is_help=True)
+
+
+def _resolve(path: Path, name: str) -> Path:
+    return path / name if path.is_dir() else path
+
+
+@app.command("to-bin")
+def to_bin(
+    src: Path = typer.Argument(..., help="Run directory or events.jsonl"),
+    dst: Optional[Path] = typer.Option(None, help="Output log (default: events.bin next to the input)"),
+):
+    """Convert events.jsonl to the compact binary event log (+ .keys/.idx sidecars)."""
+    src = _resolve(src, "events.jsonl")
+    out = dst or src.with_name("events.bin")
+    if out.exists():
+        raise typer.BadParameter(f"{out} already exists")
+    t0 = time.perf_counter()
+    n = jsonl_to_binary(src, out)
+    typer.echo(f"{n} events → {out} ({out.stat().st_size:,} bytes vs {src.stat().st_size:,}) in {time.perf_counter() - t0:.1f}s")
+
+
+@app.command("to-jsonl")
+def to_jsonl(
+    src: Path = typer.Argument(..., help="Run directory or events.bin"),
+    dst: Optional[Path] = typer.Option(None, help="Output JSONL (default: events.jsonl next to the input)"),
+):
+    """Convert a binary event log back to JSONL (same line format as JsonlEventLog)."""
+    src = _resolve(src, "events.bin")
+    out = dst or src.with_name("events.jsonl")
+    if out.exists():
+        raise typer.BadParameter(f"{out} already exists")
+    n = binary_to_jsonl(src, out)
+    typer.echo(f"{n} events → {out}")
+
+
+if __name__ == "__main__":
+    app()
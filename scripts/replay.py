@@ -1,66 +1,110 @@
 from __future__ import annotations
 
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple
 import sqlite3
 import json
 import typer
 from rich.console import Console
 from rich.table import Table
 
+from soma.core.catalog import resolve_run
+from soma.eval.metrics import iter_events
+
 app = typer.Typer(add_completion=False, no_args_is_help=True)
 console = Console()
 
 
-def _latest_run_dir(runs_dir: Path) -> Path:
-    candidates = [p for p in runs_dir.iterdir() if p.is_dir()]
-    if not candidates:
-        raise typer.BadParameter(f"No runs found in {runs_dir}")
-    return max(candidates, key=lambda p: p.stat().st_mtime)
+def _resolve(runs_dir: Path, ref: str) -> Path:
+    try:
+        return resolve_run(runs_dir, ref)
+    except FileNotFoundError as e:
+        raise typer.BadParameter(str(e))
+
+
+def _replay_metrics(conn: sqlite3.Connection, run_dir: Path, limit: int) -> None:
+    try:
+        rows = conn.execute(
+            "SELECT tick, dominant, behavior, action, novelty, boredom, top_score, coverage, tokens "
+            "FROM tick_metrics ORDER BY tick LIMIT ?",
+            (limit,),
+        ).fetchall()
+    except sqlite3.OperationalError:
+        raise typer.BadParameter(f"{run_dir} has no tick_metrics table (run predates it)")
+    table = Table(title=f"Tick metrics — {run_dir.name}")
+    for col in ("Tick", "Drive", "Behavior", "Act", "Novelty", "Bored", "TopSim", "Cover", "Sym"):
+        table.add_column(col, justify="right" if col in ("Tick", "Novelty", "Bored", "TopSim", "Cover") else "left")
+    for tick, drive, beh, act, nov, brd, top, cov, toks in rows:
+        table.add_row(str(tick), drive, beh, act, f"{nov:.2f}", f"{brd:.2f}", f"{top:.2f}", f"{cov:.2f}", toks or "-")
+    console.print(table)
+
+
+def _log_rows(run_dir: Path, kind: List[str], limit: int, from_tick: Optional[int]) -> List[Tuple[Any, str, str]]:
+    """Rows from the event log (events.jsonl, rotated events/ segments or events.bin)."""
+    events = (e for e in iter_events(run_dir, start=from_tick) if not kind or e.get("type") in kind)
+    return [(e.get("tick"), str(e.get("type")), json.dumps(e)) for e in islice(events, limit)]
 
 
 @app.command()
 def replay(
     runs_dir: Path = typer.Option(Path("runs"), help="Directory containing runs"),
     run_path: Optional[Path] = typer.Option(None, help="Specific run directory to replay"),
+    run: str = typer.Option("last", help="Run id from the runs/ catalog, or 'last'"),
     kind: List[str] = typer.Option([], help="Filter by event type(s), e.g. --kind tick --kind note"),
     limit: int = typer.Option(200, help="Max events to display"),
+    metrics: bool = typer.Option(False, help="Show the typed per-tick metrics table instead of raw events"),
+    log: bool = typer.Option(False, help="Read the event log (incl. rotated segments) instead of events.sqlite"),
+    from_tick: Optional[int] = typer.Option(None, help="Start at this tick"),
 ):
-    """Replay events from a SOMA run (reads events.sqlite)."""
-    run_dir = run_path or _latest_run_dir(runs_dir)
+    """Replay events from a SOMA run (reads events.sqlite, or the event log with --log)."""
+    run_dir = run_path or _resolve(runs_dir, run)
     db = run_dir / "events.sqlite"
+    if log:
+        _print_rows(run_dir, _log_rows(run_dir, kind, limit, from_tick))
+        return
     if not db.exists():
         raise typer.BadParameter(f"No events.sqlite in {run_dir}")
 
     conn = sqlite3.connect(str(db))
     try:
+        if metrics:
+            _replay_metrics(conn, run_dir, limit)
+            return
         cur = conn.cursor()
+        where, params = [], []
         if kind:
-            placeholders = ",".join(["?"] * len(kind))
-            q = f"SELECT tick, type, data FROM events WHERE type IN ({placeholders}) ORDER BY tick, id LIMIT ?"
-            params = (*kind, limit)
-        else:
-            q = "SELECT tick, type, data FROM events ORDER BY tick, id LIMIT ?"
-            params = (limit,)
-        rows = cur.execute(q, params).fetchall()
-
-        table = Table(title=f"Replay — {run_dir.name}")
-        table.add_column("Tick", justify="right")
-        table.add_column("Type")
-        table.add_column("Summary")
-
-        for tick, etype, data_json in rows:
-            try:
-                data = json.loads(data_json)
-                summary = data.get("note") or data.get("payload") or data.get("type")
-                summary = str(summary)[:80]
-            except Exception:
-                summary = data_json[:80]
-            table.add_row(str(tick), etype, summary)
-
-        console.print(table)
+            where.append(f"type IN ({','.join(['?'] * len(kind))})")
+            params += kind
+        if from_tick is not None:
+            where.append("tick >= ?")
+            params.append(from_tick)
+        q = "SELECT tick, type, data FROM events"
+        if where:
+            q += " WHERE " + " AND ".join(where)
+        q += " ORDER BY tick, id LIMIT ?"
+        rows = cur.execute(q, (*params, limit)).fetchall()
     finally:
         conn.close()
+    _print_rows(run_dir, rows)
+
+
+def _print_rows(run_dir: Path, rows: List[Tuple[Any, str, str]]) -> None:
+    table = Table(title=f"Replay — {run_dir.name}")
+    table.add_column("Tick", justify="right")
+    table.add_column("Type")
+    table.add_column("Summary")
+
+    for tick, etype, data_json in rows:
+        try:
+            data = json.loads(data_json)
+            summary = data.get("note") or data.get("payload") or data.get("type")
+            summary = str(summary)[:80]
+        except Exception:
+            summary = data_json[:80]
+        table.add_row(str(tick), etype, summary)
+
+    console.print(table)
 
 
 if __name__ == "__main__":
@@ -1,14 +1,70 @@
 from __future__ import annotations
 
 from pathlib import Path
-from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
 import typer
 
+from soma.cogs.self_notes.notes import check_note_levels
+from soma.core.batch import run_batch
+from soma.core.runs import new_run_id
+from soma.core.sinks import parse_sinks
 from soma.core.tick import run_loop
 
 app = typer.Typer(add_completion=False, no_args_is_help=True)
 
 
+def _parse_sinks(spec: str) -> Optional[List[str]]:
+    if not spec:
+        return None
+    try:
+        return parse_sinks(spec)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
+
+def _parse_note_levels(specs: List[str]) -> Dict[str, str]:
+    out: Dict[str, str] = {}
+    for spec in specs:
+        kind, sep, level = spec.partition("=")
+        if not sep or not kind.strip():
+            raise typer.BadParameter(f"expected kind=level, got {spec!r}")
+        out[kind.strip()] = level.strip()
+    try:
+        return check_note_levels(out)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
+
+def _check_batch_options(**given: Any) -> None:
+    """--batch runs go through run_batch, which has none of these options: refuse them loudly."""
+    defaults = {
+        "view_cache": 1024,
+        "obs_mode": "tokens",
+        "async_io": False,
+        "event_format": "jsonl",
+        "segment_mb": 0.0,
+        "segment_ticks": 0,
+        "compress": "gzip",
+        "sinks": "",
+        "full_every": 1,
+        "note_level": [],
+        "warehouse": None,
+        "profile": False,
+    }
+    bad = ["--" + k.replace("_", "-") for k, v in given.items() if k in defaults and v != defaults[k]]
+    if given.get("memory_backend") not in ("list", "numpy"):
+        bad.insert(0, "--memory-backend")  # batched agents always use array (numpy) memory
+    if bad:
+        raise typer.BadParameter(f"not supported with --batch > 1: {', '.join(bad)}", param_hint="--batch")
+    if given.get("chunk"):
+        # forwarding it would not help: StalenessBatch keeps dense (B, size, size) visit maps
+        raise typer.BadParameter(
+            "--chunk is not supported with --batch > 1 (batched agents keep dense size x size state); "
+            "run chunked worlds one seed at a time",
+            param_hint="--batch",
+        )
+
+
 @app.command()
 def run(
     ticks: int = typer.Option(60, help="Number of cognitive ticks to run"),
@@ -18,20 +74,93 @@ def run(
     size: int = typer.Option(9, help="Grid size (must be odd)"),
     n_objects: int = typer.Option(18, help="Number of objects to place"),
     view_radius: int = typer.Option(1, help="Agent view radius"),
+    memory_backend: str = typer.Option("list", help="Memory backend: list | numpy (needs numpy) | sparse"),
+    dim: int = typer.Option(64, help="Perception/memory vector dimension (e.g. 1024 with --memory-backend sparse)"),
+    view_cache: int = typer.Option(1024, help="Views kept in the perception/recall LRU cache (0 = off)"),
+    obs_mode: str = typer.Option("tokens", help="Observation views: tokens (strings) | array (uint8 codes; needs numpy)"),
+    chunk: int = typer.Option(0, help="grid-v0 only: generate the world lazily in CxC chunks (for --size in the thousands)"),
+    durability: str = typer.Option("full", help="SQLite durability: full | normal | off"),
+    async_io: bool = typer.Option(False, help="Write run artifacts on a background writer thread"),
+    event_format: str = typer.Option("jsonl", help="Event log format: jsonl | binary (events.bin + .keys/.idx)"),
+    segment_mb: float = typer.Option(0.0, help="Rotate the event log into events/ segments of this many MB (0 = off)"),
+    segment_ticks: int = typer.Option(0, help="Rotate the event log every N ticks (0 = off)"),
+    compress: str = typer.Option("gzip", help="Compression for closed segments: gzip | lzma | none"),
+    sinks: str = typer.Option("", help="Event sinks, comma-separated: jsonl,sqlite,binary,null (default: --event-format + sqlite)"),
+    full_every: int = typer.Option(1, help="Log the full tick event every N ticks (+ interesting ticks); compact records otherwise"),
+    note_level: List[str] = typer.Option([], help="Note verbosity per kind, e.g. --note-level curiosity=brief --note-level '*=off' (off | brief | full)"),
+    warehouse: Optional[Path] = typer.Option(None, help="Also write this run live into a cross-run warehouse database"),
+    profile: bool = typer.Option(False, help="Time each tick phase and write profile.json"),
+    batch: int = typer.Option(1, help="Run seeds seed..seed+batch-1 in lockstep (array state; needs numpy)"),
 ):
     """Run the SOMA core loop (M10 — Caregiver v0)."""
-    run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-    out_dir = runs_dir / f"m10care_{run_id}"
+    sink_names = _parse_sinks(sinks)
+    levels = _parse_note_levels(note_level)
+    run_id = new_run_id("m10care")
+    if batch > 1:
+        _check_batch_options(
+            memory_backend=memory_backend,
+            view_cache=view_cache,
+            obs_mode=obs_mode,
+            chunk=chunk,
+            async_io=async_io,
+            event_format=event_format,
+            segment_mb=segment_mb,
+            segment_ticks=segment_ticks,
+            compress=compress,
+            sinks=sinks,
+            full_every=full_every,
+            note_level=note_level,
+            warehouse=warehouse,
+            profile=profile,
+        )
+        seeds = [seed + i for i in range(batch)]
+        ids = [f"{run_id}_s{s}" for s in seeds]
+        dirs = [runs_dir / i for i in ids]
+        for d in dirs:
+            d.mkdir(parents=True, exist_ok=False)
+        run_batch(
+            ticks=ticks,
+            seeds=seeds,
+            run_dirs=dirs,
+            run_ids=ids,
+            env_name=env,
+            size=size,
+            n_objects=n_objects,
+            view_radius=view_radius,
+            dim=dim,
+            durability=durability,
+            catalog=runs_dir,
+        )
+        typer.echo(f"Done. See {runs_dir} ({batch} runs)")
+        return
+    out_dir = runs_dir / run_id
     out_dir.mkdir(parents=True, exist_ok=False)
     run_loop(
         ticks=ticks,
         seed=seed,
         run_dir=out_dir,
-        run_id=f"m10care_{run_id}",
+        run_id=run_id,
         env_name=env,
         size=size,
         n_objects=n_objects,
         view_radius=view_radius,
+        memory_backend=memory_backend,
+        dim=dim,
+        view_cache=view_cache,
+        obs_mode=obs_mode,
+        chunk=chunk,
+        durability=durability,
+        async_io=async_io,
+        profile=profile,
+        event_format=event_format,
+        segment_mb=segment_mb,
+        segment_ticks=segment_ticks,
+        compress=compress,
+        sinks=sink_names,
+        full_every=full_every,
+        note_levels=levels,
+        warehouse=warehouse,
+        catalog=runs_dir,
     )
     typer.echo(f"Done. See {out_dir}")
 
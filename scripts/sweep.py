@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List, Optional
+import os
+
+import typer
+
+from soma.core.runs import new_run_id
+from soma.core.sweep import expand_grid, parse_param, parse_seeds, run_sweep, write_table
+
+app = typer.Typer(add_completion=False, no_args_is_help=True)
+
+
+@app.command()
+def sweep(
+    seeds: str = typer.Option("0-3", help="Seeds, e.g. '0-9' or '1,5,7'"),
+    env: List[str] = typer.Option(["grid-v0"], help="Environment(s); repeat for several"),
+    size: List[int] = typer.Option([9], help="Grid size(s)"),
+    n_objects: List[int] = typer.Option([18], help="Object count(s)"),
+    view_radius: List[int] = typer.Option([1], help="View radius(es)"),
+    param: List[str] = typer.Option([], help="Cog threshold axis, e.g. curiosity.novelty_threshold=0.5,0.7"),
+    ticks: int = typer.Option(200, help="Ticks per cell"),
+    workers: int = typer.Option(0, help="Worker processes (0 = CPU count)"),
+    runs_dir: Path = typer.Option(Path("runs"), help="Directory to store run artifacts"),
+    name: Optional[str] = typer.Option(None, help="Sweep name; reuse it to resume an interrupted sweep"),
+    memory_backend: str = typer.Option("list", help="Memory backend: list | numpy (needs numpy) | sparse"),
+    dim: int = typer.Option(64, help="Perception/memory vector dimension"),
+    durability: str = typer.Option("normal", help="SQLite durability: full | normal | off"),
+    warehouse: Optional[Path] = typer.Option(None, help="Write every cell live into this warehouse database"),
+):
+    """Run a grid of seeds × envs × cog parameters in parallel and aggregate their metrics."""
+    try:
+        cells = expand_grid(
+            seeds=parse_seeds(seeds),
+            envs=env,
+            sizes=size,
+            n_objects=n_objects,
+            view_radii=view_radius,
+            params=[parse_param(p) for p in param],
+        )
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+    sweep_dir = runs_dir / (name or new_run_id("sweep"))
+    n_workers = workers if workers > 0 else (os.cpu_count() or 1)
+    typer.echo(f"Sweep {sweep_dir}: {len(cells)} cells on {n_workers} workers")
+
+    def progress(cid: str, row, err) -> None:
+        typer.echo(f"  {'FAIL' if err else 'ok  '} {cid}" + (f": {err!r}" if err else ""))
+
+    rows, errors = run_sweep(
+        sweep_dir,
+        cells,
+        ticks=ticks,
+        workers=n_workers,
+        run_kwargs={"memory_backend": memory_backend, "dim": dim, "durability": durability, "warehouse": warehouse, "catalog": runs_dir},
+        on_result=progress,
+    )
+    csv_path, md_path = write_table(rows, sweep_dir)
+    typer.echo(f"Done. {len(rows)}/{len(cells)} cells → {csv_path}, {md_path}")
+    if errors:
+        typer.echo(f"{len(errors)} cells failed; re-run with --name {sweep_dir.name} to retry them")
+        raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List
+import time
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from soma.core.warehouse import connect, find_runs, ingest_run
+
+app = typer.Typer(add_completion=False, no_args_is_help=True)
+console = Console()
+
+
+@app.command()
+def ingest(
+    paths: List[Path] = typer.Argument(..., help="Run directories, or directories containing runs (e.g. runs/, a sweep)"),
+    db: Path = typer.Option(Path("runs/warehouse.sqlite"), help="Warehouse database"),
+    replace: bool = typer.Option(False, help="Re-ingest runs already in the warehouse"),
+) -> None:
+    """Copy runs (meta.json + tick_metrics) into one cross-run warehouse database."""
+    conn = connect(db)
+    t0 = time.perf_counter()
+    done = skipped = 0
+    try:
+        for root in paths:
+            for run_dir in find_runs(root):
+                if ingest_run(conn, run_dir, replace=replace) is None:
+                    skipped += 1
+                else:
+                    done += 1
+    finally:
+        conn.close()
+    typer.echo(f"Ingested {done} runs ({skipped} skipped) into {db} in {time.perf_counter() - t0:.1f}s")
+
+
+@app.command()
+def query(
+    sql: str = typer.Argument(..., help="SQL over runs / tick_metrics, e.g. \"SELECT env, AVG(novelty) FROM tick_metrics JOIN runs USING(run_id) GROUP BY env\""),
+    db: Path = typer.Option(Path("runs/warehouse.sqlite"), help="Warehouse database"),
+    limit: int = typer.Option(50, help="Max rows to display"),
+) -> None:
+    """Run one SQL query against the warehouse and print the rows."""
+    if not db.exists():
+        raise typer.BadParameter(f"No warehouse at {db}")
+    conn = connect(db)
+    try:
+        cur = conn.execute(sql)
+        cols = [d[0] for d in cur.description or []]
+        rows = cur.fetchmany(limit)
+    finally:
+        conn.close()
+    table = Table(title=str(db))
+    for c in cols:
+        table.add_column(c)
+    for r in rows:
+        table.add_row(*("" if v is None else str(v) for v in r))
+    console.print(table)
+
+
+if __name__ == "__main__":
+    app()
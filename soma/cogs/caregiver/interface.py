@@ -2,10 +2,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Tuple, Any, Set
+from typing import Dict, List, Tuple, Any, Optional, Set
 import json
 
 from soma.cogs.self_notes.notes import SelfNotes
+from soma.core.writer import BackgroundWriter
 
 
 @dataclass
@@ -23,12 +24,15 @@ class CaregiverInterface:
       - caregiver_queries.jsonl : SOMA -> caregiver
       - caregiver_answers.jsonl : caregiver -> SOMA
       - caregiver_tags.json     : latest merged tags { token: gloss }
+
+    With a `writer`, query/tag file writes run on the background writer thread.
     """
 
-    def __init__(self, run_dir: Path, notes: SelfNotes, run_id: str) -> None:
+    def __init__(self, run_dir: Path, notes: SelfNotes, run_id: str, *, writer: Optional[BackgroundWriter] = None) -> None:
         self.run_dir = Path(run_dir)
         self.notes = notes
         self.run_id = str(run_id)
+        self.writer = writer
         self.path_q = self.run_dir / "caregiver_queries.jsonl"
         self.path_a = self.run_dir / "caregiver_answers.jsonl"
         self.path_tags = self.run_dir / "caregiver_tags.json"
@@ -58,8 +62,7 @@ class CaregiverInterface:
             "tokens": interesting,
             "context": context,
         }
-        with self.path_q.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(q) + "\n")
+        self._io(self._append_query, q)
 
         self.notes.note(
             kind="query",
@@ -67,6 +70,16 @@ class CaregiverInterface:
             tick=tick,
         )
 
+    def _append_query(self, q: Dict[str, Any]) -> None:
+        with self.path_q.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(q) + "\n")
+
+    def _io(self, fn, *args: Any, **kwargs: Any) -> None:
+        if self.writer is not None:
+            self.writer.submit(fn, *args, **kwargs)
+        else:
+            fn(*args, **kwargs)
+
     # ---------------- ingest answers ----------------
     def poll_answers(self) -> Dict[str, str]:
         """Read all answers file and merge tags; return new tags added this poll."""
@@ -93,7 +106,7 @@ class CaregiverInterface:
 
         if new_tags:
             # persist and note
-            self.path_tags.write_text(json.dumps(self.tags, indent=2), encoding="utf-8")
+            self._io(self.path_tags.write_text, json.dumps(self.tags, indent=2), encoding="utf-8")
             self.notes.note(
                 kind="caregiver_tag",
                 payload={"tags": new_tags},
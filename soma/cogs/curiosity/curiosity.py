@@ -25,15 +25,6 @@ class CuriosityEngine:
         self._prev_unique: List[str] = []
 
     # ------------------------- helpers -------------------------
-    def _doc_freqs(self, memory: MemorySystem) -> Dict[str, int]:
-        df: Dict[str, int] = {}
-        for item in memory.buf:
-            counts = item.meta.get("counts", {})
-            if isinstance(counts, dict):
-                for t in counts.keys():
-                    df[t] = df.get(t, 0) + 1
-        return df
-
     def _idf_norm(self, df: Dict[str, int], N: int, token: str) -> float:
         if N <= 0:
             return 1.0
@@ -62,9 +53,9 @@ class CuriosityEngine:
         if a or b:
             change = 1.0 - (len(a & b) / float(len(a | b)))
 
-        # rarity via normalized IDF over tokens in view
-        df = self._doc_freqs(memory)
-        N = len(memory.buf)
+        # rarity via normalized IDF over tokens in view (memory keeps df live; no scan)
+        df = memory.doc_freq
+        N = len(memory)
         if uniq:
             rarity_vals = [self._idf_norm(df, N, t) for t in uniq]
             rarity = float(sum(rarity_vals) / len(rarity_vals))
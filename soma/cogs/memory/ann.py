@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Dict, List, Sequence, Set, Tuple
+import random
+
+from soma.compat import np
+
+from .sparse import SparseVector
+
+
+class LSHIndex:
+    """Random-hyperplane LSH over episode ids for approximate cosine recall.
+
+    - `n_tables` independent hash tables, each keyed by `n_bits` hyperplane sign bits.
+    - Incremental: `add(seq, vector)` / `remove(seq)` keep buckets in sync with the store.
+    - `probes` (multi-probe) also visits codes with one uncertain bit flipped, per table,
+      trading latency for recall without rebuilding. More tables/fewer bits also raise recall.
+
+    Perception vectors are non-negative, so sign bits are strongly correlated; this is why the
+    defaults favour many bits per table (see `python -m scripts.bench recall`).
+
+    Hashing uses one numpy matvec when numpy is installed and falls back to pure Python;
+    candidates are re-scored exactly by MemorySystem either way.
+    """
+
+    def __init__(self, dim: int, *, n_tables: int = 2, n_bits: int = 24, probes: int = 0, seed: int = 0) -> None:
+        self.dim = int(dim)
+        self.n_tables = int(n_tables)
+        self.n_bits = int(n_bits)
+        self.probes = int(probes)
+        rng = random.Random(int(seed))
+        # planes[t][b] is a dim-length gaussian normal
+        self.planes: List[List[List[float]]] = [
+            [[rng.gauss(0.0, 1.0) for _ in range(self.dim)] for _ in range(self.n_bits)]
+            for _ in range(self.n_tables)
+        ]
+        self._P = None
+        if np is not None:
+            self._P = np.asarray(self.planes, dtype=np.float64).reshape(self.n_tables * self.n_bits, self.dim)
+        self.tables: List[Dict[int, Set[int]]] = [defaultdict(set) for _ in range(self.n_tables)]
+        self._codes: Dict[int, Tuple[int, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    # ---------------- hashing ----------------
+    def _project(self, vector: Sequence[float]) -> List[List[float]]:
+        if isinstance(vector, SparseVector):
+            # only the non-zero columns of the hyperplanes matter
+            nz = [(i, x) for i, x in zip(vector.idx, vector.val) if i < self.dim]
+            if self._P is not None:
+                cols = [i for i, _ in nz]
+                proj = self._P[:, cols] @ np.asarray([x for _, x in nz], dtype=np.float64)
+                return proj.reshape(self.n_tables, self.n_bits).tolist()
+            return [[sum(p[i] * x for i, x in nz) for p in planes] for planes in self.planes]
+        if self._P is not None:
+            v = np.zeros(self.dim, dtype=np.float64)
+            x = np.asarray(vector, dtype=np.float64)[: self.dim]
+            v[: x.shape[0]] = x
+            return (self._P @ v).reshape(self.n_tables, self.n_bits).tolist()
+        nz = [(i, float(x)) for i, x in enumerate(vector[: self.dim]) if x]
+        return [[sum(p[i] * x for i, x in nz) for p in planes] for planes in self.planes]
+
+    @staticmethod
+    def _code(proj: List[float]) -> int:
+        code = 0
+        for b, v in enumerate(proj):
+            if v >= 0.0:
+                code |= 1 << b
+        return code
+
+    # ---------------- updates ----------------
+    def add(self, seq: int, vector: Sequence[float]) -> None:
+        codes = tuple(self._code(proj) for proj in self._project(vector))
+        for table, code in zip(self.tables, codes):
+            table[code].add(seq)
+        self._codes[seq] = codes
+
+    def remove(self, seq: int) -> None:
+        codes = self._codes.pop(seq, None)
+        if codes is None:
+            return
+        for table, code in zip(self.tables, codes):
+            bucket = table.get(code)
+            if bucket is not None:
+                bucket.discard(seq)
+                if not bucket:
+                    del table[code]
+
+    # ---------------- lookup ----------------
+    def candidates(self, vector: Sequence[float], *, probes: int | None = None) -> Set[int]:
+        n_probe = self.probes if probes is None else int(probes)
+        out: Set[int] = set()
+        for table, proj in zip(self.tables, self._project(vector)):
+            code = self._code(proj)
+            out.update(table.get(code, ()))
+            if n_probe > 0:
+                # flip the bits whose projections sit closest to their hyperplane first
+                order = sorted(range(self.n_bits), key=lambda b: abs(proj[b]))
+                for b in order[:n_probe]:
+                    out.update(table.get(code ^ (1 << b), ()))
+        return out
@@ -1,9 +1,16 @@
 from __future__ import annotations
 
 from math import sqrt
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+from soma.compat import np, require_numpy
+
+from .ann import LSHIndex
 from .assoc import AssocGraph
+from .ring import RingMatrix, select_topk
+from .sparse import SparseVector
+
+BACKENDS = ("list", "numpy", "sparse")
 
 
 def _cos(a: List[float], b: List[float]) -> float:
@@ -25,33 +32,95 @@ def _cos(a: List[float], b: List[float]) -> float:
     return float(s) / float(sqrt(na) * sqrt(nb))
 
 
+def _view_tokens(m: Dict) -> Tuple[str, ...]:
+    """Distinct tokens of an episode (its "document" for document frequency)."""
+    feats = m.get("features", {}) if isinstance(m, dict) else {}
+    toks = feats.get("unique") or list((feats.get("counts") or {}).keys())
+    return tuple(sorted({str(t) for t in toks}))
+
+
 class MemorySystem:
     """
     Minimal vector store with cosine similarity + lightweight co-occurrence graph.
 
     Public API used elsewhere:
       - add_vector(tick, vector, meta)
-      - query(vector, top_k, min_score)
+      - query(vector, top_k, min_score, exact=False, probes=None)
       - assoc: AssocGraph (for optional downstream use)
+      - doc_freq: live {token: #stored episodes whose view contains it}, O(tokens) per add/evict
+
+    Backends:
+      - "list"  : Python lists + pure-Python cosine (default, no deps)
+      - "numpy" : preallocated RingMatrix of normalized rows; recall is one matvec + argpartition
+      - "sparse": SparseVector per episode (index/value pairs + cached norm); cosine is a merge
+                  over non-zeros, so memory and recall cost scale with nnz rather than `dim`
+
+    Vectors may be dense sequences or SparseVectors in every backend; they are converted to
+    the backend's representation on the way in. Sparse and list backends give identical scores.
+
+    Optional `index` (e.g. LSHIndex) makes `query` approximate: only the index's candidates
+    are scored. Episodes carry a sequence id; eviction is FIFO, so the oldest live id is
+    `_seq - len(self)` and maps directly to a list position or ring slot.
     """
 
-    def __init__(self, dim: int, max_items: int = 1024) -> None:
+    def __init__(
+        self,
+        dim: int,
+        max_items: int = 1024,
+        *,
+        backend: str = "list",
+        index: Optional[LSHIndex] = None,
+        buffer: Any = None,
+    ) -> None:
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown memory backend: {backend}")
         self.dim = int(dim)
         self.max_items = int(max_items)
-        self.vecs: List[List[float]] = []
+        self.backend = backend
+        self.vecs: List[Any] = []  # dense lists ("list") or SparseVectors ("sparse")
         self.ticks: List[int] = []
         self.meta: List[Dict] = []
         self.assoc = AssocGraph()
+        self.doc_freq: Dict[str, int] = {}
+        self._doc_tokens: List[Tuple[str, ...]] = []
+        self.index = index
+        self._seq = 0  # id of the next episode
+        self._evicted_tick: Optional[int] = None  # tick of the most recently evicted episode
+        self._ring: Optional[RingMatrix] = None
+        if backend == "numpy":
+            self._ring = RingMatrix(self.dim, self.max_items, buffer=buffer)
+            self.meta = [{} for _ in range(self._ring.capacity)]  # indexed by ring slot
+            self._doc_tokens = [() for _ in range(self._ring.capacity)]
+
+    def __len__(self) -> int:
+        if self._ring is not None:
+            return len(self._ring)
+        return len(self.vecs)
 
     # ----------------
     def add_vector(self, *, tick: int, vector: List[float], meta: Optional[Dict] = None) -> None:
-        if not isinstance(vector, list):
+        if self._ring is not None:
+            slot = self._ring.head
+            evicted = self._ring.add(int(tick), self._dense(vector))
+            m = dict(meta or {})
+            self.meta[slot] = m
+            self._update_assoc(m)
+            if evicted is not None:
+                self._df_remove(self._doc_tokens[slot])
+            self._doc_tokens[slot] = self._df_add(m)
+            self._index_add(vector, evicted is not None)
+            return
+        if self.backend == "sparse":
+            vector = self._sparse(vector)
+        elif isinstance(vector, SparseVector):
+            vector = vector.to_dense(self.dim)
+        elif not isinstance(vector, list):
             # attempt to coerce numpy arrays etc.
             try:
                 vector = [float(x) for x in vector]
             except Exception:
                 return
-        if self.dim and len(vector) != self.dim:
+        if self.backend == "list" and self.dim and len(vector) != self.dim:
             # soft guard; truncate/pad
             if len(vector) > self.dim:
                 vector = vector[: self.dim]
@@ -61,7 +130,57 @@ class MemorySystem:
         self.ticks.append(int(tick))
         m = dict(meta or {})
         self.meta.append(m)
+        self._update_assoc(m)
+        self._doc_tokens.append(self._df_add(m))
 
+        # capacity control
+        evicted = len(self.vecs) > self.max_items
+        if evicted:
+            self.vecs.pop(0)
+            self._evicted_tick = self.ticks.pop(0)
+            self.meta.pop(0)
+            self._df_remove(self._doc_tokens.pop(0))
+        self._index_add(vector, evicted)
+
+    def _sparse(self, vector: Any) -> SparseVector:
+        if isinstance(vector, SparseVector):
+            if vector.dim == self.dim:
+                return vector
+            return SparseVector.from_slots(self.dim, vector.as_dict())
+        return SparseVector.from_dense([float(x) for x in vector], self.dim)
+
+    def _score(self, query: Any, stored: Any) -> float:
+        if self.backend == "sparse":
+            return query.cos(stored)
+        return _cos(query, stored)
+
+    def _df_add(self, m: Dict) -> Tuple[str, ...]:
+        toks = _view_tokens(m)
+        df = self.doc_freq
+        for t in toks:
+            df[t] = df.get(t, 0) + 1
+        return toks
+
+    def _df_remove(self, toks: Tuple[str, ...]) -> None:
+        df = self.doc_freq
+        for t in toks:
+            c = df.get(t, 0) - 1
+            if c > 0:
+                df[t] = c
+            else:
+                df.pop(t, None)
+
+    def _index_add(self, vector: List[float], evicted: bool) -> None:
+        seq = self._seq
+        self._seq += 1
+        if self.index is None:
+            return
+        if evicted:
+            # FIFO: live ids are [seq - len + 1, seq], so the one just dropped is seq - len
+            self.index.remove(seq - len(self))
+        self.index.add(seq, vector)
+
+    def _update_assoc(self, m: Dict) -> None:
         # --- update co-occurrence graph if features are present ---
         feats = m.get("features", {}) if isinstance(m, dict) else {}
         # expect token lists under common keys
@@ -73,20 +192,133 @@ class MemorySystem:
         if toks:
             self.assoc.add_event(toks)
 
-        # capacity control
-        if len(self.vecs) > self.max_items:
-            self.vecs.pop(0)
-            self.ticks.pop(0)
-            self.meta.pop(0)
+    def _dense(self, vector: Any) -> Any:
+        return vector.to_dense(self.dim) if isinstance(vector, SparseVector) else vector
+
+    def _query_vector(self, vector: Any) -> Any:
+        return self._sparse(vector) if self.backend == "sparse" else self._dense(vector)
 
     # ----------------
-    def query(self, vector: List[float], *, top_k: int = 3, min_score: float = 0.5) -> List[Tuple[int, float]]:
+    def query(
+        self,
+        vector: List[float],
+        *,
+        top_k: int = 3,
+        min_score: float = 0.5,
+        exact: bool = False,
+        probes: Optional[int] = None,
+    ) -> List[Tuple[int, float]]:
+        if self.index is not None and not exact:
+            return self._query_index(vector, top_k=top_k, min_score=min_score, probes=probes)
+        if self._ring is not None:
+            return self._ring.query(self._dense(vector), top_k=top_k, min_score=min_score)
         if not self.vecs:
             return []
+        vector = self._query_vector(vector)
         sims: List[Tuple[int, float]] = []  # (tick, score)
         for stored, t in zip(self.vecs, self.ticks):
-            s = _cos(vector, stored)
+            s = self._score(vector, stored)
             if s >= float(min_score):
                 sims.append((t, float(s)))
         sims.sort(key=lambda x: x[1], reverse=True)
-        return sims[: int(top_k)]
\ No newline at end of file
+        return sims[: int(top_k)]
+
+    @property
+    def version(self) -> int:
+        """Episodes added so far; recall results are a function of (query, version)."""
+        return self._seq
+
+    def query_since(
+        self,
+        vector: Any,
+        prev: List[Tuple[int, float]],
+        version: int,
+        *,
+        top_k: int = 3,
+        min_score: float = 0.5,
+    ) -> Optional[List[Tuple[int, float]]]:
+        """Exact `query` result now, given `prev` = `query(vector, ...)` at `version`.
+
+        Only the episodes added since `version` are scored and merged into `prev`; returns None
+        (the caller runs a full query) when one of `prev` may have been evicted while `prev`
+        was full, or when most of memory is new anyway. Assumes ticks are non-decreasing in
+        insertion order, as run_loop adds them. Exact scan only: not with an ANN `index`, and
+        not for the numpy ring, whose BLAS matvec rounds a row differently depending on the
+        shape of the matrix it is part of (a partial rescore would not match `query`).
+        """
+        n_new = self._seq - int(version)
+        if n_new == 0:
+            return list(prev)
+        if self.index is not None or self._ring is not None or n_new < 0 or n_new >= len(self):
+            return None
+        if self._evicted_tick is not None and any(t <= self._evicted_tick for t, _ in prev):
+            return None
+        merged = list(prev)
+        merged.extend((t, s) for t, s in self._scores_tail(vector, n_new) if s >= float(min_score))
+        # stable: older episodes (prev) stay ahead of new ones on equal scores, as in query
+        merged.sort(key=lambda x: x[1], reverse=True)
+        return merged[: int(top_k)]
+
+    def _scores_tail(self, vector: Any, n: int) -> List[Tuple[int, float]]:
+        """(tick, score) of the `n` newest episodes, oldest first (list / sparse backends)."""
+        vector = self._query_vector(vector)
+        return [(t, float(self._score(vector, v))) for v, t in zip(self.vecs[-n:], self.ticks[-n:])]
+
+    def _query_index(
+        self, vector: List[float], *, top_k: int, min_score: float, probes: Optional[int]
+    ) -> List[Tuple[int, float]]:
+        # insertion order == seq order, which keeps tie-breaking identical to the exact scan
+        seqs = sorted(self.index.candidates(vector, probes=probes))
+        if not seqs:
+            return []
+        if self._ring is not None:
+            return self._ring.query_slots(
+                self._dense(vector), [s % self._ring.capacity for s in seqs], top_k=top_k, min_score=min_score
+            )
+        vector = self._query_vector(vector)
+        first = self._seq - len(self.vecs)
+        sims: List[Tuple[int, float]] = []
+        for seq in seqs:
+            i = seq - first
+            s = self._score(vector, self.vecs[i])
+            if s >= float(min_score):
+                sims.append((self.ticks[i], float(s)))
+        sims.sort(key=lambda x: x[1], reverse=True)
+        return sims[: int(top_k)]
+
+
+class MemoryBatch:
+    """B MemorySystems stepped in lockstep whose rings are slices of one (B, max_items, dim) array.
+
+    Every agent stores exactly one episode per tick, so all rings share the same fill level and
+    write cursor; recall for the whole batch is then a single batched matmul. Per-agent results
+    are identical to calling each MemorySystem.query (numpy backend) on its own.
+    """
+
+    def __init__(self, n: int, dim: int, max_items: int) -> None:
+        require_numpy("MemoryBatch")
+        self.buffer = np.zeros((int(n), max(1, int(max_items)), int(dim)), dtype=np.float64)
+        self.memories: List[MemorySystem] = [
+            MemorySystem(dim=dim, max_items=max_items, backend="numpy", buffer=self.buffer[b]) for b in range(int(n))
+        ]
+
+    def __len__(self) -> int:
+        return len(self.memories)
+
+    def query(self, vectors: Sequence[Sequence[float]], *, top_k: int = 3, min_score: float = 0.5) -> List[List[Tuple[int, float]]]:
+        rings = [m._ring for m in self.memories]
+        r0 = rings[0]
+        if any(r.size != r0.size or r.head != r0.head for r in rings):
+            return [m.query(v, top_k=top_k, min_score=min_score) for m, v in zip(self.memories, vectors)]
+        if r0.size == 0:
+            return [[] for _ in rings]
+        q = np.stack([r._normalize(v) for r, v in zip(rings, vectors)])
+        scores = np.matmul(self.buffer[:, : r0.size], q[:, :, None])[:, :, 0]
+        return [
+            select_topk(r.logical(scores[b]), r.logical(r.ticks[: r.size]), top_k=top_k, min_score=min_score)
+            for b, r in enumerate(rings)
+        ]
+
+    def add_vectors(self, *, tick: int, vectors: Sequence[Sequence[float]], metas: Sequence[Optional[Dict]]) -> None:
+        for m, v, meta in zip(self.memories, vectors, metas):
+            m.add_vector(tick=tick, vector=v, meta=meta)
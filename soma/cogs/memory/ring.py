@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from typing import List, Optional, Sequence, Tuple
+
+from soma.compat import np, require_numpy
+
+
+def select_topk(scores, ticks, *, top_k: int, min_score: float) -> List[Tuple[int, float]]:
+    """Pick `(tick, score)` pairs exactly like the list backend does.
+
+    `scores` and `ticks` are 1-D arrays in insertion order (oldest first). The list backend
+    keeps every score >= min_score and stable-sorts by score descending, so ties are broken
+    by insertion order. We reproduce that with argpartition + lexsort on the survivors only.
+    """
+    k = int(top_k)
+    if k <= 0 or scores.shape[0] == 0:
+        return []
+    idx = np.flatnonzero(scores >= float(min_score))
+    if idx.shape[0] == 0:
+        return []
+    cand = scores[idx]
+    if idx.shape[0] > k:
+        part = np.argpartition(-cand, k - 1)[:k]
+        kth = cand[part].min()
+        above = idx[cand > kth]
+        ties = idx[cand == kth][: k - above.shape[0]]
+        idx = np.concatenate((above, ties))
+        cand = scores[idx]
+    order = np.lexsort((idx, -cand))
+    return [(int(ticks[i]), float(scores[i])) for i in idx[order]]
+
+
+class RingMatrix:
+    """Preallocated ring of L2-normalized vectors for single-matmul cosine recall.
+
+    - Rows are normalized on insert, so cosine is a plain dot product.
+    - A write cursor replaces `list.pop(0)`; the oldest row is overwritten in place.
+    - `buffer` lets several rings share one stacked (B, capacity, dim) array (see MemoryBatch).
+    """
+
+    def __init__(self, dim: int, capacity: int, *, buffer=None) -> None:
+        require_numpy("RingMatrix")
+        self.dim = int(dim)
+        self.capacity = max(1, int(capacity))
+        if buffer is None:
+            buffer = np.zeros((self.capacity, self.dim), dtype=np.float64)
+        self.mat = buffer
+        self.ticks = np.zeros(self.capacity, dtype=np.int64)
+        self.size = 0
+        self.head = 0  # slot of the oldest row once full; next write slot
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _normalize(self, vector: Sequence[float]):
+        v = np.asarray(vector, dtype=np.float64)
+        if v.shape[0] != self.dim:
+            out = np.zeros(self.dim, dtype=np.float64)
+            m = min(self.dim, v.shape[0])
+            out[:m] = v[:m]
+            v = out
+        n = float(np.sqrt(np.dot(v, v)))
+        if n == 0.0:
+            return v * 0.0
+        return v / n
+
+    def add(self, tick: int, vector: Sequence[float]) -> Optional[int]:
+        """Write a row; return the slot that was overwritten (None while filling)."""
+        slot = self.head
+        evicted = slot if self.size == self.capacity else None
+        self.mat[slot] = self._normalize(vector)
+        self.ticks[slot] = int(tick)
+        self.head = (slot + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+        return evicted
+
+    def slot_of(self, i: int) -> int:
+        """Physical slot of the i-th oldest row."""
+        if self.size < self.capacity:
+            return i
+        return (self.head + i) % self.capacity
+
+    def logical(self, arr):
+        """Reorder a per-slot array (length `size`) into insertion order."""
+        if self.size < self.capacity or self.head == 0:
+            return arr
+        return np.concatenate((arr[self.head:], arr[: self.head]))
+
+    def scores(self, vector: Sequence[float]):
+        """Cosine score of every stored row, in insertion order."""
+        q = self._normalize(vector)
+        return self.logical(self.mat[: self.size] @ q)
+
+    def query_slots(
+        self, vector: Sequence[float], slots: Sequence[int], *, top_k: int, min_score: float
+    ) -> List[Tuple[int, float]]:
+        """Score only `slots` (given in insertion order), e.g. ANN candidates."""
+        if not slots:
+            return []
+        sl = np.asarray(slots, dtype=np.int64)
+        return select_topk(
+            self.mat[sl] @ self._normalize(vector), self.ticks[sl], top_k=top_k, min_score=min_score
+        )
+
+    def query(self, vector: Sequence[float], *, top_k: int, min_score: float) -> List[Tuple[int, float]]:
+        if self.size == 0:
+            return []
+        return select_topk(
+            self.scores(vector), self.logical(self.ticks[: self.size]), top_k=top_k, min_score=min_score
+        )
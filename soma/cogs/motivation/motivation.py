@@ -1,35 +1,67 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from soma.cogs.self_notes.notes import SelfNotes
+from soma.compat import np, require_numpy
 
 
 DriveName = str
 
 
-@dataclass
+@dataclass(frozen=True)
 class DriveParams:
     decay: float
     gain: float
     setpoint: float = 0.0
 
 
+# Default drive parameters, in drive order (shared by MotivationManager and MotivationBatch).
+DRIVE_PARAMS: Dict[DriveName, DriveParams] = {
+    "curiosity": DriveParams(decay=0.08, gain=0.9),
+    "stability": DriveParams(decay=0.06, gain=0.8),
+    "pattern_completion": DriveParams(decay=0.07, gain=0.7),
+    "truth_seeking": DriveParams(decay=0.09, gain=0.9),
+    "caregiver_alignment": DriveParams(decay=0.03, gain=0.2, setpoint=0.2),
+    "overload_regulation": DriveParams(decay=0.20, gain=1.0),
+}
+
+
+def _initial_level(p: DriveParams) -> float:
+    return p.setpoint if p.setpoint > 0 else 0.0
+
+
+# The drive arithmetic below is shared by MotivationManager (floats, with min/max) and
+# MotivationBatch (arrays, with np.minimum/np.maximum), so the two cannot drift apart.
+def drive_stimuli(nov, chg, rar, max_sim, mid_sim, overloaded, b, *, minimum=min, maximum=max) -> List:
+    """Stimulus per drive, in DRIVE_PARAMS order."""
+    return [
+        minimum(1.0, 0.5 * nov + 0.2 * rar + 0.3 * chg + 0.3 * b),  # curiosity
+        minimum(1.0, maximum(0.0, 0.7 * max_sim + 0.3 * (1.0 - chg) - 0.4 * b) + 0.2 * overloaded),  # stability
+        minimum(1.0, 0.8 * mid_sim + 0.2 * (1.0 - nov)),  # pattern_completion
+        minimum(1.0, 0.5 * nov + 0.5 * chg),  # truth_seeking
+        minimum(1.0, 0.1 * nov),  # caregiver_alignment
+        overloaded,  # overload_regulation
+    ]
+
+
+def drive_step(v, decay, gain, setpoint, stimulus, gain_mod=0.0, *, maximum=max):
+    """Leak toward the setpoint plus the gain-modified stimulus (before clamping to [0, 1])."""
+    leaked = (1.0 - decay) * v
+    toward_set = setpoint * decay
+    # apply gain modifier (1 + mod) multiplicative
+    eff = maximum(0.0, stimulus) * maximum(0.0, 1.0 + gain_mod)
+    return leaked + gain * eff + toward_set
+
+
 class MotivationManager:
     """Multi-drive homeostat with boredom coupling and optional gain modifiers."""
 
     def __init__(self, notes: SelfNotes):
         self.notes = notes
-        self.params: Dict[DriveName, DriveParams] = {
-            "curiosity": DriveParams(decay=0.08, gain=0.9),
-            "stability": DriveParams(decay=0.06, gain=0.8),
-            "pattern_completion": DriveParams(decay=0.07, gain=0.7),
-            "truth_seeking": DriveParams(decay=0.09, gain=0.9),
-            "caregiver_alignment": DriveParams(decay=0.03, gain=0.2, setpoint=0.2),
-            "overload_regulation": DriveParams(decay=0.20, gain=1.0),
-        }
-        self.state: Dict[DriveName, float] = {k: (p.setpoint if p.setpoint > 0 else 0.0) for k, p in self.params.items()}
+        self.params: Dict[DriveName, DriveParams] = dict(DRIVE_PARAMS)
+        self.state: Dict[DriveName, float] = {k: _initial_level(p) for k, p in self.params.items()}
         self._last_dominant: Optional[DriveName] = None
 
     @staticmethod
@@ -38,12 +70,7 @@ class MotivationManager:
 
     def _apply(self, name: DriveName, stimulus: float, gain_mod: float = 0.0) -> None:
         p = self.params[name]
-        v = self.state[name]
-        leaked = (1.0 - p.decay) * v
-        toward_set = p.setpoint * p.decay
-        # apply gain modifier (1 + mod) multiplicative
-        eff = max(0.0, stimulus) * max(0.0, 1.0 + float(gain_mod))
-        v_next = leaked + p.gain * eff + toward_set
+        v_next = drive_step(self.state[name], p.decay, p.gain, p.setpoint, stimulus, float(gain_mod))
         self.state[name] = self._clamp(v_next)
 
     def update(
@@ -66,19 +93,9 @@ class MotivationManager:
 
         b = max(0.0, min(1.0, boredom))
 
-        stim_curiosity = min(1.0, 0.5 * nov + 0.2 * rar + 0.3 * chg + 0.3 * b)
-        stim_stability = min(1.0, max(0.0, 0.7 * max_sim + 0.3 * (1.0 - chg) - 0.4 * b) + 0.2 * overloaded)
-        stim_pattern = min(1.0, 0.8 * mid_sim + 0.2 * (1.0 - nov))
-        stim_truth = min(1.0, 0.5 * nov + 0.5 * chg)
-        stim_caregiver = min(1.0, 0.1 * nov)
-        stim_overload = overloaded
-
-        self._apply("curiosity", stim_curiosity, gain_mods.get("curiosity", 0.0))
-        self._apply("stability", stim_stability, gain_mods.get("stability", 0.0))
-        self._apply("pattern_completion", stim_pattern, gain_mods.get("pattern_completion", 0.0))
-        self._apply("truth_seeking", stim_truth, gain_mods.get("truth_seeking", 0.0))
-        self._apply("caregiver_alignment", stim_caregiver, gain_mods.get("caregiver_alignment", 0.0))
-        self._apply("overload_regulation", stim_overload, gain_mods.get("overload_regulation", 0.0))
+        stims = drive_stimuli(nov, chg, rar, max_sim, mid_sim, overloaded, b)
+        for name, stim in zip(self.params, stims):
+            self._apply(name, stim, gain_mods.get(name, 0.0))
 
         dominant = max(self.state.items(), key=lambda kv: kv[1])[0]
         if dominant != self._last_dominant:
@@ -94,4 +111,78 @@ class MotivationManager:
             )
             self._last_dominant = dominant
 
-        return self.state
\ No newline at end of file
+        return self.state
+
+
+class MotivationBatch:
+    """Array-backed MotivationManager for B agents stepped in lockstep.
+
+    State is a (B, n_drives) array in `params` order. Stimuli and drive steps come from the
+    same `drive_stimuli` / `drive_step` as MotivationManager, so drive levels match exactly.
+    """
+
+    def __init__(self, notes: Sequence[SelfNotes]):
+        require_numpy("MotivationBatch")
+        self.notes = list(notes)
+        self.params: Dict[DriveName, DriveParams] = dict(DRIVE_PARAMS)
+        self.names: List[DriveName] = list(self.params)
+        self._decay = np.array([p.decay for p in self.params.values()], dtype=np.float64)
+        self._gain = np.array([p.gain for p in self.params.values()], dtype=np.float64)
+        self._setpoint = np.array([p.setpoint for p in self.params.values()], dtype=np.float64)
+        initial = [_initial_level(p) for p in self.params.values()]
+        self.state = np.tile(np.array(initial, dtype=np.float64), (len(self.notes), 1))
+        self._last_dominant: List[Optional[DriveName]] = [None] * len(self.notes)
+
+    def drives(self, b: int) -> Dict[DriveName, float]:
+        return dict(zip(self.names, self.state[b].tolist()))
+
+    def dominant(self, b: int) -> DriveName:
+        return self.names[int(np.argmax(self.state[b]))]
+
+    def update(
+        self,
+        *,
+        tick: int,
+        novelty,
+        change,
+        rarity,
+        max_sim,
+        overloaded,
+        boredom,
+        mask=None,
+    ) -> None:
+        """Advance every agent (or only rows where `mask` is True) by one MotivationManager.update."""
+        nov = np.asarray(novelty, dtype=np.float64)
+        chg = np.asarray(change, dtype=np.float64)
+        rar = np.asarray(rarity, dtype=np.float64)
+        ms = np.asarray(max_sim, dtype=np.float64)
+        over = np.asarray(overloaded, dtype=np.float64)
+        b = np.maximum(0.0, np.minimum(1.0, np.asarray(boredom, dtype=np.float64)))
+        mid_sim = ((ms >= 0.3) & (ms <= 0.8)).astype(np.float64)
+
+        stim = np.stack(drive_stimuli(nov, chg, rar, ms, mid_sim, over, b, minimum=np.minimum, maximum=np.maximum), axis=1)
+        # gain modifiers are not used by the batched runner
+        nxt = np.clip(drive_step(self.state, self._decay, self._gain, self._setpoint, stim, maximum=np.maximum), 0.0, 1.0)
+        if mask is None:
+            self.state = nxt
+            rows = range(len(self.notes))
+        else:
+            m = np.asarray(mask, dtype=bool)
+            self.state = np.where(m[:, None], nxt, self.state)
+            rows = np.flatnonzero(m).tolist()
+
+        bl = b.tolist()
+        for i in rows:
+            dominant = self.dominant(i)
+            if dominant != self._last_dominant[i]:
+                self.notes[i].note(
+                    kind="motivation",
+                    payload={
+                        "tick": tick,
+                        "dominant": dominant,
+                        "boredom": round(bl[i], 3),
+                        "drives": {k: round(v, 3) for k, v in self.drives(i).items()},
+                    },
+                    tick=tick,
+                )
+                self._last_dominant[i] = dominant
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+import json
+
+from .features import view_signature
+
+CACHE_FILE = "view_cache.json"
+
+
+class ViewEntry:
+    """Perception results for one view: features, embedding and the last recall."""
+
+    __slots__ = ("features", "vector", "matches", "version", "args")
+
+    def __init__(self, features: Dict[str, Any], vector: Any) -> None:
+        self.features = features
+        self.vector = vector
+        self.matches: Optional[List[Tuple[int, float]]] = None
+        self.version = -1  # memory version the matches were computed at
+        self.args: Tuple[int, float] = (0, 0.0)
+
+
+class ViewCache:
+    """Bounded LRU of per-view perception keyed by `view_signature`.
+
+    Agents revisit identical views for long stretches; a hit skips `extract_features` and
+    the embedding. Recall is reused through `MemorySystem.query_since`, which only scores
+    the episodes stored since the cached result, so results equal a fresh `query`.
+    Features and vectors are shared between hits and must not be mutated.
+    """
+
+    def __init__(self, *, grid_size: int, capacity: int = 1024) -> None:
+        self.grid_size = int(grid_size)
+        self.capacity = max(1, int(capacity))
+        self._entries: "OrderedDict[Hashable, ViewEntry]" = OrderedDict()
+        self.lookups = 0
+        self.hits = 0
+        self.recalls = 0
+        self.recall_reused = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, obs: Dict[str, Any]) -> Hashable:
+        return view_signature(obs, grid_size=self.grid_size)
+
+    def get(self, key: Hashable) -> Optional[ViewEntry]:
+        self.lookups += 1
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Hashable, features: Dict[str, Any], vector: Any) -> ViewEntry:
+        entry = self._entries[key] = ViewEntry(features, vector)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+        return entry
+
+    def recall(self, entry: ViewEntry, memory: Any, *, top_k: int, min_score: float) -> List[Tuple[int, float]]:
+        """`memory.query(entry.vector, ...)`, updated incrementally from the cached result."""
+        self.recalls += 1
+        matches = None
+        if entry.matches is not None and entry.args == (top_k, min_score):
+            matches = memory.query_since(entry.vector, entry.matches, entry.version, top_k=top_k, min_score=min_score)
+        if matches is None:
+            matches = memory.query(entry.vector, top_k=top_k, min_score=min_score)
+        else:
+            self.recall_reused += 1
+        entry.matches, entry.version, entry.args = matches, memory.version, (top_k, min_score)
+        return list(matches)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "entries": len(self._entries),
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+            "recalls": self.recalls,
+            "recall_reused": self.recall_reused,
+            "recall_reuse_rate": self.recall_reused / self.recalls if self.recalls else 0.0,
+        }
+
+    def write(self, path: Path) -> None:
+        Path(path).write_text(json.dumps(self.stats(), indent=2), encoding="utf-8")
+
+
+def load_cache_stats(run_dir: Path) -> Optional[Dict[str, Any]]:
+    """view_cache.json of a run (None when the run had no view cache)."""
+    try:
+        return json.loads((Path(run_dir) / CACHE_FILE).read_text(encoding="utf-8"))
+    except Exception:
+        return None
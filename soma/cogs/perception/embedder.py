@@ -1,8 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence
 import hashlib
 import math
+from operator import mul
+
+from soma.cogs.memory.sparse import SparseVector
+from soma.compat import np, require_numpy
 
 COLORS = ["R", "G", "B", "Y"]
 SHAPES = ["o", "^", "s"]
@@ -13,50 +18,112 @@ class PerceptionEmbedderV2:
 
     Strategy: start from a hashed 64-dim bag-of-tokens (like MemorySystem.embed), then
     add ~15 feature scalars into the first slots; L2-normalize.
+
+    Token slots are memoized (the vocabulary is small and stable), and `embed` /
+    `embed_many` can write into caller-owned buffers. Every path performs the same float
+    operations in the same order, so vectors are bit-identical to the plain `embed`.
     """
 
     def __init__(self, dim: int = 64):
         self.dim = dim
+        self._slots: Dict[str, int] = {}
+        self._zeros = [0.0] * dim
 
     def _hash_idx(self, token: str) -> int:
-        h = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
-        return int.from_bytes(h, "little") % self.dim
+        i = self._slots.get(token)
+        if i is None:
+            h = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            i = self._slots[token] = int.from_bytes(h, "little") % self.dim
+        return i
 
     def _vec_from_counts(self, counts: Dict[str, int]) -> List[float]:
         v = [0.0] * self.dim
+        self._add_counts(v, counts)
+        return v
+
+    def _add_counts(self, v: Any, counts: Dict[str, int]) -> None:
+        slots = self._slots
         for tok, c in counts.items():
-            i = self._hash_idx(str(tok))
+            i = slots.get(tok) if type(tok) is str else None
+            if i is None:
+                i = self._hash_idx(str(tok))
             v[i] += float(c)
-        return v
 
     def _l2(self, v: List[float]) -> List[float]:
-        n = math.sqrt(sum(x * x for x in v))
+        n = math.sqrt(sum(map(mul, v, v)))
         if n > 0:
             return [x / n for x in v]
         return v
 
-    def embed(self, features: Dict[str, Any]) -> List[float]:
-        counts: Dict[str, int] = features.get("counts", {})
-        vec = self._vec_from_counts(counts)
+    def _raw(self, features: Dict[str, Any], v: Any) -> None:
+        """Unnormalized embedding into `v` (a zeroed length-dim buffer, or a defaultdict(float))."""
+        self._add_counts(v, features.get("counts", {}))
 
-        # Build compact feature list (≈15 dims) in [0,1]
-        f: List[float] = []
-        f.append(float(features.get("density", 0.0)))
-        f.append(float(features.get("diversity", 0.0)))
-        f.append(float(features.get("entropy", 0.0)))
-        f.append(float(features.get("center_prox", 0.0)))
+        # Compact feature list (≈15 dims) in [0,1]
         d = features.get("dir", {})
-        f.extend([float(d.get("up", 0.0)), float(d.get("down", 0.0)), float(d.get("left", 0.0)), float(d.get("right", 0.0))])
         c = features.get("color", {})
-        f.extend([float(c.get(k, 0.0)) for k in COLORS])
         s = features.get("shape", {})
-        f.extend([float(s.get(k, 0.0)) for k in SHAPES])
+        f = (
+            float(features.get("density", 0.0)),
+            float(features.get("diversity", 0.0)),
+            float(features.get("entropy", 0.0)),
+            float(features.get("center_prox", 0.0)),
+            float(d.get("up", 0.0)),
+            float(d.get("down", 0.0)),
+            float(d.get("left", 0.0)),
+            float(d.get("right", 0.0)),
+            *[float(c.get(k, 0.0)) for k in COLORS],
+            *[float(s.get(k, 0.0)) for k in SHAPES],
+        )
 
         # Gently scale features so they don't swamp counts (alpha ~ 0.8)
         alpha = 0.8
-        for i, val in enumerate(f):
-            if i >= self.dim:
-                break
-            vec[i] += alpha * val
+        for i in range(min(len(f), self.dim)):
+            v[i] += alpha * f[i]
+
+    def embed(self, features: Dict[str, Any], out: Optional[Any] = None) -> Any:
+        """L2-normalized embedding; written into `out` (a list or 1-D array of length dim) when given."""
+        if out is None:
+            vec = [0.0] * self.dim
+            self._raw(features, vec)
+            return self._l2(vec)
+        out[:] = self._zeros
+        self._raw(features, out)
+        n = math.sqrt(sum(map(mul, out, out)))
+        if n > 0:
+            out[:] = [x / n for x in out]
+        return out
+
+    def embed_sparse(self, features: Dict[str, Any]) -> SparseVector:
+        """`embed` as a SparseVector (same non-zero values); cost follows nnz, not `dim`."""
+        v: Dict[int, float] = defaultdict(float)
+        self._raw(features, v)
+        idx = sorted(i for i, x in v.items() if x)
+        val = [v[i] for i in idx]
+        n = math.sqrt(sum(map(mul, val, val)))  # zeros add nothing: equals the dense sum
+        if n > 0:
+            val = [x / n for x in val]
+        return SparseVector(self.dim, idx, val)
+
+    def embed_many(self, features: Sequence[Dict[str, Any]], out: Optional[Any] = None) -> Any:
+        """Embed several observations (e.g. one per agent of a batch); same vectors as `embed`.
 
-        return self._l2(vec)
\ No newline at end of file
+        With `out` (a (B, dim) numpy array, reused across ticks) the rows are filled in place
+        and divided by their norms in one array op; otherwise a list of lists is returned.
+        """
+        if out is None:
+            return [self.embed(f) for f in features]
+        require_numpy("embed_many(out=...)")
+        rows = out[: len(features)]
+        raws = []
+        norms = []
+        for f in features:
+            raw = [0.0] * self.dim
+            self._raw(f, raw)
+            raws.append(raw)
+            norms.append(math.sqrt(sum(map(mul, raw, raw))))
+        rows[:] = raws
+        n = np.asarray(norms, dtype=np.float64)
+        nz = n > 0
+        rows[nz] /= n[nz, None]  # elementwise x / n, as in _l2
+        return rows
@@ -3,6 +3,9 @@ from __future__ import annotations
 from typing import Any, Dict, List, Tuple
 import math
 
+from soma.compat import np
+from soma.sandbox.codes import IS_TOKEN
+
 EMPTY = "."
 
 COLORS = ["R", "G", "B", "Y"]
@@ -13,12 +16,78 @@ def _is_token(t: str) -> bool:
     return t not in (EMPTY, "@", " ") and len(t) == 2
 
 
+def _occupancy_tokens(view: List[List[str]]) -> Tuple[int, Tuple[int, ...], Tuple[int, ...]]:
+    """Occupied cells, plus occupied / total cells above, below, left and right of the agent."""
+    H = len(view)
+    W = len(view[0]) if H else 0
+    occupied = sum(1 for row in view for t in row if _is_token(t))
+    cx = H // 2
+    cy = W // 2
+    up = down = left = right = 0
+    upN = downN = leftN = rightN = 0
+    for y in range(H):
+        for x in range(W):
+            if x == cx and y == cy:
+                continue
+            t = view[y][x]
+            if y < cy:
+                upN += 1
+                if _is_token(t):
+                    up += 1
+            if y > cy:
+                downN += 1
+                if _is_token(t):
+                    down += 1
+            if x < cx:
+                leftN += 1
+                if _is_token(t):
+                    left += 1
+            if x > cx:
+                rightN += 1
+                if _is_token(t):
+                    right += 1
+    return occupied, (up, down, left, right), (upN, downN, leftN, rightN)
+
+
+def _occupancy_codes(view: Any, *, agent_mark: bool) -> Tuple[int, Tuple[int, ...], Tuple[int, ...]]:
+    """`_occupancy_tokens` of an array view (soma.sandbox.codes) with whole-slice sums."""
+    H, W = view.shape
+    occ = IS_TOKEN[view]
+    cx = H // 2
+    cy = W // 2
+    occupied = int(occ.sum())
+    if agent_mark and H:
+        occupied -= int(occ[cy, cx])  # decoded as "@"
+    parts = (occ[:cy], occ[cy + 1 :], occ[:, :cx], occ[:, cx + 1 :])
+    return occupied, tuple(int(p.sum()) for p in parts), tuple(int(p.size) for p in parts)
+
+
+def view_signature(obs: Dict[str, Any], *, grid_size: int) -> Tuple[Any, ...]:
+    """Hashable key of everything `extract_features` reads from an observation.
+
+    The view layout (directional densities), the summary tokens in their order, and the
+    only agent-position term: the distance to the nearest edge (`center_prox`).
+    """
+    summary: Dict[str, Any] = obs.get("summary", {})
+    agent = obs.get("agent", {"x": 0, "y": 0})
+    x, y = agent.get("x", 0), agent.get("y", 0)
+    view = obs["view"]
+    return (
+        view.tobytes() if np is not None and isinstance(view, np.ndarray) else tuple(tuple(row) for row in view),
+        tuple(summary.get("unique", [])),
+        tuple((summary.get("counts") or {}).items()),
+        min(x, y, grid_size - 1 - x, grid_size - 1 - y),
+    )
+
+
 def extract_features(obs: Dict[str, Any], *, grid_size: int) -> Dict[str, Any]:
     """Compute simple, normalized features from an observation.
 
     Returns a dict with scalars in [0,1] where sensible, plus small histograms.
+    The view is token strings, or an array of cell codes (envs made with obs_mode="array"),
+    for which the per-cell walks become slice sums; both give identical features.
     """
-    view: List[List[str]] = obs["view"]
+    view: Any = obs["view"]
     summary: Dict[str, Any] = obs.get("summary", {})
     agent = obs.get("agent", {"x": 0, "y": 0})
 
@@ -41,8 +110,14 @@ def extract_features(obs: Dict[str, Any], *, grid_size: int) -> Dict[str, Any]:
                 shape_hist[shp] += int(c)
             total_tokens += int(c)
 
+    if np is not None and isinstance(view, np.ndarray):
+        occupied, (up, down, left, right), (upN, downN, leftN, rightN) = _occupancy_codes(
+            view, agent_mark=bool(obs.get("agent_mark"))
+        )
+    else:
+        occupied, (up, down, left, right), (upN, downN, leftN, rightN) = _occupancy_tokens(view)
+
     # Density / diversity
-    occupied = sum(1 for row in view for t in row if _is_token(t))
     density = occupied / float(n_cells)
     diversity = (len(uniq) / float(n_cells)) if n_cells else 0.0
 
@@ -57,31 +132,6 @@ def extract_features(obs: Dict[str, Any], *, grid_size: int) -> Dict[str, Any]:
     entropy = ent / math.log(max(2, K), 2)
 
     # Directional densities around agent
-    cx = H // 2
-    cy = W // 2
-    up = down = left = right = 0
-    upN = downN = leftN = rightN = 0
-    for y in range(H):
-        for x in range(W):
-            if x == cx and y == cy:
-                continue
-            t = view[y][x]
-            if y < cy:
-                upN += 1
-                if _is_token(t):
-                    up += 1
-            if y > cy:
-                downN += 1
-                if _is_token(t):
-                    down += 1
-            if x < cx:
-                leftN += 1
-                if _is_token(t):
-                    left += 1
-            if x > cx:
-                rightN += 1
-                if _is_token(t):
-                    right += 1
     dir_up = up / float(max(1, upN))
     dir_down = down / float(max(1, downN))
     dir_left = left / float(max(1, leftN))
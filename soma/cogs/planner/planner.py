@@ -29,7 +29,7 @@ class BehaviorPlanner:
         rng_seed: int,
         dominant: str,
         curiosity: Dict[str, float | List[str]],
-        matches: List[Tuple<int, float]],
+        matches: List[Tuple[int, float]],
         pos: Tuple[int, int],
         least_visited: List[str],
         boredom: float,
@@ -2,21 +2,38 @@ from __future__ import annotations
 
 from typing import Any, Dict, Optional
 
-from soma.core.events import JsonlEventLog
-from soma.core.store import EventStore
+from soma.core.sinks import EventSinks
+
+
+# Per-kind note verbosity: "full" keeps the payload, "brief" keeps only its scalar fields,
+# "off" drops the note. Kinds follow the emitting cog (curiosity, motivation, symbol, reflex,
+# query, caregiver_tag, ...); "*" sets the default for kinds not listed.
+NOTE_LEVELS = ("off", "brief", "full")
+
+
+def check_note_levels(levels: Optional[Dict[str, str]]) -> Dict[str, str]:
+    out = dict(levels or {})
+    bad = {k: v for k, v in out.items() if v not in NOTE_LEVELS}
+    if bad:
+        raise ValueError(f"unknown note level(s) {bad} (expected one of {NOTE_LEVELS})")
+    return out
 
 
 class SelfNotes:
-    """Structured self-notes that write to both JSONL and SQLite."""
+    """Structured self-notes, emitted once to every sink of the run (JSONL, SQLite, ...)."""
 
-    def __init__(self, event_log: JsonlEventLog, store: EventStore):
-        self.event_log = event_log
-        self.store = store
+    def __init__(self, sinks: EventSinks, levels: Optional[Dict[str, str]] = None):
+        self.sinks = sinks
+        self.levels = check_note_levels(levels)
+        self._default = self.levels.get("*", "full")
 
     def note(self, kind: str, payload: Dict[str, Any], tick: Optional[int] = None) -> None:
+        level = self.levels.get(kind, self._default)
+        if level == "off":
+            return
+        if level == "brief":
+            payload = {k: v for k, v in payload.items() if v is None or isinstance(v, (str, int, float, bool))}
         event = {"type": "note", "kind": kind, "payload": payload}
         if tick is not None:
             event["tick"] = tick
-        self.event_log.write(event)
-        store_tick = tick if tick is not None else -1
-        self.store.write(event_type="note", tick=store_tick, payload=event)
\ No newline at end of file
+        self.sinks.emit(event, tick=tick if tick is not None else -1)
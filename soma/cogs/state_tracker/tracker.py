@@ -3,9 +3,11 @@ from __future__ import annotations
 from collections import deque
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Deque, Dict, List, Tuple
+from typing import Any, Deque, Dict, List, Optional, Tuple
 import json
 
+from soma.core.writer import BackgroundWriter
+
 
 class StateTracker:
     """Keep a compact, human-readable snapshot of SOMA's internal state.
@@ -13,11 +15,14 @@ class StateTracker:
     Files:
       - state.json  : latest snapshot
       - state.jsonl : append-only history of snapshots (one per tick)
+
+    With a `writer`, file updates run on the background writer thread.
     """
 
-    def __init__(self, run_dir: Path, keep: int = 128) -> None:
+    def __init__(self, run_dir: Path, keep: int = 128, *, writer: Optional[BackgroundWriter] = None) -> None:
         self.run_dir = Path(run_dir)
         self.keep = int(keep)
+        self.writer = writer
         self.history: Deque[Dict[str, Any]] = deque(maxlen=keep)
         self._state_path = self.run_dir / "state.json"
         self._hist_path = self.run_dir / "state.jsonl"
@@ -57,9 +62,15 @@ class StateTracker:
     def update(self, **kwargs: Any) -> Dict[str, Any]:
         snap = self._snapshot(**kwargs)
         self.history.append(snap)
+        if self.writer is not None:
+            self.writer.submit(self._persist, snap)
+        else:
+            self._persist(snap)
+        return snap
+
+    def _persist(self, snap: Dict[str, Any]) -> None:
         # Write current snapshot
         self._state_path.write_text(json.dumps(snap, indent=2), encoding="utf-8")
         # Append to history
         with self._hist_path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(snap) + "\n")
-        return snap
\ No newline at end of file
+            f.write(json.dumps(snap) + "\n")
\ No newline at end of file
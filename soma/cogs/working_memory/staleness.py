@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Sequence, Tuple, Any
+
+from soma.compat import np, require_numpy
 
 
 def _view_key(summary: Dict[str, Any]) -> Tuple[Tuple[str, int], ...]:
@@ -104,4 +106,71 @@ class StalenessMonitor:
             return []
         m = min(counts.values())
         # Return directions sorted from least to most visited
-        return [d for d, c in sorted(counts.items(), key=lambda kv: (kv[1], kv[0])) if c == m]
\ No newline at end of file
+        return [d for d, c in sorted(counts.items(), key=lambda kv: (kv[1], kv[0])) if c == m]
+
+
+class StalenessBatch:
+    """Array-backed StalenessMonitor for B agents stepped in lockstep.
+
+    Novelty EMA, streaks and boredom are (B,) arrays; the visited heatmap is a (B, size, size)
+    count array plus a `seen` mask (StalenessMonitor counts a cell as visited once it is a key).
+    """
+
+    def __init__(self, n: int, size: int, *, alpha: float = 0.2, novelty_low: float = 0.15, max_noop: int = 5, max_repeat: int = 5) -> None:
+        require_numpy("StalenessBatch")
+        self.n = int(n)
+        self.size = int(size)
+        self.alpha = float(alpha)
+        self.novelty_low = float(novelty_low)
+        self.max_noop = int(max_noop)
+        self.max_repeat = int(max_repeat)
+        self.novelty_ema = np.ones(self.n, dtype=np.float64)
+        self.noop_streak = np.zeros(self.n, dtype=np.int64)
+        self.repeat_view_streak = np.zeros(self.n, dtype=np.int64)
+        self.last_view: List[Tuple[Tuple[str, int], ...] | None] = [None] * self.n
+        self.visits = np.zeros((self.n, self.size, self.size), dtype=np.int64)
+        self.seen = np.zeros((self.n, self.size, self.size), dtype=bool)
+        self._rows = np.arange(self.n)
+
+    def pre(self, summaries: Sequence[Dict[str, Any]], novelty, pos: Sequence[Tuple[int, int]]) -> List[Dict[str, float | int]]:
+        nov = np.maximum(0.0, np.minimum(1.0, np.asarray(novelty, dtype=np.float64)))
+        self.novelty_ema = (1.0 - self.alpha) * self.novelty_ema + self.alpha * nov
+        for b, summary in enumerate(summaries):
+            key = _view_key(summary)
+            if self.last_view[b] is not None and key == self.last_view[b]:
+                self.repeat_view_streak[b] += 1
+            else:
+                self.repeat_view_streak[b] = 0
+            self.last_view[b] = key
+        xs = np.array([p[0] for p in pos], dtype=np.int64)
+        ys = np.array([p[1] for p in pos], dtype=np.int64)
+        self.seen[self._rows, ys, xs] = True
+        bored = 0.0 + 0.5 * np.maximum(0.0, 1.0 - self.novelty_ema)
+        bored = bored + 0.25 * np.minimum(1.0, self.noop_streak / max(1, self.max_noop))
+        bored = bored + 0.25 * np.minimum(1.0, self.repeat_view_streak / max(1, self.max_repeat))
+        bored = np.maximum(0.0, np.minimum(1.0, bored))
+        return [
+            {"novelty_ema": e, "noop_streak": ns, "repeat_view_streak": rs, "boredom": bo}
+            for e, ns, rs, bo in zip(
+                self.novelty_ema.tolist(), self.noop_streak.tolist(), self.repeat_view_streak.tolist(), bored.tolist()
+            )
+        ]
+
+    def post(self, actions: Sequence[str], pos_next: Sequence[Tuple[int, int]]) -> None:
+        noop = np.array([a == "noop" for a in actions], dtype=bool)
+        self.noop_streak = np.where(noop, self.noop_streak + 1, 0)
+        xs = np.array([p[0] for p in pos_next], dtype=np.int64)
+        ys = np.array([p[1] for p in pos_next], dtype=np.int64)
+        self.visits[self._rows, ys, xs] += 1
+        self.seen[self._rows, ys, xs] = True
+
+    def coverage(self):
+        return self.seen.sum(axis=(1, 2)) / float(self.size * self.size)
+
+    def least_visited_dirs(self, b: int, pos: Tuple[int, int]) -> List[str]:
+        nb = _neighbors(pos, self.size)
+        if not nb:
+            return []
+        counts = {d: int(self.visits[b, p[1], p[0]]) for d, p in nb.items()}
+        m = min(counts.values())
+        return [d for d, c in sorted(counts.items(), key=lambda kv: (kv[1], kv[0])) if c == m]
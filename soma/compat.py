@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+# Optional numpy: array backends import `np` from here and call `require_numpy` before use.
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None  # type: ignore[assignment]
+
+
+def require_numpy(feature: str) -> None:
+    if np is None:
+        raise ImportError(f"{feature} requires numpy (pip install numpy)")
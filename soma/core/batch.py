@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import json
+
+from rich.console import Console
+from rich.table import Table
+
+from soma.cogs.self_notes.notes import SelfNotes
+from soma.cogs.reflex.reflex import ReflexManager
+from soma.cogs.memory.memory import MemoryBatch
+from soma.cogs.curiosity.curiosity import CuriosityEngine
+from soma.cogs.motivation.motivation import MotivationBatch
+from soma.cogs.planner.planner import BehaviorPlanner
+from soma.cogs.perception.features import extract_features
+from soma.cogs.perception.embedder import PerceptionEmbedderV2
+from soma.cogs.working_memory.staleness import StalenessBatch
+from soma.cogs.state_tracker.tracker import StateTracker
+from soma.cogs.caregiver.interface import CaregiverInterface
+from soma.cogs.channel.symbolic import SymbolicChannel
+from soma.compat import np, require_numpy
+from soma.sandbox import make_env
+from .state import StateSnapshot
+from .catalog import register, set_status
+from .sinks import EventSinks
+from .tick import _open_sinks, _run_cleanup, _run_meta, _tick_event, cog_params
+
+
+console = Console()
+
+
+def run_batch(
+    ticks: int,
+    seeds: Sequence[int],
+    run_dirs: Sequence[Path],
+    run_ids: Sequence[str],
+    env_name: str = "grid-v0",
+    size: int = 9,
+    n_objects: int = 12,
+    view_radius: int = 1,
+    dim: int = 64,
+    durability: str = "full",
+    cogs: Optional[Dict[str, Dict[str, Any]]] = None,
+    catalog: Optional[Path] = None,
+) -> None:
+    """Advance B independent agents + envs in lockstep (one per seed).
+
+    Drives, staleness, embeddings and recall live in (B, ...) arrays, so their per-tick work is
+    one array operation over the batch. Each agent writes its own run dir, and its events are
+    identical to `run_loop(..., memory_backend="numpy")` with the same seed (wall-clock
+    timestamps aside). Rule-based cogs (curiosity, planner, reflex, channel, caregiver) stay
+    per agent. `catalog` is the runs directory whose catalog tracks the B runs.
+    """
+    require_numpy("run_batch")
+    B = len(seeds)
+    params = cog_params(cogs)
+    if not (len(run_dirs) == len(run_ids) == B):
+        raise ValueError("seeds, run_dirs and run_ids must have the same length")
+
+    sinks: List[EventSinks] = []
+    notes: List[SelfNotes] = []
+    tick = 0
+    completed = False
+    try:
+        # setup is inside the try: sinks opened before a later failure still get closed
+        for seed, run_dir, run_id in zip(seeds, run_dirs, run_ids):
+            meta = _run_meta(
+                run_id=run_id,
+                ticks=ticks,
+                seed=seed,
+                env_name=env_name,
+                size=size,
+                n_objects=n_objects,
+                view_radius=view_radius,
+                memory_backend="numpy",
+                durability=durability,
+                async_io=False,
+                cogs=params,
+                dim=dim,
+            )
+            meta["batch"] = {"size": B, "seeds": list(seeds)}
+            (Path(run_dir) / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+            if catalog is not None:
+                register(catalog, Path(run_dir), meta)
+            events = _open_sinks(Path(run_dir), run_id, durability=durability, writer=None)
+            sinks.append(events)
+            notes.append(SelfNotes(events))
+
+        reflex = [ReflexManager(notes=n, **params["reflex"]) for n in notes]
+        memory = MemoryBatch(B, dim=dim, max_items=512)
+        curiosity = [CuriosityEngine(notes=n, **params["curiosity"]) for n in notes]
+        motivation = MotivationBatch(notes)
+        planner = [BehaviorPlanner() for _ in range(B)]
+        embedder = PerceptionEmbedderV2(dim=dim)
+        vec_buf = np.zeros((B, dim), dtype=np.float64)  # reused every tick; MemoryBatch copies rows
+        stale = StalenessBatch(B, size=size, **params["staleness"])
+        tracker = [StateTracker(run_dir=Path(d), keep=128) for d in run_dirs]
+        channel = [SymbolicChannel(notes=n, **params["channel"]) for n in notes]
+        caregiver = [CaregiverInterface(run_dir=Path(d), notes=n, run_id=r) for d, n, r in zip(run_dirs, notes, run_ids)]
+        envs = [make_env(env_name, size=size, n_objects=n_objects, view_radius=view_radius) for _ in range(B)]
+
+        states = [StateSnapshot(tick=0, rng_seed=seed, info={}) for seed in seeds]
+        obs: List[Dict[str, Any]] = []
+        for b, (env, seed) in enumerate(zip(envs, seeds)):
+            o = env.reset(seed)
+            obs.append(o)
+            sinks[b].emit({"type": "obs", "tick": 0, "obs": o})
+            notes[b].note(kind="startup", payload={"message": "system alive", "env": env_name}, tick=0)
+
+        for _ in range(ticks):
+            # --- Perception + recall for the whole batch ---
+            feats = [extract_features(o, grid_size=size) for o in obs]
+            vecs = embedder.embed_many(feats, out=vec_buf)
+            matches: List[List[Tuple[int, float]]] = memory.query(vecs, top_k=3, min_score=0.5)
+
+            curs = [
+                curiosity[b].assess(tick=tick, summary=obs[b]["summary"], matches=matches[b], memory=memory.memories[b])
+                for b in range(B)
+            ]
+            memory.add_vectors(
+                tick=tick,
+                vectors=vecs,
+                metas=[{"features": feats[b], "attention": curs[b].get("attention", [])} for b in range(B)],
+            )
+
+            # --- Staleness + motivation (array state) ---
+            novelty = [float(c["novelty"]) for c in curs]
+            pos_now = [(o["agent"]["x"], o["agent"]["y"]) for o in obs]
+            sts = stale.pre([o["summary"] for o in obs], novelty, pos_now)
+            boredom = [float(st["boredom"]) for st in sts]
+            max_sim = [float(m[0][1]) if m else 0.0 for m in matches]
+            change = [float(c.get("change", 0.0)) for c in curs]
+            rarity = [float(c.get("rarity", 0.0)) for c in curs]
+            motivation.update(
+                tick=tick, novelty=novelty, change=change, rarity=rarity, max_sim=max_sim, overloaded=[0.0] * B, boredom=boredom
+            )
+
+            # --- Per-agent rule cogs ---
+            plans: List[Tuple[str, str]] = []
+            finals: List[str] = []
+            trig: List[List[str]] = []
+            for b in range(B):
+                plans.append(
+                    planner[b].propose(
+                        tick=tick,
+                        rng_seed=states[b].rng_seed,
+                        dominant=motivation.dominant(b),
+                        curiosity=curs[b],
+                        matches=matches[b],
+                        pos=pos_now[b],
+                        least_visited=stale.least_visited_dirs(b, pos_now[b]),
+                        boredom=boredom[b],
+                    )
+                )
+                final_action, triggers = reflex[b].advise(
+                    tick=tick, selected=plans[b][1], unique_tokens=obs[b]["summary"]["unique"]
+                )
+                finals.append(final_action)
+                trig.append(triggers)
+            if any(trig):
+                motivation.update(
+                    tick=tick,
+                    novelty=novelty,
+                    change=change,
+                    rarity=rarity,
+                    max_sim=max_sim,
+                    overloaded=[1.0 if "overload" in t else 0.0 for t in trig],
+                    boredom=boredom,
+                    mask=[bool(t) for t in trig],
+                )
+
+            emitted = []
+            for b in range(B):
+                drives = motivation.drives(b)
+                dominant = motivation.dominant(b)
+                tokens, gloss, ext_pairs = channel[b].maybe_emit(
+                    tick=tick,
+                    novelty=novelty[b],
+                    boredom=boredom[b],
+                    matches=matches[b],
+                    summary=obs[b]["summary"],
+                    drives=drives,
+                    dominant=dominant,
+                    noop_streak=int(sts[b]["noop_streak"]),
+                    reflex_triggers=trig[b],
+                )
+                caregiver[b].maybe_query(
+                    tick=tick,
+                    tokens=tokens,
+                    context={
+                        "dominant": dominant,
+                        "novelty": novelty[b],
+                        "boredom": boredom[b],
+                        "unique": obs[b]["summary"].get("unique", []),
+                    },
+                )
+                if caregiver[b].poll_answers():
+                    channel[b].set_tags(caregiver[b].tags)
+                emitted.append((drives, dominant, tokens, gloss, ext_pairs))
+
+            # --- Step every env, then post-step bookkeeping ---
+            nxt = [env.step(a)[0] for env, a in zip(envs, finals)]
+            stale.post(finals, [(o["agent"]["x"], o["agent"]["y"]) for o in nxt])
+            coverage = stale.coverage().tolist()
+
+            for b in range(B):
+                drives, dominant, tokens, gloss, ext_pairs = emitted[b]
+                behavior, selected = plans[b]
+                snapshot = tracker[b].update(
+                    tick=tick,
+                    drive=dominant,
+                    behavior=behavior,
+                    action=finals[b],
+                    novelty=novelty[b],
+                    boredom=boredom[b],
+                    coverage=coverage[b],
+                    matches=matches[b],
+                    attention=list(curs[b].get("attention", [])),
+                    reflex=trig[b],
+                )
+                event = _tick_event(
+                    state=states[b],
+                    behavior=behavior,
+                    selected=selected,
+                    final_action=finals[b],
+                    triggers=trig[b],
+                    cur=curs[b],
+                    matches=matches[b],
+                    drives=drives,
+                    dominant=dominant,
+                    st=sts[b],
+                    feats=feats[b],
+                    snapshot=snapshot,
+                    tokens=tokens,
+                    gloss=gloss,
+                    ext_pairs=ext_pairs,
+                    obs_next=nxt[b],
+                )
+                sinks[b].emit(event)
+
+            obs = nxt
+            states = [s.next() for s in states]
+            tick += 1
+
+        for n in notes:
+            n.note(kind="shutdown", payload={"ticks": ticks}, tick=tick)
+        completed = True
+    finally:
+        error = _run_cleanup([events.close for events in sinks])
+        if catalog is not None:
+            for run_id in run_ids:
+                set_status(catalog, run_id, "done" if completed and error is None else "failed")
+        if error is not None:
+            raise error
+
+    table = Table(title=f"SOMA batch — {B} agents × {ticks} ticks ({env_name})")
+    table.add_column("Run")
+    table.add_column("Seed")
+    table.add_column("Cover")
+    table.add_column("Pos")
+    cov = stale.coverage().tolist()
+    for b in range(B):
+        table.add_row(str(run_ids[b]), str(seeds[b]), f"{cov[b]:.2f}", f"({obs[b]['agent']['x']},{obs[b]['agent']['y']})")
+    console.print(table)
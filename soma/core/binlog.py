@@ -0,0 +1,371 @@
+"""Compact binary event log (alternative to JsonlEventLog).
+
+Files for a log at `events.bin`:
+  events.bin       MAGIC, then records: varint(len(body)) + body, body = zigzag(tick) + value
+  events.bin.keys  interned strings, one JSON string per line (line number = id)
+  events.bin.idx   fixed-width (tick, offset) pairs, '<qQ', one per first record of a tick
+
+Values use a one-byte tag: None/True/False, zigzag varint ints, packed '<d' floats,
+interned or inline strings, lists and dicts (dict keys are always interned). Records
+without a tick (notes written with tick=None) are stored with tick -1 and not indexed.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+import json
+import struct
+
+
+MAGIC = b"SOMB\x01\n"
+_IDX = struct.Struct("<qQ")
+_F64 = struct.Struct("<d")
+
+# value tags
+_NONE, _TRUE, _FALSE, _INT, _FLOAT, _STR, _ISTR, _LIST, _DICT = b"NTFidskLD"
+# strings up to this length are interned (tokens, drive names, actions, ...)
+INTERN_MAX_LEN = 24
+INTERN_MAX_KEYS = 1 << 16
+
+
+# ---------------- varints ----------------
+def _write_varint(out: bytearray, n: int) -> None:
+    while True:
+        b = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(b | 0x80)
+        else:
+            out.append(b)
+            return
+
+
+def _read_varint(buf: bytes, pos: int) -> Tuple[int, int]:
+    shift = 0
+    n = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return n, pos
+        shift += 7
+
+
+def _zigzag(n: int) -> int:
+    return n * 2 if n >= 0 else -n * 2 - 1
+
+
+def _unzigzag(n: int) -> int:
+    return n >> 1 if not n & 1 else -((n + 1) >> 1)
+
+
+def _json_key(k: Any) -> str:
+    # same coercion json.dumps applies to non-string dict keys
+    return k if isinstance(k, str) else json.dumps(k)
+
+
+# ---------------- codec ----------------
+class KeyTable:
+    """String <-> id table shared by an encoder/decoder pair; `new` collects unsaved entries."""
+
+    def __init__(self, strings: Optional[List[str]] = None) -> None:
+        self.strings: List[str] = list(strings or [])
+        self.ids: Dict[str, int] = {s: i for i, s in enumerate(self.strings)}
+        self.new: List[str] = []
+
+    def intern(self, s: str) -> int:
+        i = self.ids.get(s)
+        if i is None:
+            i = self.ids[s] = len(self.strings)
+            self.strings.append(s)
+            self.new.append(s)
+        return i
+
+    def full(self) -> bool:
+        return len(self.strings) >= INTERN_MAX_KEYS
+
+
+def encode_value(v: Any, out: bytearray, keys: KeyTable) -> None:
+    if v is None:
+        out.append(_NONE)
+    elif v is True:
+        out.append(_TRUE)
+    elif v is False:
+        out.append(_FALSE)
+    elif isinstance(v, int):
+        out.append(_INT)
+        _write_varint(out, _zigzag(v))
+    elif isinstance(v, float):
+        out.append(_FLOAT)
+        out += _F64.pack(v)
+    elif isinstance(v, str):
+        if len(v) <= INTERN_MAX_LEN and (v in keys.ids or not keys.full()):
+            out.append(_ISTR)
+            _write_varint(out, keys.intern(v))
+        else:
+            b = v.encode("utf-8")
+            out.append(_STR)
+            _write_varint(out, len(b))
+            out += b
+    elif isinstance(v, dict):
+        out.append(_DICT)
+        _write_varint(out, len(v))
+        for k, x in v.items():
+            _write_varint(out, keys.intern(_json_key(k)))
+            encode_value(x, out, keys)
+    elif isinstance(v, (list, tuple)):
+        out.append(_LIST)
+        _write_varint(out, len(v))
+        for x in v:
+            encode_value(x, out, keys)
+    else:
+        raise TypeError(f"cannot encode {type(v).__name__} in a binary event")
+
+
+def decode_value(buf: bytes, pos: int, strings: List[str]) -> Tuple[Any, int]:
+    tag = buf[pos]
+    pos += 1
+    if tag == _ISTR:
+        i, pos = _read_varint(buf, pos)
+        return strings[i], pos
+    if tag == _FLOAT:
+        return _F64.unpack_from(buf, pos)[0], pos + 8
+    if tag == _INT:
+        n, pos = _read_varint(buf, pos)
+        return _unzigzag(n), pos
+    if tag == _DICT:
+        n, pos = _read_varint(buf, pos)
+        d: Dict[str, Any] = {}
+        for _ in range(n):
+            k, pos = _read_varint(buf, pos)
+            d[strings[k]], pos = decode_value(buf, pos, strings)
+        return d, pos
+    if tag == _LIST:
+        n, pos = _read_varint(buf, pos)
+        out: List[Any] = []
+        for _ in range(n):
+            x, pos = decode_value(buf, pos, strings)
+            out.append(x)
+        return out, pos
+    if tag == _STR:
+        n, pos = _read_varint(buf, pos)
+        return buf[pos : pos + n].decode("utf-8"), pos + n
+    if tag == _NONE:
+        return None, pos
+    if tag == _TRUE:
+        return True, pos
+    if tag == _FALSE:
+        return False, pos
+    raise ValueError(f"bad value tag {tag!r} at byte {pos - 1}")
+
+
+def _record_tick(event: Dict[str, Any]) -> int:
+    t = event.get("tick")
+    return int(t) if isinstance(t, int) and not isinstance(t, bool) and t >= 0 else -1
+
+
+# ---------------- writer ----------------
+class BinaryEventLog:
+    """Drop-in alternative to JsonlEventLog writing the binary format above.
+
+    Like JsonlEventLog, every `write` is flushed; new interned strings reach the keys file
+    before the record that uses them, so a crash never leaves undecodable records.
+    Appending to an existing log continues its key table and index, after cutting off
+    whatever a crash left behind the last whole record.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.keys_path = Path(str(self.path) + ".keys")
+        self.idx_path = Path(str(self.path) + ".idx")
+        if not self.path.exists() or self.path.stat().st_size < len(MAGIC):
+            self.path.write_bytes(MAGIC)
+        self._offset, self._last_tick = _repair(self.path, self.keys_path, self.idx_path)
+        self.keys = KeyTable(_load_keys(self.keys_path))
+        self._fh: IO[bytes] = self.path.open("ab")
+        self._kf: IO[str] = self.keys_path.open("a", encoding="utf-8")
+        self._xf: IO[bytes] = self.idx_path.open("ab")
+
+    def write(self, event: Dict[str, Any]) -> None:
+        tick = _record_tick(event)
+        body = bytearray()
+        _write_varint(body, _zigzag(tick))
+        encode_value(event, body, self.keys)
+        if self.keys.new:
+            self._kf.write("".join(json.dumps(s, ensure_ascii=False) + "\n" for s in self.keys.new))
+            self._kf.flush()
+            self.keys.new.clear()
+        head = bytearray()
+        _write_varint(head, len(body))
+        if tick > self._last_tick:
+            self._xf.write(_IDX.pack(tick, self._offset))
+            self._xf.flush()
+            self._last_tick = tick
+        self._fh.write(head)
+        self._fh.write(body)
+        self._fh.flush()
+        self._offset += len(head) + len(body)
+
+    def write_encoded(self, ev: Any) -> None:
+        """Sink interface (soma.core.sinks): the binary codec works on the dict, not the JSON text."""
+        self.write(ev.event)
+
+    def close(self) -> None:
+        for fh in (self._fh, self._kf, self._xf):
+            try:
+                fh.close()
+            except Exception:
+                pass
+
+
+def _load_keys(path: Path) -> List[str]:
+    if not path.exists():
+        return []
+    out: List[str] = []
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break  # torn final line: its record was never written
+            out.append(json.loads(line))
+    return out
+
+
+def _truncate(path: Path, size: int) -> None:
+    if path.exists() and path.stat().st_size > size:
+        with path.open("r+b") as f:
+            f.truncate(size)
+
+
+def _repair(path: Path, keys_path: Path, idx_path: Path) -> Tuple[int, int]:
+    """Cut a log back to its last whole record; returns (end offset, last indexed tick).
+
+    The torn tail of a crashed writer (partial record, key line or index entry) is dropped,
+    so appends continue right after the last record that decodes.
+    """
+    if keys_path.exists():
+        raw = keys_path.read_bytes()
+        _truncate(keys_path, raw.rfind(b"\n") + 1)
+    reader = BinaryEventReader(path)
+    size = path.stat().st_size
+    i = len(reader.index_offsets)
+    with path.open("rb") as f:
+        while True:
+            # the last index entry whose first record decodes (or the start of the log)
+            i -= 1
+            start = reader.index_offsets[i] if i >= 0 else len(MAGIC)
+            if start > size:
+                continue
+            f.seek(start)
+            records = reader._records(f)
+            if next(records, None) is None:
+                if i >= 0:
+                    continue
+                end = start
+                break
+            end = f.tell()
+            for _ in records:
+                end = f.tell()
+            break
+    _truncate(path, end)
+    _truncate(idx_path, (i + 1) * _IDX.size)
+    return end, reader.index_ticks[i] if i >= 0 else -1
+
+
+# ---------------- reader ----------------
+class BinaryEventReader:
+    """Random-access reader: `events_at(tick)` is one bisect over the index + one seek."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.strings = _load_keys(Path(str(self.path) + ".keys"))
+        idx_path = Path(str(self.path) + ".idx")
+        raw = idx_path.read_bytes() if idx_path.exists() else b""
+        pairs = [_IDX.unpack_from(raw, i) for i in range(0, len(raw) - len(raw) % _IDX.size, _IDX.size)]
+        self.index_ticks = [t for t, _ in pairs]
+        self.index_offsets = [o for _, o in pairs]
+
+    def _records(self, f: IO[bytes]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """(tick, event) from the current position; stops quietly at a torn final record."""
+        while True:
+            head = f.read(1)
+            if not head:
+                return
+            n, shift, b = 0, 0, head[0]
+            while True:
+                n |= (b & 0x7F) << shift
+                if not b & 0x80:
+                    break
+                shift += 7
+                nxt = f.read(1)
+                if not nxt:
+                    return
+                b = nxt[0]
+            body = f.read(n)
+            if len(body) < n:
+                return
+            zt, pos = _read_varint(body, 0)
+            try:
+                event, _ = decode_value(body, pos, self.strings)
+            except (IndexError, ValueError, struct.error):
+                return  # key table shorter than the data, or garbage past a crash
+            yield _unzigzag(zt), event
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with self.path.open("rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not a SOMA binary event log")
+            for _, event in self._records(f):
+                yield event
+
+    def iter_range(self, start: int, end: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Events with start <= tick < end (untimed records in between included)."""
+        i = bisect_left(self.index_ticks, start)
+        if i >= len(self.index_ticks):
+            return
+        with self.path.open("rb") as f:
+            f.seek(self.index_offsets[i])
+            for tick, event in self._records(f):
+                if end is not None and tick >= end:
+                    return
+                yield event
+
+    def events_at(self, tick: int) -> List[Dict[str, Any]]:
+        i = bisect_left(self.index_ticks, tick)
+        if i >= len(self.index_ticks) or self.index_ticks[i] != tick:
+            return []
+        return [e for e in self.iter_range(tick, tick + 1) if _record_tick(e) == tick]
+
+
+# ---------------- conversion ----------------
+def jsonl_to_binary(src: Path, dst: Path) -> int:
+    """Convert events.jsonl -> binary log; returns the number of events."""
+    n = 0
+    log = BinaryEventLog(dst)
+    try:
+        with Path(src).open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                log.write(event)
+                n += 1
+    finally:
+        log.close()
+    return n
+
+
+def binary_to_jsonl(src: Path, dst: Path) -> int:
+    """Convert a binary log -> JSONL with the same formatting as JsonlEventLog."""
+    n = 0
+    with Path(dst).open("w", encoding="utf-8") as out:
+        for event in BinaryEventReader(src):
+            out.write(json.dumps(event, ensure_ascii=False) + "\n")
+            n += 1
+    return n
@@ -0,0 +1,191 @@
+"""Run catalog: one small SQLite index of the runs under a runs directory.
+
+`runs/catalog.sqlite` holds one row per run (id, path relative to runs/, creation time,
+env parameters, seed, ticks, status). run_loop / run_batch register a run as "running"
+and mark it "done" or "failed"; each update is a single transaction, and WAL plus a busy
+timeout let parallel sweep workers update it at once. Lookups by id or "latest" are
+index seeks instead of a stat() of every directory under runs/.
+
+Runs made before the catalog existed are picked up by `rebuild` (run once automatically
+when a lookup finds no catalog).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import os
+import sqlite3
+
+
+CATALOG_FILE = "catalog.sqlite"
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS runs (
+      run_id TEXT PRIMARY KEY,
+      path TEXT NOT NULL,
+      created_at TEXT NOT NULL,
+      env TEXT,
+      size INTEGER,
+      n_objects INTEGER,
+      view_radius INTEGER,
+      seed INTEGER,
+      ticks INTEGER,
+      status TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_catalog_created ON runs(created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_catalog_env_seed ON runs(env, seed)",
+)
+
+_COLUMNS = ("run_id", "path", "created_at", "env", "size", "n_objects", "view_radius", "seed", "ticks", "status")
+
+
+def catalog_path(runs_dir: Path) -> Path:
+    return Path(runs_dir) / CATALOG_FILE
+
+
+def connect(runs_dir: Path) -> sqlite3.Connection:
+    Path(runs_dir).mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(catalog_path(runs_dir)), timeout=30.0)
+    conn.execute("PRAGMA busy_timeout=30000")
+    conn.execute("PRAGMA journal_mode=WAL")
+    with conn:
+        for sql in _SCHEMA:
+            conn.execute(sql)
+    return conn
+
+
+def _row(runs_dir: Path, run_dir: Path, meta: Dict[str, Any], status: str) -> Tuple[Any, ...]:
+    env = meta.get("env") or {}
+    return (
+        str(meta.get("run_id") or Path(run_dir).name),
+        Path(os.path.relpath(run_dir, runs_dir)).as_posix(),
+        str(meta.get("created_at") or ""),
+        env.get("name"),
+        env.get("size"),
+        env.get("n_objects"),
+        env.get("view_radius"),
+        meta.get("seed"),
+        meta.get("ticks"),
+        status,
+    )
+
+
+def register(runs_dir: Path, run_dir: Path, meta: Dict[str, Any], status: str = "running") -> None:
+    """Insert or replace the catalog row for a run (one transaction)."""
+    if not catalog_path(runs_dir).exists():
+        rebuild(runs_dir)  # first catalogued run: pick up the runs made before
+    conn = connect(runs_dir)
+    try:
+        with conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO runs({', '.join(_COLUMNS)}) VALUES({','.join('?' * len(_COLUMNS))})",
+                _row(runs_dir, run_dir, meta, status),
+            )
+    finally:
+        conn.close()
+
+
+def set_status(runs_dir: Path, run_id: str, status: str) -> None:
+    conn = connect(runs_dir)
+    try:
+        with conn:
+            conn.execute("UPDATE runs SET status = ? WHERE run_id = ?", (status, run_id))
+    finally:
+        conn.close()
+
+
+def rebuild(runs_dir: Path) -> int:
+    """(Re)register every run dir with a meta.json up to two levels below `runs_dir` (sweeps)."""
+    runs_dir = Path(runs_dir)
+    rows = []
+    for meta_path in [*runs_dir.glob("*/meta.json"), *runs_dir.glob("*/*/meta.json")]:
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        rows.append(_row(runs_dir, meta_path.parent, meta, "unknown"))
+    conn = connect(runs_dir)
+    try:
+        with conn:
+            # keep the status of runs already catalogued
+            conn.executemany(
+                f"INSERT INTO runs({', '.join(_COLUMNS)}) VALUES({','.join('?' * len(_COLUMNS))}) "
+                "ON CONFLICT(run_id) DO UPDATE SET path = excluded.path",
+                rows,
+            )
+    finally:
+        conn.close()
+    return len(rows)
+
+
+def _ensure(runs_dir: Path) -> None:
+    if not catalog_path(runs_dir).exists() and Path(runs_dir).is_dir():
+        rebuild(runs_dir)
+
+
+def find_runs(
+    runs_dir: Path,
+    *,
+    env: Optional[str] = None,
+    seed_min: Optional[int] = None,
+    seed_max: Optional[int] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Catalog rows matching the filters, newest first; `since`/`until` are ISO dates or times (UTC)."""
+    _ensure(runs_dir)
+    if not catalog_path(runs_dir).exists():
+        return []
+    conds: List[str] = []
+    args: List[Any] = []
+    for cond, val in (
+        ("env = ?", env),
+        ("seed >= ?", seed_min),
+        ("seed <= ?", seed_max),
+        ("created_at >= ?", since),
+        ("created_at < ?", until),
+        ("status = ?", status),
+    ):
+        if val is not None:
+            conds.append(cond)
+            args.append(val)
+    q = f"SELECT {', '.join(_COLUMNS)} FROM runs"
+    if conds:
+        q += " WHERE " + " AND ".join(conds)
+    q += " ORDER BY created_at DESC"
+    if limit is not None:
+        q += " LIMIT ?"
+        args.append(int(limit))
+    conn = connect(runs_dir)
+    try:
+        return [dict(zip(_COLUMNS, r)) for r in conn.execute(q, args)]
+    finally:
+        conn.close()
+
+
+def resolve_run(runs_dir: Path, ref: str) -> Path:
+    """Run directory for `ref`: an existing path, "last"/"latest", or a run id from the catalog."""
+    runs_dir = Path(runs_dir)
+    if Path(ref).is_dir():
+        return Path(ref)
+    if ref in ("last", "latest"):
+        rows = find_runs(runs_dir, limit=1)
+    else:
+        _ensure(runs_dir)
+        rows = []
+        if catalog_path(runs_dir).exists():
+            conn = connect(runs_dir)
+            try:
+                r = conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM runs WHERE run_id = ?", (ref,)).fetchone()
+            finally:
+                conn.close()
+            rows = [dict(zip(_COLUMNS, r))] if r else []
+    if not rows:
+        raise FileNotFoundError(f"no run {ref!r} in {runs_dir}")
+    return runs_dir / rows[0]["path"]
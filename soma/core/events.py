@@ -1,26 +1,195 @@
 from __future__ import annotations
 
-from typing import IO, Any, Dict
+from bisect import bisect_right
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
 import json
+import struct
+
+
+# Sidecar index entry: (tick, byte offset of the first line carrying that tick)
+_IDX = struct.Struct("<qQ")
+
+
+def index_path(path: Path) -> Path:
+    return Path(str(path) + ".idx")
+
+
+def _line_tick(event: Dict[str, Any]) -> int:
+    t = event.get("tick")
+    return t if isinstance(t, int) and not isinstance(t, bool) and t >= 0 else -1
 
 
 class JsonlEventLog:
     """Very small JSONL event logger for M0.
 
     Each call to `write` appends a one-line JSON object and flushes the file.
+
+    The log also maintains `<path>.idx`: every `index_every` ticks it records the byte offset
+    of the first line of that tick, so readers (`iter_events(path, start=...)`) can seek
+    to a tick range instead of scanning from the top.
     """
 
-    def __init__(self, path: Path):
-        self._fh: IO[str] = path.open("a", encoding="utf-8")
+    def __init__(self, path: Path, *, index_every: int = 64):
+        self.path = Path(path)
+        self.index_every = max(1, int(index_every))
+        self._fh: IO[bytes] = self.path.open("ab")
+        self._offset = self._fh.tell()
+        if self._offset and not _ends_with_newline(self.path):
+            # terminate a torn last line (crash) so it cannot swallow the next event
+            self._fh.write(b"\n")
+            self._fh.flush()
+            self._offset += 1
+        self._idx_path = index_path(self.path)
+        if self._offset:
+            # appending: make sure the sidecar describes what is already on disk
+            entries = load_index(self.path, every=self.index_every)
+        else:
+            self._idx_path.write_bytes(b"")
+            entries = []
+        self._last_indexed = entries[-1][0] if entries else -1
+        self._xf: IO[bytes] = self._idx_path.open("ab")
 
     def write(self, event: Dict[str, Any]) -> None:
-        json.dump(event, self._fh, ensure_ascii=False)
-        self._fh.write("\n")
+        self._append(json.dumps(event, ensure_ascii=False).encode("utf-8") + b"\n", _line_tick(event))
+
+    def write_encoded(self, ev: Any) -> None:
+        """Append an already serialized event (soma.core.sinks.EncodedEvent)."""
+        self._append(ev.line, _line_tick(ev.event))
+
+    def _append(self, line: bytes, tick: int) -> None:
+        if tick >= 0 and (self._last_indexed < 0 or tick >= self._last_indexed + self.index_every):
+            self._xf.write(_IDX.pack(tick, self._offset))
+            self._xf.flush()
+            self._last_indexed = tick
+        self._fh.write(line)
         self._fh.flush()
+        self._offset += len(line)
+
+    def size(self) -> int:
+        """Bytes in the log file so far."""
+        return self._offset
 
     def close(self) -> None:
+        for fh in (self._fh, self._xf):
+            try:
+                fh.close()
+            except Exception:
+                pass
+
+
+# ---------------- index ----------------
+def _ends_with_newline(path: Path) -> bool:
+    with path.open("rb") as fh:
+        fh.seek(-1, 2)
+        return fh.read(1) == b"\n"
+
+
+def _read_index(idx: Path) -> List[Tuple[int, int]]:
+    raw = idx.read_bytes()
+    return [_IDX.unpack_from(raw, i) for i in range(0, len(raw) - len(raw) % _IDX.size, _IDX.size)]
+
+
+def _tick_at(fh: IO[bytes], offset: int) -> Optional[int]:
+    fh.seek(offset)
+    line = fh.readline()
+    if not line.endswith(b"\n"):
+        return None
+    try:
+        return _line_tick(json.loads(line))
+    except ValueError:
+        return None
+
+
+def _index_valid(path: Path, entries: List[Tuple[int, int]]) -> bool:
+    """Cheap staleness check: entries ascend and the first/last point at lines with their tick."""
+    size = path.stat().st_size
+    if any(b[0] <= a[0] or b[1] <= a[1] for a, b in zip(entries, entries[1:])):
+        return False
+    if entries and entries[-1][1] >= size:
+        return False
+    with path.open("rb") as fh:
+        for tick, offset in (entries[:1] + entries[-1:]):
+            if _tick_at(fh, offset) != tick:
+                return False
+    return True
+
+
+def build_index(path: Path, *, every: int = 64) -> List[Tuple[int, int]]:
+    """Scan `path` and (re)write its sidecar index; a torn final line is not indexed."""
+    path = Path(path)
+    entries: List[Tuple[int, int]] = []
+    last = -1
+    offset = 0
+    with path.open("rb") as fh:
+        for line in fh:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                tick = _line_tick(json.loads(line))
+            except ValueError:
+                tick = -1
+            if tick >= 0 and (last < 0 or tick >= last + every):
+                entries.append((tick, offset))
+                last = tick
+            offset += len(line)
+    try:
+        index_path(path).write_bytes(b"".join(_IDX.pack(t, o) for t, o in entries))
+    except OSError:
+        pass  # read-only run dir: use the in-memory index
+    return entries
+
+
+def load_index(path: Path, *, every: int = 64) -> List[Tuple[int, int]]:
+    """Sidecar index of `path`, rebuilt when missing or stale."""
+    path = Path(path)
+    idx = index_path(path)
+    if idx.exists():
+        entries = _read_index(idx)
+        if (entries or path.stat().st_size == 0) and _index_valid(path, entries):
+            return entries
+    return build_index(path, every=every)
+
+
+# ---------------- readers ----------------
+def iter_events(path: Path, start: Optional[int] = None, end: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Stream events from a JSONL log, optionally only ticks in [start, end).
+
+    With `start`, the sidecar index is used to seek close to the first wanted tick. Lines
+    without a tick (e.g. notes written with tick=None) are yielded when they sit inside the
+    window. Corrupt lines and a partially written final line are skipped.
+    """
+    path = Path(path)
+    if not path.exists():
+        return
+    offset = 0
+    if start is not None:
+        entries = load_index(path)
+        i = bisect_right([t for t, _ in entries], start) - 1
+        if i >= 0:
+            offset = entries[i][1]
+    with path.open("rb") as fh:
+        fh.seek(offset)
+        yield from events_from_lines(fh, start, end)
+
+
+def events_from_lines(lines: Iterable[bytes], start: Optional[int] = None, end: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Decode JSONL byte lines, keeping ticks in [start, end) and the tickless lines among them."""
+    inside = start is None
+    for line in lines:
+        if not line.endswith(b"\n"):
+            return  # still being written
+        line = line.strip()
+        if not line:
+            continue
         try:
-            self._fh.close()
-        except Exception:
-            pass
\ No newline at end of file
+            event = json.loads(line)
+        except ValueError:
+            continue
+        tick = _line_tick(event)
+        if tick >= 0:
+            if end is not None and tick >= end:
+                return
+            inside = start is None or tick >= start
+        if inside:
+            yield event
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import secrets
+
+
+def new_run_id(prefix: str = "m10care") -> str:
+    """Collision-free run id: UTC timestamp to the microsecond plus a random suffix.
+
+    Sortable by creation time, and safe when several runs start within the same second
+    (parallel launches, sweeps).
+    """
+    ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    return f"{prefix}_{ts}_{secrets.token_hex(3)}"
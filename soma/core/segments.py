@@ -0,0 +1,239 @@
+"""Rotating, compressed JSONL event log for long (soak) runs.
+
+Files for a log in `events/`:
+  events/manifest.json           segments in tick order (file, first/last tick, events, bytes, active)
+  events/seg-000000.jsonl.gz     closed segment, compressed on a background thread
+  events/seg-000001.jsonl(.idx)  the active segment, a plain JsonlEventLog
+
+A segment is rotated before the first event of a new tick once it holds `max_bytes` bytes
+or spans `max_ticks` ticks, so a tick never straddles two segments and the manifest's tick
+ranges are disjoint. `iter_segment_events` reads across segments (plain or compressed).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional
+import gzip
+import json
+import lzma
+import os
+import shutil
+import threading
+
+from .events import JsonlEventLog, _line_tick, events_from_lines, index_path, iter_events
+from .writer import BackgroundWriter
+
+
+MANIFEST = "manifest.json"
+# name -> (file suffix, opener)
+COMPRESSORS: Dict[str, Any] = {"gzip": (".gz", gzip.open), "lzma": (".xz", lzma.open), "none": ("", None)}
+_OPENERS: Dict[str, Callable[..., IO[bytes]]] = {".gz": gzip.open, ".xz": lzma.open}
+
+
+def manifest_path(directory: Path) -> Path:
+    return Path(directory) / MANIFEST
+
+
+def load_manifest(directory: Path) -> List[Dict[str, Any]]:
+    path = manifest_path(directory)
+    if not path.exists():
+        return []
+    return list(json.loads(path.read_text(encoding="utf-8"))["segments"])
+
+
+def _segment_name(n: int) -> str:
+    return f"seg-{n:06d}.jsonl"
+
+
+class SegmentedEventLog:
+    """Drop-in alternative to JsonlEventLog that rotates segments by size or tick span.
+
+    Closed segments are compressed (gzip or lzma) on a single background thread and the
+    plain file is removed once the compressed one and the manifest are in place. `close()`
+    also compresses the final segment and waits for pending compression. Reopening a
+    directory continues its last segment and re-queues segments a crash left uncompressed.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        max_bytes: int = 64 << 20,
+        max_ticks: int = 0,
+        compress: str = "gzip",
+        index_every: int = 64,
+    ):
+        if compress not in COMPRESSORS:
+            raise ValueError(f"unknown compression {compress!r} (expected one of {tuple(COMPRESSORS)})")
+        self.dir = Path(directory)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+        self.max_ticks = int(max_ticks)
+        self.compress = compress
+        self.index_every = index_every
+        self._lock = threading.Lock()
+        self._compressor = BackgroundWriter(maxsize=64, name="soma-compress")
+        self.segments = load_manifest(self.dir)
+        for seg in self.segments:
+            if not seg["active"] and not self._is_compressed(seg):
+                self._compressor.submit(self._compress, seg)
+        if self.segments and self.segments[-1]["active"]:
+            self._resume(self.segments[-1])
+        else:
+            self._start_segment()
+
+    # ---------- writing ----------
+    def _start_segment(self) -> None:
+        n = int(self.segments[-1]["file"].split("-")[1].split(".")[0]) + 1 if self.segments else 0
+        seg = {"file": _segment_name(n), "first_tick": None, "last_tick": None, "events": 0, "bytes": 0, "active": True}
+        with self._lock:
+            self.segments.append(seg)
+        self._log = JsonlEventLog(self.dir / seg["file"], index_every=self.index_every)
+        self._events = 0
+        self._last_tick = -1
+        self._save_manifest()
+
+    def _resume(self, seg: Dict[str, Any]) -> None:
+        path = self.dir / seg["file"]
+        self._log = JsonlEventLog(path, index_every=self.index_every)
+        self._events = 0
+        self._last_tick = -1
+        for e in iter_events(path):
+            self._events += 1
+            t = _line_tick(e)
+            if t >= 0:
+                if seg["first_tick"] is None:
+                    seg["first_tick"] = t
+                self._last_tick = t
+
+    def _should_rotate(self, tick: int) -> bool:
+        if tick < 0 or tick == self._last_tick or not self._events:
+            return False
+        if self.max_bytes > 0 and self._log.size() >= self.max_bytes:
+            return True
+        first = self.segments[-1]["first_tick"]
+        return self.max_ticks > 0 and first is not None and tick - first >= self.max_ticks
+
+    def _finish_segment(self) -> Dict[str, Any]:
+        self._log.close()
+        seg = self.segments[-1]
+        with self._lock:
+            seg.update(
+                last_tick=self._last_tick if self._last_tick >= 0 else None,
+                events=self._events,
+                bytes=self._log.size(),
+                active=False,
+            )
+        return seg
+
+    def write(self, event: Dict[str, Any]) -> None:
+        tick = _line_tick(event)
+        self._maybe_rotate(tick)
+        self._log.write(event)
+        self._count(tick)
+
+    def write_encoded(self, ev: Any) -> None:
+        tick = _line_tick(ev.event)
+        self._maybe_rotate(tick)
+        self._log.write_encoded(ev)
+        self._count(tick)
+
+    def _maybe_rotate(self, tick: int) -> None:
+        if self._should_rotate(tick):
+            seg = self._finish_segment()
+            self._start_segment()
+            if self.compress != "none":
+                self._compressor.submit(self._compress, seg)
+
+    def _count(self, tick: int) -> None:
+        self._events += 1
+        if tick >= 0:
+            if self.segments[-1]["first_tick"] is None:
+                self.segments[-1]["first_tick"] = tick
+                self._save_manifest()
+            self._last_tick = tick
+
+    def close(self) -> None:
+        try:
+            if self._events:
+                seg = self._finish_segment()
+                self._save_manifest()
+                if self.compress != "none":
+                    self._compressor.submit(self._compress, seg)
+            else:
+                self._log.close()
+                with self._lock:
+                    seg = self.segments.pop()
+                for p in (self.dir / seg["file"], index_path(self.dir / seg["file"])):
+                    p.unlink(missing_ok=True)
+                self._save_manifest()
+        finally:
+            self._compressor.close()
+
+    # ---------- compression (background thread) ----------
+    def _is_compressed(self, seg: Dict[str, Any]) -> bool:
+        return Path(seg["file"]).suffix in _OPENERS
+
+    def _compress(self, seg: Dict[str, Any]) -> None:
+        suffix, opener = COMPRESSORS[self.compress]
+        if opener is None or self._is_compressed(seg):
+            return
+        src = self.dir / seg["file"]
+        dst = src.with_name(src.name + suffix)
+        tmp = dst.with_name(dst.name + ".tmp")
+        with src.open("rb") as fi, opener(tmp, "wb") as fo:
+            shutil.copyfileobj(fi, fo, 1 << 20)
+        os.replace(tmp, dst)
+        with self._lock:
+            seg["file"] = dst.name
+        self._save_manifest()
+        # readers holding the plain file open keep reading it; new readers use the manifest
+        src.unlink(missing_ok=True)
+        index_path(src).unlink(missing_ok=True)
+
+    def _save_manifest(self) -> None:
+        with self._lock:
+            text = json.dumps({"version": 1, "compress": self.compress, "segments": self.segments}, indent=2)
+            tmp = manifest_path(self.dir).with_suffix(".tmp")
+            tmp.write_text(text, encoding="utf-8")
+            os.replace(tmp, manifest_path(self.dir))
+
+
+# ---------------- reader ----------------
+def _open_segment(directory: Path, name: str) -> Optional[Path]:
+    """Path of a segment, tolerating a compression that finished after the manifest was read."""
+    path = Path(directory) / name
+    if path.exists():
+        return path
+    plain = path.with_suffix("") if path.suffix in _OPENERS else path
+    for candidate in [plain] + [plain.with_name(plain.name + sfx) for sfx in _OPENERS]:
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def iter_segment_events(
+    directory: Path, start: Optional[int] = None, end: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """Stream events across all segments, optionally only ticks in [start, end).
+
+    Segments outside the window are skipped using the manifest's tick ranges; a plain
+    (active) segment is read through its sidecar index, compressed ones are decompressed
+    as a stream.
+    """
+    for seg in load_manifest(directory):
+        first, last = seg.get("first_tick"), seg.get("last_tick")
+        if end is not None and first is not None and first >= end:
+            return
+        if start is not None and not seg["active"] and last is not None and last < start:
+            continue
+        path = _open_segment(directory, seg["file"])
+        if path is None:
+            continue
+        opener = _OPENERS.get(path.suffix)
+        if opener is None:
+            yield from iter_events(path, start, end)
+        else:
+            with opener(path, "rb") as fh:
+                yield from events_from_lines(fh, start, end)
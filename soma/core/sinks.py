@@ -0,0 +1,134 @@
+"""Event sinks with serialize-once fan-out.
+
+`EventSinks.emit(event)` wraps the event in an `EncodedEvent` whose JSON text is produced
+at most once, on first use, and shared by every enabled sink: the JSONL log writes it as a
+line and the SQLite store inserts it as the `data` column. The binary log encodes the dict
+itself and the null sink drops it, so a run with only those sinks never builds JSON.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+import json
+
+from .binlog import BinaryEventLog
+from .events import JsonlEventLog
+from .store import DURABILITY, EventStore
+from .writer import BackgroundWriter, DeferredSink
+
+
+SINKS = ("jsonl", "sqlite", "binary", "null")
+DEFAULT_SINKS = ("jsonl", "sqlite")
+
+
+class EncodedEvent:
+    """An event plus its lazily built, cached JSON encoding."""
+
+    __slots__ = ("event", "type", "tick", "_text", "_raw")
+
+    def __init__(self, event: Dict[str, Any], *, event_type: Optional[str] = None, tick: Optional[int] = None):
+        self.event = event
+        self.type = event_type if event_type is not None else str(event.get("type", ""))
+        if tick is None:
+            t = event.get("tick")
+            tick = t if isinstance(t, int) and not isinstance(t, bool) else -1
+        self.tick = tick
+        self._text: Optional[str] = None
+        self._raw: Optional[bytes] = None
+
+    @property
+    def text(self) -> str:
+        """JSON text (what EventStore stores in `data`)."""
+        if self._text is None:
+            self._text = json.dumps(self.event, ensure_ascii=False)
+        return self._text
+
+    @property
+    def line(self) -> bytes:
+        """UTF-8 JSONL line including the newline (what JsonlEventLog appends)."""
+        if self._raw is None:
+            self._raw = self.text.encode("utf-8") + b"\n"
+        return self._raw
+
+
+class NullSink:
+    """Accepts and drops every event (benchmarks)."""
+
+    def write_encoded(self, ev: EncodedEvent) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class EventSinks:
+    """Fan-out over the sinks enabled for a run; each sink implements `write_encoded` and `close`."""
+
+    def __init__(self, sinks: Sequence[Any]):
+        self.sinks: List[Any] = list(sinks)
+
+    def emit(self, event: Dict[str, Any], *, event_type: Optional[str] = None, tick: Optional[int] = None) -> None:
+        ev = EncodedEvent(event, event_type=event_type, tick=tick)
+        for sink in self.sinks:
+            sink.write_encoded(ev)
+
+    def close(self) -> None:
+        """Close every sink, even after one fails; the first error is re-raised at the end."""
+        error: Optional[BaseException] = None
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except BaseException as e:
+                if error is None:
+                    error = e
+        if error is not None:
+            raise error
+
+
+def parse_sinks(spec: str) -> List[str]:
+    """'jsonl,sqlite' -> ['jsonl', 'sqlite']; raises ValueError on unknown names."""
+    names = [s.strip() for s in spec.split(",") if s.strip()]
+    bad = [s for s in names if s not in SINKS]
+    if bad or not names:
+        raise ValueError(f"unknown sink(s) {bad or spec!r} (expected a comma list of {SINKS})")
+    return names
+
+
+def open_sinks(
+    run_dir: Path,
+    run_id: str,
+    names: Sequence[str] = DEFAULT_SINKS,
+    *,
+    durability: str = "full",
+    writer: Optional[BackgroundWriter] = None,
+    event_log: Optional[Any] = None,
+    extra: Sequence[Any] = (),
+) -> EventSinks:
+    """Open the named sinks for a run; each is wrapped in DeferredSink when a writer is given.
+
+    `event_log` replaces the default JsonlEventLog for "jsonl" (e.g. a SegmentedEventLog);
+    `extra` sinks (e.g. a WarehouseSink) are appended after the named ones.
+    """
+    out: List[Any] = []
+    for name in names:
+        sink: Any
+        if name == "jsonl":
+            sink = event_log if event_log is not None else JsonlEventLog(run_dir / "events.jsonl")
+        elif name == "sqlite":
+            sink = EventStore(
+                db_path=run_dir / "events.sqlite",
+                run_id=run_id,
+                check_same_thread=writer is None,
+                **DURABILITY[durability],
+            )
+        elif name == "binary":
+            sink = BinaryEventLog(run_dir / "events.bin")
+        elif name == "null":
+            sink = NullSink()
+        else:
+            raise ValueError(f"unknown sink {name!r} (expected one of {SINKS})")
+        out.append(DeferredSink(sink, writer) if writer is not None else sink)
+    for sink in extra:
+        out.append(DeferredSink(sink, writer) if writer is not None else sink)
+    return EventSinks(out)
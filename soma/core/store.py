@@ -1,23 +1,144 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 import sqlite3
 import json
+import time
 from datetime import datetime, timezone
 
 
+# Named durability settings for run_loop / scripts.run (kwargs for EventStore)
+SYNCHRONOUS = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+DURABILITY: Dict[str, Dict[str, Any]] = {
+    # one fsync-backed transaction per event (historical behaviour)
+    "full": {"buffered": False},
+    # WAL + group commit; a crash loses at most the last commit window
+    "normal": {"buffered": True, "synchronous": "NORMAL", "commit_every": 256, "commit_interval": 1.0},
+    # WAL, no fsync; survives process crashes but not power loss
+    "off": {"buffered": True, "synchronous": "OFF", "commit_every": 2048, "commit_interval": 5.0},
+}
+
+
+# Typed per-tick columns extracted from each "tick" event at write time (see tick_metrics_row)
+TICK_METRICS_COLUMNS: Tuple[str, ...] = (
+    "run_id",
+    "tick",
+    "novelty",
+    "change",
+    "rarity",
+    "boredom",
+    "dominant",
+    "behavior",
+    "action",
+    "top_score",
+    "coverage",
+    "tokens",
+    "gloss_pairs",
+)
+
+TICK_METRICS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tick_metrics (
+  run_id TEXT NOT NULL,
+  tick INTEGER NOT NULL,
+  novelty REAL,
+  change REAL,
+  rarity REAL,
+  boredom REAL,
+  dominant TEXT,
+  behavior TEXT,
+  action TEXT,
+  top_score REAL,
+  coverage REAL,
+  tokens TEXT,
+  gloss_pairs INTEGER
+)
+"""
+
+_INSERT_TICK_METRICS = (
+    f"INSERT INTO tick_metrics({', '.join(TICK_METRICS_COLUMNS)}) VALUES({','.join('?' * len(TICK_METRICS_COLUMNS))})"
+)
+
+
+def _num(x: Any) -> float:
+    try:
+        return float(x)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def tick_metrics_row(run_id: str, tick: int, payload: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Row for tick_metrics (TICK_METRICS_COLUMNS order) from a tick event payload.
+
+    `tokens` is the space-joined emission ("" when silent); `top_score` is the best recall
+    score (0.0 without recall); `gloss_pairs` counts caregiver gloss pairs.
+    """
+    cur = payload.get("curiosity") or {}
+    stale = payload.get("staleness") or {}
+    mot = payload.get("motivation") or {}
+    ch = payload.get("channel") or {}
+    recall = [r for r in payload.get("recall") or [] if isinstance(r, dict)]
+    pairs = [p for p in ch.get("caregiver_gloss") or [] if isinstance(p, (list, tuple)) and len(p) == 2]
+    return (
+        run_id,
+        int(tick),
+        _num(cur.get("novelty", 0.0)),
+        _num(cur.get("change", 0.0)),
+        _num(cur.get("rarity", 0.0)),
+        _num(stale.get("boredom", 0.0)),
+        str(mot.get("dominant", "")),
+        str((payload.get("planner") or {}).get("behavior", "")),
+        str(payload.get("action_final", "")),
+        max((_num(r.get("score", 0.0)) for r in recall), default=0.0),
+        _num((payload.get("state") or {}).get("coverage", 0.0)),
+        " ".join(str(t) for t in ch.get("tokens") or []),
+        len(pairs),
+    )
+
+
 class EventStore:
     """SQLite-backed append-only event store.
 
     Table schema (created on first use):
       events(id INTEGER PK, ts TEXT, run_id TEXT, tick INTEGER, type TEXT, data TEXT)
+      tick_metrics(run_id, tick, novelty, change, ..., tokens, gloss_pairs) — one typed row
+        per "tick" event, so analyses can aggregate in SQL instead of parsing `data`
+
+    Buffered mode (`buffered=True`) switches the journal to WAL, applies `synchronous`,
+    and groups inserts into one transaction per `commit_every` events or `commit_interval`
+    seconds, whichever comes first. Pending rows are written by `flush()`, `checkpoint()`
+    and `close()`.
     """
 
-    def __init__(self, db_path: Path, run_id: str):
+    def __init__(
+        self,
+        db_path: Path,
+        run_id: str,
+        *,
+        buffered: bool = False,
+        synchronous: Optional[str] = None,
+        commit_every: int = 256,
+        commit_interval: float = 1.0,
+        check_same_thread: bool = True,
+    ):
+        if synchronous and synchronous.upper() not in SYNCHRONOUS:
+            raise ValueError(f"unknown synchronous mode {synchronous!r} (expected one of {SYNCHRONOUS})")
         self.db_path = Path(db_path)
         self.run_id = run_id
-        self.conn = sqlite3.connect(str(self.db_path))
+        self.buffered = bool(buffered)
+        self.commit_every = max(1, int(commit_every))
+        self.commit_interval = float(commit_interval)
+        # check_same_thread=False lets a BackgroundWriter own the connection after construction
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=check_same_thread)
+        if self.buffered:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        if synchronous:
+            self.conn.execute(f"PRAGMA synchronous={synchronous.upper()}")
+        self._pending: List[Tuple[str, str, int, str, str]] = []
+        self._pending_metrics: List[Tuple[Any, ...]] = []
+        self._last_commit = time.monotonic()
+        self._closed = False
         self._init_schema()
 
     def _init_schema(self) -> None:
@@ -36,19 +157,56 @@ class EventStore:
         )
         cur.execute("CREATE INDEX IF NOT EXISTS idx_events_run_tick ON events(run_id, tick)")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_events_type ON events(type)")
+        cur.execute(TICK_METRICS_SCHEMA)
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_tick_metrics_run_tick ON tick_metrics(run_id, tick)")
         self.conn.commit()
 
     def write(self, event_type: str, tick: int, payload: Dict[str, Any]) -> None:
+        self._insert(event_type, tick, payload, json.dumps(payload, ensure_ascii=False))
+
+    def write_encoded(self, ev: Any) -> None:
+        """Insert an already serialized event (soma.core.sinks.EncodedEvent); `data` is its JSON text."""
+        self._insert(ev.type, ev.tick, ev.event, ev.text)
+
+    def _insert(self, event_type: str, tick: int, payload: Dict[str, Any], data: str) -> None:
         ts = datetime.now(timezone.utc).isoformat()
-        data = json.dumps(payload, ensure_ascii=False)
-        self.conn.execute(
-            "INSERT INTO events(ts, run_id, tick, type, data) VALUES(?,?,?,?,?)",
-            (ts, self.run_id, tick, event_type, data),
-        )
+        row = (ts, self.run_id, tick, event_type, data)
+        metrics = tick_metrics_row(self.run_id, tick, payload) if event_type == "tick" else None
+        if not self.buffered:
+            self.conn.execute("INSERT INTO events(ts, run_id, tick, type, data) VALUES(?,?,?,?,?)", row)
+            if metrics is not None:
+                self.conn.execute(_INSERT_TICK_METRICS, metrics)
+            self.conn.commit()
+            return
+        self._pending.append(row)
+        if metrics is not None:
+            self._pending_metrics.append(metrics)
+        if len(self._pending) >= self.commit_every or time.monotonic() - self._last_commit >= self.commit_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Insert pending rows in a single transaction."""
+        if self._pending:
+            self.conn.executemany("INSERT INTO events(ts, run_id, tick, type, data) VALUES(?,?,?,?,?)", self._pending)
+            self._pending.clear()
+        if self._pending_metrics:
+            self.conn.executemany(_INSERT_TICK_METRICS, self._pending_metrics)
+            self._pending_metrics.clear()
         self.conn.commit()
+        self._last_commit = time.monotonic()
+
+    def checkpoint(self) -> None:
+        """Flush, then fold the WAL back into the main database file."""
+        self.flush()
+        if self.buffered:
+            self.conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
 
     def close(self) -> None:
+        """Flush buffered rows (errors propagate: losing them silently is worse) and close."""
+        if self._closed:
+            return
+        self._closed = True
         try:
+            self.checkpoint()
+        finally:
             self.conn.close()
-        except Exception:
-            pass
\ No newline at end of file
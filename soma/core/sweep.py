@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import csv
+import hashlib
+import itertools
+import json
+import shutil
+
+from .tick import cog_params
+
+
+# Marker written into a cell's run dir once the run and its metrics are complete
+DONE_FILE = "cell.json"
+
+# run_loop options naming output locations; they do not change what a cell computes
+_PATH_OPTIONS = ("warehouse", "catalog")
+
+
+def parse_seeds(spec: str) -> List[int]:
+    """'0-3,10' -> [0, 1, 2, 3, 10]."""
+    out: List[int] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        lo, sep, hi = part.partition("-")
+        if sep and lo:
+            out.extend(range(int(lo), int(hi) + 1))
+        else:
+            out.append(int(part))
+    return out
+
+
+def parse_param(spec: str) -> Tuple[str, str, List[Any]]:
+    """'curiosity.novelty_threshold=0.5,0.7' -> ('curiosity', 'novelty_threshold', [0.5, 0.7])."""
+    name, sep, values = spec.partition("=")
+    cog, dot, key = name.strip().partition(".")
+    if not sep or not dot or not values.strip():
+        raise ValueError(f"bad --param {spec!r}; expected cog.key=v1,v2,...")
+    parsed: List[Any] = []
+    for v in values.split(","):
+        try:
+            parsed.append(json.loads(v))
+        except ValueError:
+            parsed.append(v.strip())
+    return cog, key, parsed
+
+
+def expand_grid(
+    *,
+    seeds: Sequence[int],
+    envs: Sequence[str],
+    sizes: Sequence[int],
+    n_objects: Sequence[int],
+    view_radii: Sequence[int],
+    params: Sequence[Tuple[str, str, List[Any]]] = (),
+) -> List[Dict[str, Any]]:
+    """Cartesian product of the sweep axes, in a stable order (seed varies fastest)."""
+    param_axes = [[(cog, key, v) for v in values] for cog, key, values in params]
+    cells: List[Dict[str, Any]] = []
+    for env, size, n_obj, radius, *combo in itertools.product(envs, sizes, n_objects, view_radii, *param_axes):
+        cogs: Dict[str, Dict[str, Any]] = {}
+        for cog, key, v in combo:
+            cogs.setdefault(cog, {})[key] = v
+        cog_params(cogs)  # validate names/types before anything runs
+        for seed in seeds:
+            cells.append(
+                {"env": env, "size": int(size), "n_objects": int(n_obj), "view_radius": int(radius), "seed": int(seed), "cogs": cogs}
+            )
+    return cells
+
+
+def cell_options(run_kwargs: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """The run_loop options that affect a cell's results (output locations left out)."""
+    return {k: v for k, v in (run_kwargs or {}).items() if k not in _PATH_OPTIONS}
+
+
+def cell_id(cell: Dict[str, Any], ticks: int, options: Optional[Dict[str, Any]] = None) -> str:
+    """Deterministic, filesystem-safe id: readable prefix + hash of the full cell config.
+
+    `options` (see `cell_options`) are part of the hash, so resuming a sweep with e.g. another
+    memory backend or dim runs fresh cells instead of reusing results computed without them.
+    """
+    config: Dict[str, Any] = {"ticks": int(ticks), **cell}
+    if options:
+        config["options"] = options
+    key = json.dumps(config, sort_keys=True, default=str)
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:10]
+    return f"{cell['env']}_n{cell['size']}_o{cell['n_objects']}_r{cell['view_radius']}_s{cell['seed']}_{digest}"
+
+
+def _flat_params(cogs: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    return {f"{cog}.{key}": v for cog, params in sorted(cogs.items()) for key, v in sorted(params.items())}
+
+
+def summarize(cid: str, cell: Dict[str, Any], metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """One aggregated-table row from compute_metrics output."""
+    return {
+        "cell": cid,
+        "env": cell["env"],
+        "size": cell["size"],
+        "n_objects": cell["n_objects"],
+        "view_radius": cell["view_radius"],
+        "seed": cell["seed"],
+        **_flat_params(cell.get("cogs", {})),
+        "ticks": metrics["counts"]["ticks"],
+        "novelty_mean": round(metrics["novelty"]["mean"], 6),
+        "novelty_p95": round(metrics["novelty"]["p95"], 6),
+        "high_novelty_rate": round(metrics["novelty"]["high_rate"], 6),
+        "helpful_ratio": round(metrics["memory"]["helpful_ratio"], 6),
+        "symbol_kinds": metrics["symbols"]["kinds"],
+        "simpson": round(metrics["symbols"]["simpson"], 6),
+        "continuity": round(metrics["symbols"]["continuity"], 6),
+        "coverage": round(metrics["coverage"]["final"], 6),
+    }
+
+
+def _warm() -> None:
+    """Process-pool initializer: import the heavy modules once per worker, not once per cell."""
+    import soma.core.tick  # noqa: F401
+    import soma.eval.metrics  # noqa: F401
+    import soma.sandbox  # noqa: F401
+
+
+def run_cell(sweep_dir: str, ticks: int, cell: Dict[str, Any], run_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one grid cell into `sweep_dir/<cell_id>` and return its summary row.
+
+    The run id is "<sweep name>/<cell_id>": unique across sweeps of the same grid (catalog,
+    warehouse), while the directory name stays `cell_id` so a re-run finds it.
+    """
+    from soma.core.tick import run_loop
+    from soma.eval.metrics import compute_metrics
+
+    cid = cell_id(cell, ticks, cell_options(run_kwargs))
+    run_dir = Path(sweep_dir) / cid
+    if run_dir.exists():
+        shutil.rmtree(run_dir)  # unfinished leftovers from an interrupted sweep
+    run_dir.mkdir(parents=True)
+    run_loop(
+        ticks=ticks,
+        seed=cell["seed"],
+        run_dir=run_dir,
+        run_id=f"{Path(sweep_dir).name}/{cid}",
+        env_name=cell["env"],
+        size=cell["size"],
+        n_objects=cell["n_objects"],
+        view_radius=cell["view_radius"],
+        cogs=cell["cogs"],
+        quiet=True,
+        **run_kwargs,
+    )
+    row = summarize(cid, cell, compute_metrics(run_dir, series=False))
+    tmp = run_dir / (DONE_FILE + ".tmp")
+    tmp.write_text(json.dumps({"cell": cell, "ticks": ticks, "row": row}, indent=2), encoding="utf-8")
+    tmp.replace(run_dir / DONE_FILE)
+    return row
+
+
+def load_done(run_dir: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads((Path(run_dir) / DONE_FILE).read_text(encoding="utf-8"))["row"]
+    except Exception:
+        return None
+
+
+def run_sweep(
+    sweep_dir: Path,
+    cells: Sequence[Dict[str, Any]],
+    *,
+    ticks: int,
+    workers: int = 1,
+    run_kwargs: Optional[Dict[str, Any]] = None,
+    on_result: Optional[Callable[[str, Optional[Dict[str, Any]], Optional[BaseException]], None]] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """Run every unfinished cell and return (rows in grid order, {cell_id: error}).
+
+    Cells whose run dir already holds DONE_FILE are skipped, so re-running a sweep resumes
+    it. `workers > 1` fans cells out over a process pool whose workers are warmed once.
+    """
+    sweep_dir = Path(sweep_dir)
+    sweep_dir.mkdir(parents=True, exist_ok=True)
+    run_kwargs = dict(run_kwargs or {})
+    options = cell_options(run_kwargs)
+    ids = [cell_id(c, ticks, options) for c in cells]
+    if len(set(ids)) != len(ids):
+        raise ValueError("sweep grid contains duplicate cells")
+    rows: Dict[str, Dict[str, Any]] = {}
+    errors: Dict[str, str] = {}
+    todo: List[Tuple[str, Dict[str, Any]]] = []
+    for cid, cell in zip(ids, cells):
+        row = load_done(sweep_dir / cid)
+        if row is None:
+            todo.append((cid, cell))
+        else:
+            rows[cid] = row
+            if on_result:
+                on_result(cid, row, None)
+
+    def _record(cid: str, fn: Callable[[], Dict[str, Any]]) -> None:
+        try:
+            rows[cid] = fn()
+            if on_result:
+                on_result(cid, rows[cid], None)
+        except Exception as e:  # one failing cell must not sink the sweep
+            errors[cid] = repr(e)
+            if on_result:
+                on_result(cid, None, e)
+
+    if workers <= 1:
+        for cid, cell in todo:
+            _record(cid, lambda cell=cell: run_cell(str(sweep_dir), ticks, cell, run_kwargs))
+    elif todo:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_warm) as pool:
+            futures = {pool.submit(run_cell, str(sweep_dir), ticks, cell, run_kwargs): cid for cid, cell in todo}
+            for fut in as_completed(futures):
+                _record(futures[fut], fut.result)
+    return [rows[cid] for cid in ids if cid in rows], errors
+
+
+def _columns(rows: Iterable[Dict[str, Any]]) -> List[str]:
+    cols: List[str] = []
+    for r in rows:
+        for k in r:
+            if k not in cols:
+                cols.append(k)
+    return cols
+
+
+def write_table(rows: List[Dict[str, Any]], out_dir: Path) -> Tuple[Path, Path]:
+    """Write the aggregated table as sweep.csv and sweep.md."""
+    out_dir = Path(out_dir)
+    cols = _columns(rows)
+    csv_path = out_dir / "sweep.csv"
+    with csv_path.open("w", encoding="utf-8", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=cols, restval="")
+        w.writeheader()
+        w.writerows(rows)
+    lines = ["# SOMA sweep", "", f"Cells: {len(rows)}", ""]
+    lines.append("| " + " | ".join(cols) + " |")
+    lines.append("|" + "---|" * len(cols))
+    for r in rows:
+        lines.append("| " + " | ".join(str(r.get(c, "")) for c in cols) + " |")
+    md_path = out_dir / "sweep.md"
+    md_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return csv_path, md_path
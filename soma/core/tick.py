@@ -1,19 +1,21 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
-from typing import Dict, Any, List, Tuple
+from typing import Callable, Dict, Any, List, Optional, Sequence, Tuple
 import json
 
 from rich.console import Console
 from rich.table import Table
 
-from soma.cogs.self_notes.notes import SelfNotes
+from soma.cogs.self_notes.notes import SelfNotes, check_note_levels
 from soma.cogs.reflex.reflex import ReflexManager
 from soma.cogs.memory.memory import MemorySystem
 from soma.cogs.curiosity.curiosity import CuriosityEngine
 from soma.cogs.motivation.motivation import MotivationManager
 from soma.cogs.planner.planner import BehaviorPlanner
+from soma.cogs.perception.cache import CACHE_FILE, ViewCache
 from soma.cogs.perception.features import extract_features
 from soma.cogs.perception.embedder import PerceptionEmbedderV2
 from soma.cogs.working_memory.staleness import StalenessMonitor
@@ -21,202 +23,516 @@ from soma.cogs.state_tracker.tracker import StateTracker
 from soma.cogs.caregiver.interface import CaregiverInterface
 from soma.cogs.channel.symbolic import SymbolicChannel
 from soma.sandbox import make_env
+from soma.sandbox.codes import loggable
 from .state import StateSnapshot
-from .events import JsonlEventLog
-from .store import EventStore
+from .catalog import register, set_status
+from .segments import SegmentedEventLog
+from .sinks import EventSinks, open_sinks
+from .timing import PhaseTimer
+from .warehouse import WarehouseSink
+from .writer import BackgroundWriter, DeferredSink
 
 
 console = Console()
 
 
-def run_loop(
+# Tunable cog thresholds (constructor kwargs); override per run with `cogs={"curiosity": {...}}`
+COG_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "reflex": {"overload_unique_threshold": 5, "max_noop_on_overload": 3, "relax_boredom": 0.7},
+    "curiosity": {"novelty_threshold": 0.6, "change_threshold": 0.5, "top_k": 3},
+    "staleness": {"alpha": 0.2, "novelty_low": 0.15, "max_noop": 5, "max_repeat": 5},
+    "channel": {
+        "novelty_hi": 0.80,
+        "novelty_up": 0.20,
+        "boredom_hi": 0.65,
+        "recall_hi": 0.65,
+        "loop_noop": 5,
+        "cooldown_ticks": 3,
+    },
+}
+
+
+def cog_params(overrides: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Dict[str, Any]]:
+    """COG_DEFAULTS with `overrides` applied; values are coerced to the default's type."""
+    out = {cog: dict(params) for cog, params in COG_DEFAULTS.items()}
+    for cog, params in (overrides or {}).items():
+        if cog not in out:
+            raise ValueError(f"unknown cog {cog!r} (expected one of {sorted(out)})")
+        for key, value in params.items():
+            if key not in out[cog]:
+                raise ValueError(f"unknown parameter {cog}.{key} (expected one of {sorted(out[cog])})")
+            out[cog][key] = type(COG_DEFAULTS[cog][key])(value)
+    return out
+
+
+def _run_meta(
+    *,
+    run_id: str,
     ticks: int,
     seed: int,
-    run_dir: Path,
-    run_id: str,
-    env_name: str = "grid-v0",
-    size: int = 9,
-    n_objects: int = 12,
-    view_radius: int = 1,
-) -> None:
-    """Run SOMA with Perception V2 + Staleness/Boredom + Planner + State + Channel (M9)."""
-    meta = {
+    env_name: str,
+    size: int,
+    n_objects: int,
+    view_radius: int,
+    memory_backend: str,
+    durability: str,
+    async_io: bool,
+    cogs: Dict[str, Dict[str, Any]],
+    dim: int = 64,
+    event_format: str = "jsonl",
+    segments: Optional[Dict[str, Any]] = None,
+    sinks: Optional[Sequence[str]] = None,
+) -> Dict[str, Any]:
+    return {
         "phase": "M9-channel",
         "created_at": datetime.now(timezone.utc).isoformat(),
         "ticks": ticks,
         "seed": seed,
         "run_id": run_id,
         "env": {"name": env_name, "size": size, "n_objects": n_objects, "view_radius": view_radius},
-        "perception": {"embedder": "v2", "dim": 64},
-        "memory": {"dim": 64, "max_items": 512},
+        "perception": {"embedder": "v2", "dim": dim},
+        "memory": {"dim": dim, "max_items": 512, "backend": memory_backend},
+        "store": {"durability": durability, "async_io": async_io, "event_format": event_format, "segments": segments,
+                  "sinks": _sink_names(event_format, sinks)},
+        "cogs": cogs,
         "channel": {"version": "v0", "vocab": list(SymbolicChannel.encode.__annotations__) if False else None},
     }
+
+
+EVENT_FORMATS = ("jsonl", "binary")
+
+
+def _sink_names(event_format: str, sinks: Optional[Sequence[str]]) -> List[str]:
+    if event_format not in EVENT_FORMATS:
+        raise ValueError(f"unknown event format {event_format!r} (expected one of {EVENT_FORMATS})")
+    return list(sinks) if sinks else [event_format, "sqlite"]
+
+
+def _run_cleanup(steps: Sequence[Callable[[], Any]]) -> Optional[BaseException]:
+    """Run every step even if earlier ones raise; returns the first error (None if all succeeded)."""
+    error: Optional[BaseException] = None
+    for step in steps:
+        try:
+            step()
+        except BaseException as e:
+            if error is None:
+                error = e
+    return error
+
+
+def _open_sinks(
+    run_dir: Path,
+    run_id: str,
+    *,
+    durability: str,
+    writer: Optional[BackgroundWriter],
+    event_format: str = "jsonl",
+    segments: Optional[Dict[str, Any]] = None,
+    sinks: Optional[Sequence[str]] = None,
+    extra: Sequence[Any] = (),
+) -> EventSinks:
+    """Open the run's event sinks (default: the `event_format` log + SQLite); deferred when a writer is given.
+
+    `segments` ({"max_mb", "max_ticks", "compress"}) makes the jsonl sink a rotating events/ directory.
+    """
+    names = _sink_names(event_format, sinks)
+    event_log = None
+    if segments:
+        if "jsonl" not in names:
+            raise ValueError("segment rotation needs the jsonl sink")
+        event_log = SegmentedEventLog(
+            run_dir / "events",
+            max_bytes=int(segments["max_mb"] * (1 << 20)),
+            max_ticks=segments["max_ticks"],
+            compress=segments["compress"],
+        )
+    return open_sinks(run_dir, run_id, names, durability=durability, writer=writer, event_log=event_log, extra=extra)
+
+
+def _tick_event(
+    *,
+    state: StateSnapshot,
+    behavior: str,
+    selected: str,
+    final_action: str,
+    triggers: List[str],
+    cur: Dict[str, Any],
+    matches: List[Tuple[int, float]],
+    drives: Dict[str, float],
+    dominant: str,
+    st: Dict[str, Any],
+    feats: Dict[str, Any],
+    snapshot: Dict[str, Any],
+    tokens: List[str],
+    gloss: List[str],
+    ext_pairs: List[Tuple[str, str]],
+    obs_next: Dict[str, Any],
+) -> Dict[str, Any]:
+    return {
+        "type": "tick",
+        "tick": state.tick,
+        "rng_seed": state.rng_seed,
+        "planner": {"behavior": behavior, "action_proposed": selected},
+        "action_final": final_action,
+        "reflex": triggers,
+        "curiosity": {k: (round(v, 6) if isinstance(v, float) else v) for k, v in cur.items()},
+        "recall": [{"tick": t, "score": round(s, 6)} for t, s in matches],
+        "motivation": {"drives": {k: round(v, 3) for k, v in drives.items()}, "dominant": dominant},
+        "staleness": {k: (round(v, 3) if isinstance(v, float) else v) for k, v in st.items()},
+        "perception": {"features": feats},
+        "state": snapshot,
+        "channel": {"tokens": tokens, "gloss": gloss, "caregiver_gloss": ext_pairs},
+        "view_after": {"unique": obs_next["summary"]["unique"], "pos": obs_next["agent"]},
+    }
+
+
+def compact_tick_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Summary record for an uninteresting tick.
+
+    Keeps the fields eval and tick_metrics read, at the same key paths as the full event,
+    and drops perception features, the state snapshot, drives, attention and recall detail.
+    """
+    cur = event["curiosity"]
+    recall = event["recall"]
+    return {
+        "type": "tick",
+        "tick": event["tick"],
+        "level": "compact",
+        "planner": {"behavior": event["planner"]["behavior"]},
+        "action_final": event["action_final"],
+        "curiosity": {k: cur[k] for k in ("novelty", "change", "rarity") if k in cur},
+        "recall": [max(recall, key=lambda r: r["score"])] if recall else [],
+        "motivation": {"dominant": event["motivation"]["dominant"]},
+        "staleness": {"boredom": event["staleness"].get("boredom", 0.0)},
+        "state": {"coverage": event["state"].get("coverage", 0.0)},
+        "channel": {"tokens": event["channel"]["tokens"], "caregiver_gloss": event["channel"]["caregiver_gloss"]},
+    }
+
+
+def run_loop(
+    ticks: int,
+    seed: int,
+    run_dir: Path,
+    run_id: str,
+    env_name: str = "grid-v0",
+    size: int = 9,
+    n_objects: int = 12,
+    view_radius: int = 1,
+    memory_backend: str = "list",
+    dim: int = 64,
+    view_cache: int = 1024,
+    obs_mode: str = "tokens",
+    chunk: int = 0,
+    durability: str = "full",
+    async_io: bool = False,
+    queue_size: int = 1024,
+    cogs: Optional[Dict[str, Dict[str, Any]]] = None,
+    quiet: bool = False,
+    profile: bool = False,
+    event_format: str = "jsonl",
+    segment_mb: float = 0.0,
+    segment_ticks: int = 0,
+    compress: str = "gzip",
+    sinks: Optional[Sequence[str]] = None,
+    full_every: int = 1,
+    note_levels: Optional[Dict[str, str]] = None,
+    warehouse: Optional[Path] = None,
+    catalog: Optional[Path] = None,
+) -> None:
+    """Run SOMA with Perception V2 + Staleness/Boredom + Planner + State + Channel (M9).
+
+    `cogs` overrides entries of COG_DEFAULTS; `quiet` skips the console table (sweeps);
+    `profile` times every tick phase and writes profile.json (see soma.core.timing);
+    `event_format="binary"` writes events.bin (soma.core.binlog) instead of events.jsonl;
+    `dim` sizes the perception vectors and memory; with `memory_backend="sparse"` they are
+    SparseVectors end to end, so a large `dim` (fewer token hash collisions) costs no more;
+    `view_cache` bounds an LRU of per-view features/embedding/recall (0 = off; see
+    soma.cogs.perception.cache), whose hit rates go to view_cache.json;
+    `obs_mode="array"` has the env return integer-code views (soma.sandbox.codes);
+    `chunk=C` generates grid-v0 lazily in C x C chunks (large `size`; see GridWorldV0);
+    `segment_mb`/`segment_ticks` rotate the log into compressed segments (soma.core.segments);
+    `sinks` picks the event sinks from soma.core.sinks.SINKS (each event is serialized once).
+
+    Logging tiers: with `full_every=N` only every Nth tick and interesting ticks (reflex
+    trigger, symbol emission, caregiver gloss, drive change, novelty at or above the
+    curiosity threshold) log the full tick event; other ticks log `compact_tick_event`.
+    `note_levels` sets SelfNotes verbosity per note kind (see soma.cogs.self_notes.notes).
+    `warehouse` also writes the run live into a cross-run database (soma.core.warehouse);
+    `catalog` is the runs directory whose catalog (soma.core.catalog) tracks this run.
+    """
+    params = cog_params(cogs)
+    note_levels = check_note_levels(note_levels)
+    segments = (
+        {"max_mb": segment_mb, "max_ticks": segment_ticks, "compress": compress}
+        if segment_mb > 0 or segment_ticks > 0
+        else None
+    )
+    meta = _run_meta(
+        run_id=run_id,
+        ticks=ticks,
+        seed=seed,
+        env_name=env_name,
+        size=size,
+        n_objects=n_objects,
+        view_radius=view_radius,
+        memory_backend=memory_backend,
+        durability=durability,
+        async_io=async_io,
+        cogs=params,
+        dim=dim,
+        event_format=event_format,
+        segments=segments,
+        sinks=sinks,
+    )
+    meta["logging"] = {"full_every": max(1, int(full_every)), "note_levels": note_levels}
+    meta["perception"]["view_cache"] = max(0, int(view_cache))
+    meta["env"]["obs_mode"] = obs_mode
+    meta["env"]["chunk"] = max(0, int(chunk))
     (run_dir / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    if catalog is not None:
+        register(catalog, run_dir, meta)
 
-    event_log = JsonlEventLog(run_dir / "events.jsonl")
-    store = EventStore(db_path=run_dir / "events.sqlite", run_id=run_id)
-    notes = SelfNotes(event_log=event_log, store=store)
-    reflex = ReflexManager(notes=notes, overload_unique_threshold=5)
-    memory = MemorySystem(dim=64, max_items=512)
-    curiosity = CuriosityEngine(notes=notes, novelty_threshold=0.6, change_threshold=0.5, top_k=3)
+    timer = PhaseTimer(enabled=profile)
+    writer = BackgroundWriter(maxsize=queue_size) if async_io else None
+    extra = [WarehouseSink(warehouse, run_id, meta, run_dir)] if warehouse is not None else []
+    events = _open_sinks(
+        run_dir,
+        run_id,
+        durability=durability,
+        writer=writer,
+        event_format=event_format,
+        segments=segments,
+        sinks=sinks,
+        extra=extra,
+    )
+    notes = SelfNotes(events, levels=note_levels)
+    reflex = ReflexManager(notes=notes, **params["reflex"])
+    memory = MemorySystem(dim=dim, max_items=512, backend=memory_backend)
+    curiosity = CuriosityEngine(notes=notes, **params["curiosity"])
     motivation = MotivationManager(notes=notes)
     planner = BehaviorPlanner()
-    embedder = PerceptionEmbedderV2(dim=64)
-    stale = StalenessMonitor(size=size, alpha=0.2, novelty_low=0.15, max_noop=5, max_repeat=5)
-    tracker = StateTracker(run_dir=run_dir, keep=128)
-    channel = SymbolicChannel(notes=notes)
-    caregiver = CaregiverInterface(run_dir=run_dir, notes=notes, run_id=run_id)
+    embedder = PerceptionEmbedderV2(dim=dim)
+    embed = embedder.embed_sparse if memory_backend == "sparse" else embedder.embed
+    views = ViewCache(grid_size=size, capacity=view_cache) if view_cache > 0 else None
+    stale = StalenessMonitor(size=size, **params["staleness"])
+    tracker = StateTracker(run_dir=run_dir, keep=128, writer=writer)
+    channel = SymbolicChannel(notes=notes, **params["channel"])
+    caregiver = CaregiverInterface(run_dir=run_dir, notes=notes, run_id=run_id, writer=writer)
 
-    env = make_env(env_name, size=size, n_objects=n_objects, view_radius=view_radius)
+    env = make_env(env_name, size=size, n_objects=n_objects, view_radius=view_radius, obs_mode=obs_mode, chunk=chunk)
 
     # Initial reset observation
     state = StateSnapshot(tick=0, rng_seed=seed, info={})
     obs = env.reset(seed)
-    event_log.write({"type": "obs", "tick": state.tick, "obs": obs})
-    store.write(event_type="obs", tick=state.tick, payload=obs)
+    events.emit({"type": "obs", "tick": state.tick, "obs": loggable(obs)})
     notes.note(kind="startup", payload={"message": "system alive", "env": env_name}, tick=state.tick)
 
-    table = Table(title="SOMA M9 — Grid + PerceptionV2 + Staleness + State + Channel")
-    table.add_column("Tick")
-    table.add_column("Drive")
-    table.add_column("Behavior")
-    table.add_column("Act")
-    table.add_column("Bored")
-    table.add_column("Novelty")
-    table.add_column("Sym")
-    table.add_column("Pos")
-
-    for _ in range(ticks):
-        # --- Perception V2: features + embedding ---
-        feats = extract_features(obs, grid_size=size)
-        vec = embedder.embed(feats)
-        matches: List[Tuple[int, float]] = memory.query(vec, top_k=3, min_score=0.5)
-
-        # Curiosity on current view using matches
-        cur = curiosity.assess(tick=state.tick, summary=obs["summary"], matches=matches, memory=memory)
-
-        # Store vectorized perception for future recall
-        memory.add_vector(tick=state.tick, vector=vec, meta={"features": feats, "attention": cur.get("attention", [])})
-
-        # --- Staleness / boredom (pre-action) ---
-        pos_now = (obs["agent"]["x"], obs["agent"]["y"])
-        st = stale.pre(summary=obs["summary"], novelty=float(cur["novelty"]), pos=pos_now)
-        boredom = float(st["boredom"])  # 0..1
-
-        # --- Motivation update ---
-        drives = motivation.update(tick=state.tick, curiosity=cur, matches=matches, reflex_triggers=[], boredom=boredom)
-        dominant = max(drives.items(), key=lambda kv: kv[1])[0]
-
-        # --- Planner proposes behavior + action (bias by least-visited) ---
-        least_dirs = stale.least_visited_dirs(pos_now)
-        behavior, selected = planner.propose(
-            tick=state.tick,
-            rng_seed=state.rng_seed,
-            dominant=dominant,
-            curiosity=cur,
-            matches=matches,
-            pos=pos_now,
-            least_visited=least_dirs,
-            boredom=boredom,
-        )
+    # one row per tick: only built when it will be printed (quiet sweeps stay constant-memory)
+    table: Optional[Table] = None
+    if not quiet:
+        table = Table(title="SOMA M9 — Grid + PerceptionV2 + Staleness + State + Channel")
+        table.add_column("Tick")
+        table.add_column("Drive")
+        table.add_column("Behavior")
+        table.add_column("Act")
+        table.add_column("Bored")
+        table.add_column("Novelty")
+        table.add_column("Sym")
+        table.add_column("Pos")
 
-        # --- Reflex may override BEFORE stepping ---
-        unique_before: List[str] = obs["summary"]["unique"]
-        final_action, triggers = reflex.advise(tick=state.tick, selected=selected, unique_tokens=unique_before)
-        if triggers:
-            drives = motivation.update(tick=state.tick, curiosity=cur, matches=matches, reflex_triggers=triggers, boredom=boredom)
-            dominant = max(drives.items(), key=lambda kv: kv[1])[0]
-
-        # --- Channel emission (pre-step, based on current view & decisions) ---
-        tokens, gloss, ext_pairs = channel.maybe_emit(
-            tick=state.tick,
-            novelty=float(cur["novelty"]),
-            boredom=boredom,
-            matches=matches,
-            summary=obs["summary"],
-            drives=drives,
-            dominant=dominant,
-            noop_streak=int(st["noop_streak"]),
-            reflex_triggers=triggers,
-        )
+    novelty_high = params["curiosity"]["novelty_threshold"]
+    prev_dominant = ""
+    ph = timer.phase
+    completed = False
+    try:
+        for _ in range(ticks):
+            with ph(PhaseTimer.TICK):
+                # --- Perception V2: features + embedding ---
+                with ph("features"):
+                    view = None
+                    if views is not None:
+                        view_key = views.key(obs)
+                        view = views.get(view_key)
+                    feats = view.features if view is not None else extract_features(obs, grid_size=size)
+                with ph("embed"):
+                    if view is not None:
+                        vec = view.vector
+                    else:
+                        vec = embed(feats)
+                        if views is not None:
+                            view = views.put(view_key, feats, vec)
+                with ph("recall"):
+                    if view is not None:
+                        matches: List[Tuple[int, float]] = views.recall(view, memory, top_k=3, min_score=0.5)
+                    else:
+                        matches = memory.query(vec, top_k=3, min_score=0.5)
 
-        # If interesting symbols, write a caregiver query
-        caregiver.maybe_query(
-            tick=state.tick,
-            tokens=tokens,
-            context={
-                "dominant": dominant,
-                "novelty": float(cur["novelty"]),
-                "boredom": boredom,
-                "unique": obs["summary"].get("unique", []),
-            },
-        )
+                # Curiosity on current view using matches
+                with ph("curiosity"):
+                    cur = curiosity.assess(tick=state.tick, summary=obs["summary"], matches=matches, memory=memory)
 
-        # Ingest caregiver answers (if any) and update channel tags
-        new_tags = caregiver.poll_answers()
-        if new_tags:
-            channel.set_tags(caregiver.tags)
-
-        # Step
-        obs_next, info = env.step(final_action)
-        pos_next = (obs_next["agent"]["x"], obs_next["agent"]["y"])
-
-        # Post-action staleness updates (noop streak, visited)
-        stale.post(action_final=final_action, pos_next=pos_next)
-
-        # Coverage after moving
-        coverage = len(stale.visited) / float(size * size)
-
-        # --- State snapshot update ---
-        snapshot = tracker.update(
-            tick=state.tick,
-            drive=dominant,
-            behavior=behavior,
-            action=final_action,
-            novelty=float(cur["novelty"]),
-            boredom=boredom,
-            coverage=coverage,
-            matches=matches,
-            attention=list(cur.get("attention", [])),
-            reflex=triggers,
-        )
+                # Store vectorized perception for future recall
+                with ph("memory_add"):
+                    memory.add_vector(tick=state.tick, vector=vec, meta={"features": feats, "attention": cur.get("attention", [])})
 
-        event: Dict[str, Any] = {
-            "type": "tick",
-            "tick": state.tick,
-            "rng_seed": state.rng_seed,
-            "planner": {"behavior": behavior, "action_proposed": selected},
-            "action_final": final_action,
-            "reflex": triggers,
-            "curiosity": {k: (round(v, 6) if isinstance(v, float) else v) for k, v in cur.items()},
-            "recall": [{"tick": t, "score": round(s, 6)} for t, s in matches],
-            "motivation": {"drives": {k: round(v, 3) for k, v in drives.items()}, "dominant": dominant},
-            "staleness": {k: (round(v, 3) if isinstance(v, float) else v) for k, v in st.items()},
-            "perception": {"features": feats},
-            "state": snapshot,
-            "channel": {"tokens": tokens, "gloss": gloss, "caregiver_gloss": ext_pairs},
-            "view_after": {"unique": obs_next["summary"]["unique"], "pos": obs_next["agent"]},
-        }
-        event_log.write(event)
-        store.write(event_type="tick", tick=state.tick, payload=event)
-
-        table.add_row(
-            str(state.tick),
-            {"curiosity": "Cur", "stability": "Stab", "pattern_completion": "Pat", "truth_seeking": "Truth", "caregiver_alignment": "Care", "overload_regulation": "Over"}.get(dominant, dominant),
-            behavior,
-            final_action,
-            f"{boredom:.2f}",
-            f"{float(cur['novelty']):.2f}",
-            (" ".join(tokens) if tokens else "-"),
-            f"({obs_next['agent']['x']},{obs_next['agent']['y']})",
-        )
+                # --- Staleness / boredom (pre-action) ---
+                with ph("staleness"):
+                    pos_now = (obs["agent"]["x"], obs["agent"]["y"])
+                    st = stale.pre(summary=obs["summary"], novelty=float(cur["novelty"]), pos=pos_now)
+                    boredom = float(st["boredom"])  # 0..1
+
+                # --- Motivation update ---
+                with ph("motivation"):
+                    drives = motivation.update(tick=state.tick, curiosity=cur, matches=matches, reflex_triggers=[], boredom=boredom)
+                    dominant = max(drives.items(), key=lambda kv: kv[1])[0]
+
+                # --- Planner proposes behavior + action (bias by least-visited) ---
+                with ph("planner"):
+                    least_dirs = stale.least_visited_dirs(pos_now)
+                    behavior, selected = planner.propose(
+                        tick=state.tick,
+                        rng_seed=state.rng_seed,
+                        dominant=dominant,
+                        curiosity=cur,
+                        matches=matches,
+                        pos=pos_now,
+                        least_visited=least_dirs,
+                        boredom=boredom,
+                    )
+
+                # --- Reflex may override BEFORE stepping ---
+                with ph("reflex"):
+                    unique_before: List[str] = obs["summary"]["unique"]
+                    final_action, triggers = reflex.advise(tick=state.tick, selected=selected, unique_tokens=unique_before)
+                    if triggers:
+                        drives = motivation.update(tick=state.tick, curiosity=cur, matches=matches, reflex_triggers=triggers, boredom=boredom)
+                        dominant = max(drives.items(), key=lambda kv: kv[1])[0]
+
+                # --- Channel emission (pre-step, based on current view & decisions) ---
+                with ph("channel"):
+                    tokens, gloss, ext_pairs = channel.maybe_emit(
+                        tick=state.tick,
+                        novelty=float(cur["novelty"]),
+                        boredom=boredom,
+                        matches=matches,
+                        summary=obs["summary"],
+                        drives=drives,
+                        dominant=dominant,
+                        noop_streak=int(st["noop_streak"]),
+                        reflex_triggers=triggers,
+                    )
+
+                with ph("caregiver"):
+                    # If interesting symbols, write a caregiver query
+                    caregiver.maybe_query(
+                        tick=state.tick,
+                        tokens=tokens,
+                        context={
+                            "dominant": dominant,
+                            "novelty": float(cur["novelty"]),
+                            "boredom": boredom,
+                            "unique": obs["summary"].get("unique", []),
+                        },
+                    )
+
+                    # Ingest caregiver answers (if any) and update channel tags
+                    new_tags = caregiver.poll_answers()
+                    if new_tags:
+                        channel.set_tags(caregiver.tags)
+
+                # Step
+                with ph("env_step"):
+                    obs_next, info = env.step(final_action)
+                    pos_next = (obs_next["agent"]["x"], obs_next["agent"]["y"])
+
+                # Post-action staleness updates (noop streak, visited)
+                with ph("staleness_post"):
+                    stale.post(action_final=final_action, pos_next=pos_next)
+
+                    # Coverage after moving
+                    coverage = len(stale.visited) / float(size * size)
+
+                # --- State snapshot update ---
+                with ph("tracker"):
+                    snapshot = tracker.update(
+                        tick=state.tick,
+                        drive=dominant,
+                        behavior=behavior,
+                        action=final_action,
+                        novelty=float(cur["novelty"]),
+                        boredom=boredom,
+                        coverage=coverage,
+                        matches=matches,
+                        attention=list(cur.get("attention", [])),
+                        reflex=triggers,
+                    )
+
+                with ph("log"):
+                    event = _tick_event(
+                        state=state,
+                        behavior=behavior,
+                        selected=selected,
+                        final_action=final_action,
+                        triggers=triggers,
+                        cur=cur,
+                        matches=matches,
+                        drives=drives,
+                        dominant=dominant,
+                        st=st,
+                        feats=feats,
+                        snapshot=snapshot,
+                        tokens=tokens,
+                        gloss=gloss,
+                        ext_pairs=ext_pairs,
+                        obs_next=obs_next,
+                    )
+                    if not (
+                        full_every <= 1
+                        or state.tick % full_every == 0
+                        or triggers
+                        or tokens
+                        or ext_pairs
+                        or dominant != prev_dominant
+                        or float(cur["novelty"]) >= novelty_high
+                    ):
+                        event = compact_tick_event(event)
+                    prev_dominant = dominant
+                    events.emit(event)
 
-        obs = obs_next
-        state = state.next()
+                    if table is not None:
+                        table.add_row(
+                            str(state.tick),
+                            {"curiosity": "Cur", "stability": "Stab", "pattern_completion": "Pat", "truth_seeking": "Truth", "caregiver_alignment": "Care", "overload_regulation": "Over"}.get(dominant, dominant),
+                            behavior,
+                            final_action,
+                            f"{boredom:.2f}",
+                            f"{float(cur['novelty']):.2f}",
+                            (" ".join(tokens) if tokens else "-"),
+                            f"({obs_next['agent']['x']},{obs_next['agent']['y']})",
+                        )
 
-    notes.note(kind="shutdown", payload={"ticks": ticks}, tick=state.tick)
+            obs = obs_next
+            state = state.next()
 
-    console.print(table)
+        notes.note(kind="shutdown", payload={"ticks": ticks}, tick=state.tick)
+        completed = True
+    finally:
+        for sink in extra:
+            sink.status = "done" if completed else "failed"
+        # closes are queued behind pending writes when async; writer.close() drains and re-raises
+        steps: List[Callable[[], Any]] = [events.close]
+        if writer is not None:
+            steps.append(writer.close)
+            steps += [s.close_now for s in events.sinks if isinstance(s, DeferredSink)]
+        if timer.enabled:
+            steps.append(partial(timer.write, run_dir / "profile.json"))
+        if views is not None:
+            steps.append(partial(views.write, run_dir / CACHE_FILE))
+        error = _run_cleanup(steps)
+        if catalog is not None:
+            set_status(catalog, run_id, "done" if completed and error is None else "failed")
+        if error is not None:
+            raise error
 
-    event_log.close()
-    store.close()
\ No newline at end of file
+    if table is not None:
+        console.print(table)
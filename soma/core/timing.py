@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+import json
+import math
+import time
+
+
+class LatencyHistogram:
+    """Streaming log-bucketed latency histogram (constant memory, ~4.4% relative error).
+
+    Bucket i covers [GROWTH**i, GROWTH**(i+1)) nanoseconds; quantiles are read back as the
+    bucket's geometric midpoint, clamped to the observed min/max.
+    """
+
+    GROWTH = 2.0 ** (1.0 / 8.0)
+    _LOG_GROWTH = math.log(GROWTH)
+
+    def __init__(self) -> None:
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+
+    def add(self, ns: int) -> None:
+        b = int(math.log(ns) / self._LOG_GROWTH) if ns > 0 else 0
+        self.counts[b] = self.counts.get(b, 0) + 1
+        if self.count == 0 or ns < self.min_ns:
+            self.min_ns = ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        self.count += 1
+        self.total_ns += ns
+
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile in nanoseconds (0.0 when empty)."""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for b in sorted(self.counts):
+            seen += self.counts[b]
+            if seen >= rank:
+                mid = self.GROWTH ** (b + 0.5)
+                return float(min(max(mid, self.min_ns), self.max_ns))
+        return float(self.max_ns)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ns": self.total_ns,
+            "min_ns": self.min_ns,
+            "max_ns": self.max_ns,
+            "buckets": {str(b): c for b, c in sorted(self.counts.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "LatencyHistogram":
+        h = cls()
+        h.counts = {int(b): int(c) for b, c in (d.get("buckets") or {}).items()}
+        h.count = int(d.get("count", 0))
+        h.total_ns = int(d.get("total_ns", 0))
+        h.min_ns = int(d.get("min_ns", 0))
+        h.max_ns = int(d.get("max_ns", 0))
+        return h
+
+
+class _Span:
+    __slots__ = ("hist", "clock", "t0")
+
+    def __init__(self, hist: LatencyHistogram, clock: Callable[[], int]) -> None:
+        self.hist = hist
+        self.clock = clock
+        self.t0 = 0
+
+    def __enter__(self) -> "_Span":
+        self.t0 = self.clock()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.hist.add(self.clock() - self.t0)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NULL = _NullSpan()
+
+
+class PhaseTimer:
+    """Switchable per-phase timer: `with timer.phase("recall"): ...`.
+
+    Enabled, each phase name owns one reusable span feeding a LatencyHistogram (phases may
+    nest, e.g. every phase inside "tick", but a name must not nest inside itself). Disabled,
+    `phase()` returns a shared no-op context manager, so the loop pays one call per phase.
+    """
+
+    TICK = "tick"
+
+    def __init__(self, enabled: bool = True, clock: Callable[[], int] = time.perf_counter_ns) -> None:
+        self.enabled = bool(enabled)
+        self.clock = clock
+        self.hists: Dict[str, LatencyHistogram] = {}
+        self._spans: Dict[str, _Span] = {}
+
+    def phase(self, name: str) -> Any:
+        if not self.enabled:
+            return _NULL
+        span = self._spans.get(name)
+        if span is None:
+            hist = self.hists[name] = LatencyHistogram()
+            span = self._spans[name] = _Span(hist, self.clock)
+        return span
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return summarize(self.hists)
+
+    def write(self, path: Path) -> None:
+        data = {
+            "unit": "us",
+            "phases": self.summary(),
+            "histograms": {name: h.to_dict() for name, h in self.hists.items()},
+        }
+        Path(path).write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+
+def summarize(hists: Dict[str, LatencyHistogram]) -> Dict[str, Dict[str, float]]:
+    """Per-phase count/mean/p50/p95/p99/max in microseconds plus share of total tick time."""
+    tick = hists.get(PhaseTimer.TICK)
+    tick_total = tick.total_ns if tick is not None and tick.total_ns > 0 else 0
+    out: Dict[str, Dict[str, float]] = {}
+    for name, h in hists.items():
+        out[name] = {
+            "count": h.count,
+            "mean_us": round(h.total_ns / h.count / 1e3, 3) if h.count else 0.0,
+            "p50_us": round(h.quantile(0.50) / 1e3, 3),
+            "p95_us": round(h.quantile(0.95) / 1e3, 3),
+            "p99_us": round(h.quantile(0.99) / 1e3, 3),
+            "max_us": round(h.max_ns / 1e3, 3),
+            "total_ms": round(h.total_ns / 1e6, 3),
+            "share": round(h.total_ns / tick_total, 4) if tick_total else 0.0,
+        }
+    return out
+
+
+def load_profile(run_dir: Path) -> Optional[Dict[str, Any]]:
+    """profile.json of a run (None when the run was not profiled)."""
+    try:
+        return json.loads((Path(run_dir) / "profile.json").read_text(encoding="utf-8"))
+    except Exception:
+        return None
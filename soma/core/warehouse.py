@@ -0,0 +1,220 @@
+"""Cross-run warehouse: many runs in one SQLite database.
+
+Tables:
+  runs(run_id PK, created_at, env, size, n_objects, view_radius, seed, ticks, memory_backend,
+       run_dir, status, ticks_logged, meta)      — one row per run, from meta.json
+  tick_metrics(run_id, tick, novelty, ...)        — same columns as in each run's events.sqlite
+
+`ingest_run` copies a finished run (from its events.sqlite tick_metrics table, or by
+streaming its event log when that table is missing); `WarehouseSink` writes a run live
+from run_loop. Several processes may write at once: the database runs in WAL mode with a
+busy timeout and every write transaction starts with BEGIN IMMEDIATE.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import json
+import sqlite3
+
+from .store import _INSERT_TICK_METRICS, TICK_METRICS_COLUMNS, TICK_METRICS_SCHEMA, tick_metrics_row
+
+
+BUSY_TIMEOUT_S = 60.0
+
+RUNS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+  run_id TEXT PRIMARY KEY,
+  created_at TEXT,
+  env TEXT,
+  size INTEGER,
+  n_objects INTEGER,
+  view_radius INTEGER,
+  seed INTEGER,
+  ticks INTEGER,
+  memory_backend TEXT,
+  run_dir TEXT,
+  status TEXT NOT NULL,
+  ticks_logged INTEGER NOT NULL DEFAULT 0,
+  meta TEXT NOT NULL
+)
+"""
+
+_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_runs_env_seed ON runs(env, seed)",
+    "CREATE INDEX IF NOT EXISTS idx_runs_created ON runs(created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_tick_metrics_run_tick ON tick_metrics(run_id, tick)",
+    "CREATE INDEX IF NOT EXISTS idx_tick_metrics_dominant ON tick_metrics(dominant)",
+)
+
+_UPSERT_RUN = (
+    "INSERT INTO runs(run_id, created_at, env, size, n_objects, view_radius, seed, ticks, memory_backend, "
+    "run_dir, status, ticks_logged, meta) VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?) "
+    "ON CONFLICT(run_id) DO UPDATE SET created_at=excluded.created_at, env=excluded.env, size=excluded.size, "
+    "n_objects=excluded.n_objects, view_radius=excluded.view_radius, seed=excluded.seed, ticks=excluded.ticks, "
+    "memory_backend=excluded.memory_backend, run_dir=excluded.run_dir, status=excluded.status, "
+    "ticks_logged=excluded.ticks_logged, meta=excluded.meta"
+)
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    """Open (and create) a warehouse; WAL + busy timeout so concurrent writers wait instead of failing."""
+    # uri=True for the read-only ATTACH in ingest_run; the live sink may run on a writer thread
+    conn = sqlite3.connect(str(db_path), timeout=BUSY_TIMEOUT_S, isolation_level=None, uri=True, check_same_thread=False)
+    conn.execute(f"PRAGMA busy_timeout={int(BUSY_TIMEOUT_S * 1000)}")
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    with _write(conn):
+        conn.execute(RUNS_SCHEMA)
+        conn.execute(TICK_METRICS_SCHEMA)
+        for sql in _INDEXES:
+            conn.execute(sql)
+    return conn
+
+
+class _write:
+    """BEGIN IMMEDIATE ... COMMIT (ROLLBACK on error): take the write lock up front."""
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+def _run_row(meta: Dict[str, Any], run_id: str, run_dir: Optional[Path], status: str, ticks_logged: int) -> Tuple[Any, ...]:
+    env = meta.get("env") or {}
+    return (
+        run_id,
+        meta.get("created_at"),
+        env.get("name"),
+        env.get("size"),
+        env.get("n_objects"),
+        env.get("view_radius"),
+        meta.get("seed"),
+        meta.get("ticks"),
+        (meta.get("memory") or {}).get("backend"),
+        str(run_dir) if run_dir is not None else None,
+        status,
+        ticks_logged,
+        json.dumps(meta, ensure_ascii=False),
+    )
+
+
+def _load_meta(run_dir: Path) -> Dict[str, Any]:
+    try:
+        return json.loads((run_dir / "meta.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _has_table(conn: sqlite3.Connection, schema: str, name: str) -> bool:
+    q = f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = ?"
+    return conn.execute(q, (name,)).fetchone() is not None
+
+
+def _log_rows(run_dir: Path, run_id: str) -> Iterator[Tuple[Any, ...]]:
+    """tick_metrics rows from the run's event log (runs without an events.sqlite table)."""
+    from soma.eval.metrics import iter_events  # eval depends on core, not the other way round
+
+    for e in iter_events(run_dir):
+        if e.get("type") == "tick":
+            yield tick_metrics_row(run_id, e.get("tick", 0), e)
+
+
+def ingest_run(conn: sqlite3.Connection, run_dir: Path, *, replace: bool = True) -> Optional[str]:
+    """Copy one run into the warehouse in a single transaction; returns its run_id.
+
+    Returns None when `run_dir` has no meta.json, or when the run is already ingested and
+    `replace` is False. Re-ingesting replaces the run's rows.
+    """
+    run_dir = Path(run_dir)
+    meta = _load_meta(run_dir)
+    if not meta:
+        return None
+    run_id = str(meta.get("run_id") or run_dir.name)
+    if not replace and conn.execute("SELECT 1 FROM runs WHERE run_id = ? AND status = 'done'", (run_id,)).fetchone():
+        return None
+    db = run_dir / "events.sqlite"
+    attached = False
+    if db.exists():
+        conn.execute("ATTACH DATABASE ? AS src", (f"file:{db}?mode=ro",))
+        attached = True
+    try:
+        with _write(conn):
+            conn.execute("DELETE FROM tick_metrics WHERE run_id = ?", (run_id,))
+            cols = ", ".join(TICK_METRICS_COLUMNS)
+            if attached and _has_table(conn, "src", "tick_metrics"):
+                # the run's own table may hold several runs (batch ids); copy only ours
+                cur = conn.execute(
+                    f"INSERT INTO tick_metrics({cols}) SELECT {cols} FROM src.tick_metrics WHERE run_id = ?", (run_id,)
+                )
+            else:
+                cur = conn.executemany(_INSERT_TICK_METRICS, _log_rows(run_dir, run_id))
+            n = cur.rowcount
+            conn.execute(_UPSERT_RUN, _run_row(meta, run_id, run_dir, "done", n))
+    finally:
+        if attached:
+            conn.execute("DETACH DATABASE src")
+    return run_id
+
+
+def find_runs(root: Path) -> List[Path]:
+    """Run directories (those with meta.json): `root` itself, or any directory below it
+    (plain runs, sweep cells under runs/<sweep>/<cell>/, or deeper)."""
+    root = Path(root)
+    if (root / "meta.json").exists():
+        return [root]
+    return sorted(p.parent for p in root.rglob("meta.json"))
+
+
+class WarehouseSink:
+    """Event sink writing a run live into a warehouse (soma.core.sinks interface).
+
+    The runs row is written with status "running" on open and `status` on close ("done"
+    unless the owner sets "failed", as run_loop does when the run raised; `ingest_run` with
+    replace=False then still re-ingests it). Tick rows are committed every `commit_every`
+    ticks so concurrent runs share the write lock.
+    """
+
+    def __init__(self, db_path: Path, run_id: str, meta: Dict[str, Any], run_dir: Optional[Path] = None, *, commit_every: int = 256):
+        self.conn = connect(Path(db_path))
+        self.run_id = run_id
+        self.meta = meta
+        self.run_dir = run_dir
+        self.commit_every = max(1, int(commit_every))
+        self._pending: List[Tuple[Any, ...]] = []
+        self._logged = 0
+        self.status = "done"
+        with _write(self.conn):
+            self.conn.execute("DELETE FROM tick_metrics WHERE run_id = ?", (run_id,))
+            self.conn.execute(_UPSERT_RUN, _run_row(meta, run_id, run_dir, "running", 0))
+
+    def write_encoded(self, ev: Any) -> None:
+        if ev.type != "tick":
+            return
+        self._pending.append(tick_metrics_row(self.run_id, ev.tick, ev.event))
+        if len(self._pending) >= self.commit_every:
+            self.flush()
+
+    def flush(self, status: Optional[str] = None) -> None:
+        with _write(self.conn):
+            if self._pending:
+                self.conn.executemany(_INSERT_TICK_METRICS, self._pending)
+                self._logged += len(self._pending)
+                self._pending.clear()
+            if status is not None:
+                self.conn.execute(
+                    "UPDATE runs SET status = ?, ticks_logged = ? WHERE run_id = ?", (status, self._logged, self.run_id)
+                )
+
+    def close(self, status: Optional[str] = None) -> None:
+        try:
+            self.flush(status=status or self.status)
+        finally:
+            self.conn.close()
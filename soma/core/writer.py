@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Optional, Tuple
+import queue
+import threading
+
+
+class WriterError(RuntimeError):
+    """Raised on the tick thread when a deferred write failed on the writer thread."""
+
+
+_STOP = object()
+
+
+class BackgroundWriter:
+    """Single writer thread draining a bounded queue of I/O calls.
+
+    - `submit(fn, *args)` enqueues and returns; it blocks when the queue is full (backpressure).
+    - The first exception raised on the writer thread is kept; later work is dropped and
+      the error is re-raised as WriterError from the next `submit`, `flush` or `close`.
+    - `close()` drains everything already queued, then joins the thread.
+    """
+
+    def __init__(self, maxsize: int = 1024, name: str = "soma-writer") -> None:
+        self._q: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, int(maxsize)))
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._q.get()
+            try:
+                if item is _STOP:
+                    return
+                fn, args, kwargs = item
+                if self._error is None:
+                    fn(*args, **kwargs)
+            except BaseException as e:  # keep the first failure for the tick thread
+                if self._error is None:
+                    self._error = e
+            finally:
+                self._q.task_done()
+
+    def raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise WriterError(f"background write failed: {self._error!r}") from self._error
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        self.raise_if_failed()
+        if self._closed:
+            raise WriterError("writer is closed")
+        item: Tuple[Callable[..., Any], Tuple[Any, ...], Any] = (fn, args, kwargs)
+        self._q.put(item)
+
+    def flush(self) -> None:
+        """Block until every queued call has run."""
+        self._q.join()
+        self.raise_if_failed()
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._q.put(_STOP)
+            self._thread.join()
+        self.raise_if_failed()
+
+
+class DeferredSink:
+    """Proxy for an event sink (JsonlEventLog / EventStore) whose writes run on a BackgroundWriter."""
+
+    def __init__(self, target: Any, writer: BackgroundWriter) -> None:
+        self.target = target
+        self.writer = writer
+        self.closed = False
+
+    def write(self, *args: Any, **kwargs: Any) -> None:
+        self.writer.submit(self.target.write, *args, **kwargs)
+
+    def write_encoded(self, ev: Any) -> None:
+        self.writer.submit(self.target.write_encoded, ev)
+
+    def close(self) -> None:
+        self.writer.submit(self._close)
+
+    def _close(self) -> None:
+        self.closed = True  # set first: a close that raised is not retried by close_now
+        self.target.close()
+
+    def close_now(self) -> None:
+        """Close the target on the calling thread unless the writer already did.
+
+        A failed writer drops every queued call, closes included; call this after
+        `writer.close()` so the target's file and database handles are released anyway.
+        """
+        if not self.closed:
+            self._close()
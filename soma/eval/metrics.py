@@ -1,11 +1,18 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 import json
-from statistics import mean
+import math
+import sqlite3
 from collections import Counter
 
+from soma.core.binlog import BinaryEventReader
+from soma.core.events import iter_events as read_jsonl_events
+from soma.core.segments import iter_segment_events, manifest_path
+from soma.cogs.perception.cache import load_cache_stats
+from soma.core.timing import load_profile
+
 Number = float
 
 # ---------- Loading ----------
@@ -18,22 +25,27 @@ def load_meta(run_dir: Path) -> Dict[str, Any]:
         return {}
 
 
-def load_events(run_dir: Path) -> List[Dict[str, Any]]:
+def iter_events(run_dir: Path, start: Optional[int] = None, end: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Stream events.jsonl (or events/ segments, or events.bin) one event at a time, optionally only ticks in [start, end).
+
+    Partial/corrupt lines are skipped; a tick window seeks via the log's sidecar index.
+    """
+    seg_dir = Path(run_dir) / "events"
+    if manifest_path(seg_dir).exists():
+        yield from iter_segment_events(seg_dir, start, end)
+        return
     ev_path = Path(run_dir) / "events.jsonl"
-    out: List[Dict[str, Any]] = []
     if not ev_path.exists():
-        return out
-    with ev_path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                out.append(json.loads(line))
-            except Exception:
-                # tolerate partial/corrupt lines
-                continue
-    return out
+        bin_path = Path(run_dir) / "events.bin"
+        if bin_path.exists():
+            reader = BinaryEventReader(bin_path)
+            yield from (reader if start is None and end is None else reader.iter_range(start or 0, end))
+        return
+    yield from read_jsonl_events(ev_path, start, end)
+
+
+def load_events(run_dir: Path) -> List[Dict[str, Any]]:
+    return list(iter_events(run_dir))
 
 
 # ---------- Helpers ----------
@@ -49,6 +61,69 @@ def p95(xs: List[Number]) -> Number:
     return float(s[idx])
 
 
+class QuantileSketch:
+    """Constant-memory quantile sketch with relative accuracy `rel_err` (log buckets).
+
+    Zeros are counted exactly; `quantile(q)` uses the same rank as `p95` above
+    (round(q * (n - 1))); the extreme ranks return the exact min/max and everything
+    else is clamped to them.
+    """
+
+    def __init__(self, rel_err: float = 0.01) -> None:
+        self.gamma = (1.0 + rel_err) / (1.0 - rel_err)
+        self._log_gamma = math.log(self.gamma)
+        self.pos: Dict[int, int] = {}
+        self.neg: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+        self.min = 0.0
+        self.max = 0.0
+
+    def add(self, x: float) -> None:
+        if self.count == 0 or x < self.min:
+            self.min = x
+        if self.count == 0 or x > self.max:
+            self.max = x
+        self.count += 1
+        if x == 0.0:
+            self.zeros += 1
+            return
+        side = self.pos if x > 0 else self.neg
+        k = math.ceil(math.log(abs(x)) / self._log_gamma)
+        side[k] = side.get(k, 0) + 1
+
+    def _value(self, k: int) -> float:
+        return 2.0 * self.gamma ** k / (self.gamma + 1.0)
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        idx = max(0, min(self.count - 1, int(round(q * (self.count - 1)))))
+        if idx == 0:
+            return float(self.min)
+        if idx == self.count - 1:
+            return float(self.max)
+        seen = 0
+        out = self.max
+        done = False
+        for k in sorted(self.neg, reverse=True):
+            seen += self.neg[k]
+            if seen > idx:
+                out, done = -self._value(k), True
+                break
+        if not done:
+            seen += self.zeros
+            if seen > idx:
+                out, done = 0.0, True
+        if not done:
+            for k in sorted(self.pos):
+                seen += self.pos[k]
+                if seen > idx:
+                    out = self._value(k)
+                    break
+        return float(min(max(out, self.min), self.max))
+
+
 def top_sim(e: Dict[str, Any]) -> Number:
     rec = e.get("recall", []) or []
     if not isinstance(rec, list) or not rec:
@@ -113,132 +188,324 @@ def channel_pairs(e: Dict[str, Any]) -> List[Tuple[str, str]]:
 
 # ---------- Metric computation ----------
 
-def compute_metrics(run_dir: Path) -> Dict[str, Any]:
-    run_dir = Path(run_dir)
-    meta = load_meta(run_dir)
-    events = load_events(run_dir)
-    ticks = [e for e in events if e.get("type") == "tick"]
-    notes = [e for e in events if e.get("type") == "note"]
-
-    # Series
-    nov = [novelty_of(e) for e in ticks]
-    brd = [boredom_of(e) for e in ticks]
-    drv = [drive_of(e) for e in ticks]
-    beh = [behavior_of(e) for e in ticks]
-    act = [action_of(e) for e in ticks]
-    top = [top_sim(e) for e in ticks]
-    cov = [coverage_of(e) for e in ticks]
-    tok_lists = [channel_tokens(e) for e in ticks]
-
-    # Novelty stats
-    novelty_mean = float(mean(nov)) if nov else 0.0
-    novelty_p95 = p95(nov)
-    high_novelty_rate = (sum(1 for x in nov if x >= 0.8) / len(nov)) if nov else 0.0
-
-    # Memory reuse helpfulness (top recall >= 0.5 among ticks with any recall)
-    any_recall = [x for x in top if x > 0.0]
-    helpful = sum(1 for x in top if x >= 0.5)
-    memory_reuse_ratio = (helpful / len(any_recall)) if any_recall else 0.0
-
-    # Symbols
-    flat_tokens: List[str] = []
-    for toks in tok_lists:
-        flat_tokens.extend(toks)
-    token_counts = Counter(flat_tokens)
-    symbol_kinds = len(token_counts)
-    symbol_rows = sum(1 for toks in tok_lists if toks)
-    def simpson_diversity(counts: Counter) -> float:
-        N = sum(counts.values())
-        if N <= 1:
-            return 0.0
-        return 1.0 - sum((c / N) ** 2 for c in counts.values())
-    simpson = simpson_diversity(token_counts)
-
-    # Symbolic continuity (within run): proportion of emissions that repeat a previously seen emission
-    emissions = [" ".join(toks) for toks in tok_lists if toks]
-    if emissions:
-        seen: set[str] = set()
-        repeats = 0
-        for s in emissions:
-            if s in seen:
-                repeats += 1
+_SELF_MODEL_KEYS = ("dominant", "drives", "novelty", "boredom", "coverage")
+
+
+def is_self_model(n: Dict[str, Any]) -> bool:
+    """Notes that reference the self-model (drive/novelty/boredom keys)."""
+    p = n.get("payload", {}) if isinstance(n, dict) else {}
+    if not isinstance(p, dict):
+        return False
+    return bool(set(p.keys()) & set(_SELF_MODEL_KEYS))
+
+
+def simpson_diversity(counts: Dict[str, int]) -> float:
+    N = sum(counts.values())
+    if N <= 1:
+        return 0.0
+    return 1.0 - sum((c / N) ** 2 for c in counts.values())
+
+
+def tick_row(e: Dict[str, Any], i: int = 0) -> Dict[str, Any]:
+    """Per-tick table row (CSV/HTML/report preview)."""
+    toks = channel_tokens(e)
+    return {
+        "tick": int(e.get("tick", i)),
+        "drive": drive_of(e),
+        "behavior": behavior_of(e),
+        "action": action_of(e),
+        "novelty": round(novelty_of(e), 6),
+        "boredom": round(boredom_of(e), 6),
+        "top_sim": round(top_sim(e), 6),
+        "coverage": round(coverage_of(e), 6),
+        "symbols": " ".join(toks) if toks else "-",
+    }
+
+
+SERIES_KEYS = ("novelty", "boredom", "drive", "behavior", "action", "top_sim", "coverage", "symbols")
+
+
+class MetricsAccumulator:
+    """Single-pass, constant-memory run metrics: feed events with `add`, then `result()`.
+
+    Only the symbol vocabulary and the set of distinct emissions grow with the run (both
+    bounded by what the channel can say). Per-tick series are kept only with
+    `series=True`; `on_row` streams every per-tick row to a callback instead (e.g. a CSV
+    writer). The first `preview` rows are always kept for the report.
+    """
+
+    def __init__(self, *, series: bool = False, on_row: Optional[Callable[[Dict[str, Any]], None]] = None, preview: int = 20) -> None:
+        self.series = bool(series)
+        self.on_row = on_row
+        self.preview = int(preview)
+        self.ticks = 0
+        self.full_ticks = 0
+        self.notes = 0
+        self.self_model_refs = 0
+        self.symbol_rows = 0
+        self.novelty_sum = 0.0
+        self.novelty_high = 0
+        self.novelty_sketch = QuantileSketch()
+        self.any_recall = 0
+        self.helpful = 0
+        self.token_counts: Counter = Counter()
+        self.emissions = 0
+        self.repeats = 0
+        self._seen_emissions: set[str] = set()
+        self.rows_with_gloss = 0
+        self.coverage_sum = 0.0
+        self.coverage_final = 0.0
+        self.rows: List[Dict[str, Any]] = []
+        self.timeseries: Dict[str, List[Any]] = {k: [] for k in SERIES_KEYS} if self.series else {}
+
+    def add(self, e: Dict[str, Any]) -> None:
+        kind = e.get("type")
+        if kind == "note":
+            self.notes += 1
+            if is_self_model(e):
+                self.self_model_refs += 1
+            return
+        if kind != "tick":
+            return
+        if e.get("level") != "compact":
+            self.full_ticks += 1
+        toks = channel_tokens(e)
+        self.add_tick(
+            tick=e.get("tick", self.ticks),
+            novelty=novelty_of(e),
+            boredom=boredom_of(e),
+            drive=drive_of(e),
+            behavior=behavior_of(e),
+            action=action_of(e),
+            top=top_sim(e),
+            coverage=coverage_of(e),
+            tokens=toks,
+            gloss_pairs=len(channel_pairs(e)),
+        )
+
+    def add_tick(
+        self,
+        *,
+        tick: Any,
+        novelty: float,
+        boredom: float,
+        drive: str,
+        behavior: str,
+        action: str,
+        top: float,
+        coverage: float,
+        tokens: List[str],
+        gloss_pairs: int,
+    ) -> None:
+        """Accumulate one tick from already-extracted fields (JSONL events or tick_metrics rows)."""
+        i = self.ticks
+        self.ticks += 1
+
+        nov = novelty
+        self.novelty_sum += nov
+        self.novelty_sketch.add(nov)
+        if nov >= 0.8:
+            self.novelty_high += 1
+
+        # Memory reuse helpfulness (top recall >= 0.5 among ticks with any recall)
+        if top > 0.0:
+            self.any_recall += 1
+        if top >= 0.5:
+            self.helpful += 1
+
+        # Symbols + continuity (share of emissions repeating an earlier emission)
+        emitted = " ".join(tokens)
+        if tokens:
+            self.symbol_rows += 1
+            self.token_counts.update(tokens)
+            self.emissions += 1
+            if emitted in self._seen_emissions:
+                self.repeats += 1
             else:
-                seen.add(s)
-        continuity = repeats / len(emissions)
-    else:
-        continuity = 0.0
+                self._seen_emissions.add(emitted)
+        if gloss_pairs:
+            self.rows_with_gloss += 1
+
+        self.coverage_sum += coverage
+        self.coverage_final = coverage
+
+        if self.series or self.on_row is not None or i < self.preview:
+            row = {
+                "tick": int(tick if tick is not None else i),
+                "drive": drive,
+                "behavior": behavior,
+                "action": action,
+                "novelty": round(nov, 6),
+                "boredom": round(boredom, 6),
+                "top_sim": round(top, 6),
+                "coverage": round(coverage, 6),
+                "symbols": emitted or "-",
+            }
+            if self.series or i < self.preview:
+                self.rows.append(row)
+            if self.on_row is not None:
+                self.on_row(row)
+        if self.series:
+            ts = self.timeseries
+            ts["novelty"].append(nov)
+            ts["boredom"].append(boredom)
+            ts["drive"].append(drive)
+            ts["behavior"].append(behavior)
+            ts["action"].append(action)
+            ts["top_sim"].append(top)
+            ts["coverage"].append(coverage)
+            ts["symbols"].append(emitted or "-")
+
+    def update(self, events: Iterable[Dict[str, Any]]) -> "MetricsAccumulator":
+        for e in events:
+            self.add(e)
+        return self
+
+    def result(self, meta: Optional[Dict[str, Any]] = None, caregiver_tags: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        n = self.ticks
+        caregiver_tags = caregiver_tags or {}
+        out: Dict[str, Any] = {
+            "meta": meta or {},
+            "counts": {
+                "ticks": n,
+                "full_ticks": self.full_ticks,
+                "notes": self.notes,
+                "symbol_rows": self.symbol_rows,
+                "self_model_notes": self.self_model_refs,
+            },
+            "novelty": {
+                "mean": self.novelty_sum / n if n else 0.0,
+                "p95": float(self.novelty_sketch.quantile(0.95)),
+                "high_rate": self.novelty_high / n if n else 0.0,
+            },
+            "memory": {
+                "any_recall": self.any_recall,
+                "helpful_recall": self.helpful,
+                "helpful_ratio": self.helpful / self.any_recall if self.any_recall else 0.0,
+            },
+            "symbols": {
+                "kinds": len(self.token_counts),
+                "counts": dict(self.token_counts),
+                "simpson": float(simpson_diversity(self.token_counts)),
+                "continuity": self.repeats / self.emissions if self.emissions else 0.0,
+            },
+            "caregiver": {
+                "has_tags": bool(caregiver_tags),
+                "tag_count": len(caregiver_tags),
+                "rows_with_gloss": self.rows_with_gloss,
+            },
+            "coverage": {
+                "final": self.coverage_final,
+                "mean": self.coverage_sum / n if n else 0.0,
+            },
+            # full table only with series=True; otherwise the first `preview` ticks
+            "rows": self.rows,
+        }
+        if self.series:
+            out["timeseries"] = self.timeseries
+        return out
 
-    # Caregiver tags
+
+def _has_tick_metrics(db_path: Path) -> bool:
+    if not db_path.exists():
+        return False
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            return conn.execute("SELECT 1 FROM tick_metrics LIMIT 1").fetchone() is not None
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return False
+
+
+def accumulate_sqlite(
+    acc: MetricsAccumulator,
+    db_path: Path,
+    run_id: Optional[str] = None,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+) -> MetricsAccumulator:
+    """Feed `acc` from the typed tick_metrics table (no per-event JSON parsing).
+
+    Notes are counted in SQL; self-model notes use SQLite's JSON functions on the note rows.
+    """
+    conn = sqlite3.connect(f"file:{Path(db_path)}?mode=ro", uri=True)
+    try:
+        conds: List[str] = []
+        args: Tuple[Any, ...] = ()
+        for cond, val in (("run_id = ?", run_id), ("tick >= ?", start), ("tick < ?", end)):
+            if val is not None:
+                conds.append(cond)
+                args += (val,)
+        where = ("WHERE " + " AND ".join(conds)) if conds else ""
+        cur = conn.execute(
+            "SELECT tick, novelty, boredom, dominant, behavior, action, top_score, coverage, tokens, gloss_pairs "
+            f"FROM tick_metrics {where} ORDER BY tick",
+            args,
+        )
+        for tick, nov, brd, drive, beh, act, top, cov, toks, pairs in cur:
+            acc.add_tick(
+                tick=tick,
+                novelty=nov or 0.0,
+                boredom=brd or 0.0,
+                drive=drive or "",
+                behavior=beh or "",
+                action=act or "",
+                top=top or 0.0,
+                coverage=cov or 0.0,
+                tokens=toks.split() if toks else [],
+                gloss_pairs=pairs or 0,
+            )
+        tick_where = " AND ".join(["type = 'tick'", "json_extract(data, '$.level') IS NULL"] + conds)
+        acc.full_ticks += conn.execute(f"SELECT COUNT(*) FROM events WHERE {tick_where}", args).fetchone()[0]
+        note_where = " AND ".join(["type = 'note'"] + conds)
+        acc.notes += conn.execute(f"SELECT COUNT(*) FROM events WHERE {note_where}", args).fetchone()[0]
+        keys = " OR ".join(f"json_extract(data, '$.payload.{k}') IS NOT NULL" for k in _SELF_MODEL_KEYS)
+        acc.self_model_refs += conn.execute(
+            f"SELECT COUNT(*) FROM events WHERE {note_where} AND json_type(data, '$.payload') = 'object' AND ({keys})", args
+        ).fetchone()[0]
+    finally:
+        conn.close()
+    return acc
+
+
+def compute_metrics(
+    run_dir: Path,
+    *,
+    series: bool = True,
+    on_row: Optional[Callable[[Dict[str, Any]], None]] = None,
+    source: str = "auto",
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Metrics for one run in a single streaming pass.
+
+    `source`: "sqlite" reads the typed tick_metrics table of events.sqlite, "jsonl" streams
+    events.jsonl, "auto" prefers sqlite when the run has tick_metrics rows.
+    By default the result includes the per-tick `timeseries` and the full `rows` table;
+    `series=False` keeps memory constant in run length (summaries plus a `rows` preview only).
+    `start`/`end` restrict the metrics to ticks in [start, end).
+    """
+    run_dir = Path(run_dir)
+    db_path = run_dir / "events.sqlite"
+    if source == "auto":
+        source = "sqlite" if _has_tick_metrics(db_path) else "jsonl"
+    acc = MetricsAccumulator(series=series, on_row=on_row)
+    if source == "sqlite":
+        accumulate_sqlite(acc, db_path, start=start, end=end)
+    elif source == "jsonl":
+        acc.update(iter_events(run_dir, start, end))
+    else:
+        raise ValueError(f"unknown metrics source {source!r} (expected auto, sqlite or jsonl)")
     try:
         caregiver_tags = json.loads((run_dir / "caregiver_tags.json").read_text(encoding="utf-8"))
     except Exception:
         caregiver_tags = {}
-    rows_with_caregiver = sum(1 for e in ticks if channel_pairs(e))
-
-    # Self-model references in notes (notes that include drive/novelty/boredom keys)
-    def is_self_model(n: Dict[str, Any]) -> bool:
-        p = n.get("payload", {}) if isinstance(n, dict) else {}
-        if not isinstance(p, dict):
-            return False
-        keys = set(p.keys())
-        return bool(keys & {"dominant", "drives", "novelty", "boredom", "coverage"})
-    self_model_refs = sum(1 for n in notes if is_self_model(n))
-
-    # Pack per-tick table (for CSV/HTML table)
-    rows: List[Dict[str, Any]] = []
-    for i, e in enumerate(ticks):
-        t = int(e.get("tick", i))
-        rows.append(
-            {
-                "tick": t,
-                "drive": drive_of(e),
-                "behavior": behavior_of(e),
-                "action": action_of(e),
-                "novelty": round(nov[i], 6) if i < len(nov) else 0.0,
-                "boredom": round(brd[i], 6) if i < len(brd) else 0.0,
-                "top_sim": round(top[i], 6) if i < len(top) else 0.0,
-                "coverage": round(cov[i], 6) if i < len(cov) else 0.0,
-                "symbols": " ".join(tok_lists[i]) if i < len(tok_lists) and tok_lists[i] else "-",
-            }
-        )
-
-    return {
-        "meta": meta,
-        "counts": {
-            "ticks": len(ticks),
-            "notes": len(notes),
-            "symbol_rows": symbol_rows,
-        },
-        "novelty": {
-            "mean": novelty_mean,
-            "p95": float(novelty_p95),
-            "high_rate": float(high_novelty_rate),
-        },
-        "memory": {
-            "any_recall": len(any_recall),
-            "helpful_recall": helpful,
-            "helpful_ratio": float(memory_reuse_ratio),
-        },
-        "symbols": {
-            "kinds": symbol_kinds,
-            "counts": dict(token_counts),
-            "simpson": float(simpson),
-            "continuity": float(continuity),
-        },
-        "caregiver": {
-            "has_tags": bool(caregiver_tags),
-            "tag_count": len(caregiver_tags),
-            "rows_with_gloss": rows_with_caregiver,
-        },
-        "timeseries": {
-            "novelty": nov,
-            "boredom": brd,
-            "drive": drv,
-            "behavior": beh,
-            "action": act,
-            "top_sim": top,
-            "coverage": cov,
-            "symbols": [" ".join(toks) if toks else "-" for toks in tok_lists],
-        },
-        "rows": rows,
-    }
\ No newline at end of file
+    out = acc.result(load_meta(run_dir), caregiver_tags)
+    out["source"] = source
+    # per-phase tick latency (runs made with profile=True), else {}
+    out["profile"] = load_profile(run_dir) or {}
+    # view cache hit rates (runs with a view cache), else {}
+    out["view_cache"] = load_cache_stats(run_dir) or {}
+    return out
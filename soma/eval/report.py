@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List
 import json
 
 
@@ -9,6 +9,47 @@ def _fmt_pct(x: float) -> str:
     return f"{100.0 * x:.2f}%"
 
 
+def build_profile_section(profile: Dict[str, Any]) -> str:
+    """Per-phase latency table (p50/p95/p99 + share of tick) from a run's profile.json."""
+    phases = (profile or {}).get("phases") or {}
+    if not phases:
+        return ""
+    tick = phases.get("tick", {})
+    lines = [
+        "## Tick latency\n",
+        f"- Ticks timed: {tick.get('count', 0)} | tick p50: {tick.get('p50_us', 0.0):.1f} µs | "
+        f"p95: {tick.get('p95_us', 0.0):.1f} µs | p99: {tick.get('p99_us', 0.0):.1f} µs\n",
+        "Phase | Calls | p50 (µs) | p95 (µs) | p99 (µs) | Max (µs) | Share of tick\n---|---|---|---|---|---|---",
+    ]
+    for name, p in sorted(phases.items(), key=lambda kv: -kv[1].get("total_ms", 0.0)):
+        if name == "tick":
+            continue
+        lines.append(
+            f"{name} | {p.get('count', 0)} | {p.get('p50_us', 0.0):.1f} | {p.get('p95_us', 0.0):.1f} | "
+            f"{p.get('p99_us', 0.0):.1f} | {p.get('max_us', 0.0):.1f} | {_fmt_pct(p.get('share', 0.0))}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _logging_lines(meta: Dict[str, Any], counts: Dict[str, Any]) -> List[str]:
+    """Tier summary for runs logged with sampled full tick events (empty otherwise)."""
+    every = (meta.get("logging") or {}).get("full_every", 1)
+    ticks, full = counts.get("ticks", 0), counts.get("full_ticks", counts.get("ticks", 0))
+    if every <= 1 and full >= ticks:
+        return []
+    return [f"- Tick events: {full} full / {ticks - full} compact (full every {every} ticks + interesting ticks)"]
+
+
+def _view_cache_lines(stats: Dict[str, Any]) -> List[str]:
+    """Hit rates of the per-view perception cache (empty when the run had none)."""
+    if not stats or not stats.get("lookups"):
+        return []
+    return [
+        f"- View cache: {_fmt_pct(stats.get('hit_rate', 0.0))} hits ({stats.get('hits', 0)} / {stats.get('lookups', 0)} views) | "
+        f"recall reused {_fmt_pct(stats.get('recall_reuse_rate', 0.0))} ({stats.get('recall_reused', 0)} / {stats.get('recalls', 0)})"
+    ]
+
+
 def build_markdown(metrics: Dict[str, Any]) -> str:
     m = metrics
     meta = m.get("meta", {})
@@ -31,15 +72,22 @@ def build_markdown(metrics: Dict[str, Any]) -> str:
         "```json\n" + json.dumps(meta, indent=2) + "\n```\n",
         "## Summary\n",
         f"- Ticks: {counts.get('ticks',0)}",
+        *_logging_lines(meta, counts),
         f"- Novelty mean: {nov.get('mean',0.0):.3f} | p95: {nov.get('p95',0.0):.3f} | high-novelty rate: {_fmt_pct(nov.get('high_rate',0.0))}",
         f"- Memory reuse helpful ratio: {_fmt_pct(mem.get('helpful_ratio',0.0))} ({mem.get('helpful_recall',0)} / {mem.get('any_recall',0)})",
+        *_view_cache_lines(m.get("view_cache", {})),
+        f"- Coverage: final {_fmt_pct(m.get('coverage',{}).get('final',0.0))} | mean {_fmt_pct(m.get('coverage',{}).get('mean',0.0))}",
         f"- Symbol kinds: {sym.get('kinds',0)} | Simpson diversity: {sym.get('simpson',0.0):.3f}",
-        f"- Self-model references: {len(m.get('timeseries',{}).get('drive',[]))} ({_fmt_pct(1.0) if (len(m.get('timeseries',{}).get('drive',[]))>0) else _fmt_pct(0.0)})",
+        f"- Self-model references: {counts.get('ticks',0)} ({_fmt_pct(1.0) if counts.get('ticks',0)>0 else _fmt_pct(0.0)})",
         f"- Symbolic continuity: repeat {int(sym.get('continuity',0.0)*max(1, (metrics.get('counts',{}).get('symbol_rows',0))))}/{metrics.get('counts',{}).get('symbol_rows',0)} ({_fmt_pct(sym.get('continuity',0.0))})",
         f"- Caregiver tags present: {'yes' if care.get('has_tags') else 'no'} | rows with caregiver gloss: {care.get('rows_with_gloss',0)} / {metrics.get('counts',{}).get('symbol_rows',0)} ({_fmt_pct((care.get('rows_with_gloss',0) / max(1, metrics.get('counts',{}).get('symbol_rows',0))))})",
         "\n## Symbols\n\n" + sym_table,
     ]
 
+    prof = build_profile_section(m.get("profile", {}))
+    if prof:
+        md.append(prof)
+
     # Add a short per-tick preview (first 20 rows)
     rows = m.get("rows", [])
     if rows:
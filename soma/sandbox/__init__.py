@@ -1,20 +1,47 @@
 from __future__ import annotations
-from typing import Any
+from typing import Any, Optional
 
 # v0 (your existing module name is gridworld.py)
 from .gridworld import GridWorldV0, ACTIONS as V0_ACTIONS
 # v1.5 (new)
 from .v1 import GridWorldV1
 
+from .codes import OBS_MODES
+from .vec import VecGridWorld
+
 # unify/forward the action set
 ACTIONS = list(V0_ACTIONS)
 
-def make_env(name: str, *, size: int, n_objects: int, view_radius: int) -> Any:
+def make_env(
+    name: str,
+    *,
+    size: int,
+    n_objects: int,
+    view_radius: int,
+    obs_mode: str = "tokens",
+    batch: Optional[int] = None,
+    max_steps: int = 0,
+    chunk: int = 0,
+) -> Any:
+    """`obs_mode="array"` returns views as uint8 code arrays (see soma.sandbox.codes).
+
+    `batch=B` returns a VecGridWorld stepping B worlds at once (array views; `max_steps > 0`
+    auto-resets a world after that many steps). `chunk=C` makes grid-v0 a lazily generated
+    large world of C x C chunks (see GridWorldV0).
+    """
     name = (name or "").lower().strip()
     if name in {"grid", "grid-v0", "v0", "gridworld-v0"}:
-        return GridWorldV0(size=size, n_objects=n_objects, view_radius=view_radius)
-    if name in {"grid-v1", "v1", "grid-v1.5"}:
-        return GridWorldV1(size=size, n_objects=n_objects, view_radius=view_radius)
-    raise ValueError(f"Unknown env name: {name}")
+        cls: Any = GridWorldV0
+    elif name in {"grid-v1", "v1", "grid-v1.5"}:
+        cls = GridWorldV1
+    else:
+        raise ValueError(f"Unknown env name: {name}")
+    if chunk:
+        if cls is not GridWorldV0 or batch is not None:
+            raise ValueError("chunked worlds are only available for a single grid-v0 env")
+        return GridWorldV0(size=size, n_objects=n_objects, view_radius=view_radius, obs_mode=obs_mode, chunk=chunk)
+    if batch is not None:
+        return VecGridWorld(cls, batch, size=size, n_objects=n_objects, view_radius=view_radius, max_steps=max_steps)
+    return cls(size=size, n_objects=n_objects, view_radius=view_radius, obs_mode=obs_mode)
 
-__all__ = ["make_env", "ACTIONS", "GridWorldV0", "GridWorldV1"]
\ No newline at end of file
+__all__ = ["make_env", "ACTIONS", "OBS_MODES", "GridWorldV0", "GridWorldV1", "VecGridWorld"]
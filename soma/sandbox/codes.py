@@ -0,0 +1,85 @@
+"""Small-int cell codes for array observations (`obs_mode="array"`).
+
+Both grid worlds can keep the world as a padded integer grid (padding = view radius, filled
+with the env's out-of-bounds code), so the agent's view is a zero-copy slice. One table
+covers the tokens of both envs; `decode_view` turns a view back into the token strings of
+the default observation mode (logging, debugging).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from soma.compat import np, require_numpy
+
+OBS_MODES = ("tokens", "array")
+
+COLORS = ["R", "G", "B", "Y"]
+SHAPES = ["o", "^", "s"]
+
+EMPTY_V0 = 0  # "." empty cell (v0)
+OUT_V0 = 1  # " " outside the world (v0)
+BLANK = 2  # "" empty or outside (v1)
+AGENT = 3  # "@" (only produced by decode_view)
+
+TOKENS: List[str] = [".", " ", "", "@"] + [c + s for c in COLORS for s in SHAPES] + ["DoorC", "DoorO"]
+TOKENS += [f"Pad{c}" for c in COLORS] + ["SW"]
+CODES: Dict[str, int] = {t: i for i, t in enumerate(TOKENS)}
+
+
+# extract_features' _is_token per code: a two-character token that is not ".", "@" or " "
+IS_TOKEN = (
+    np.array([t not in (".", "@", " ") and len(t) == 2 for t in TOKENS], dtype=bool) if np is not None else None
+)
+
+
+def check_obs_mode(obs_mode: str) -> str:
+    if obs_mode not in OBS_MODES:
+        raise ValueError(f"unknown obs_mode {obs_mode!r} (expected one of {OBS_MODES})")
+    if obs_mode == "array":
+        require_numpy("obs_mode='array'")
+    return obs_mode
+
+
+def code_grid(shape: Any, fill: int):
+    require_numpy("array observations")
+    return np.full(shape, fill, dtype=np.uint8)
+
+
+def decode_view(view: Any, *, agent_mark: bool = False) -> List[List[str]]:
+    """Token strings of an array view; `agent_mark` shows the center cell as "@" (v0)."""
+    rows = [[TOKENS[c] for c in row] for row in view.tolist()]
+    if agent_mark and rows:
+        rows[len(rows) // 2][len(rows[0]) // 2] = "@"
+    return rows
+
+
+def summarize_v0(view: Any) -> Dict[str, Any]:
+    """GridWorldV0's summary of an array view: counts in row-major first-seen order, agent cell skipped."""
+    flat = view.flatten()
+    flat[flat.shape[0] // 2] = EMPTY_V0  # the agent's cell shows "@"
+    n = np.bincount(flat, minlength=len(TOKENS))
+    counts: Dict[str, int] = {}
+    for c in dict.fromkeys(flat.tolist()):  # distinct codes, first-seen order
+        if c not in (EMPTY_V0, OUT_V0):
+            counts[TOKENS[c]] = int(n[c])
+    return {
+        "unique": sorted(counts),
+        "counts": counts,
+    }
+
+
+def summarize_v1(view: Any) -> Dict[str, Any]:
+    """GridWorldV1's summary of an array view: the sorted distinct non-blank tokens."""
+    seen = np.flatnonzero(np.bincount(view.ravel(), minlength=len(TOKENS))).tolist()
+    return {"unique": sorted(TOKENS[c] for c in seen if c != BLANK)}
+
+
+def loggable(obs: Dict[str, Any]) -> Dict[str, Any]:
+    """`obs` with an array view replaced by its token strings (JSON-serializable)."""
+    view = obs.get("view")
+    if np is None or not isinstance(view, np.ndarray):
+        return obs
+    out = {k: v for k, v in obs.items() if k != "agent_mark"}
+    out["view"] = decode_view(view, agent_mark=bool(obs.get("agent_mark")))
+    return out
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
-from typing import Dict, List, Tuple, Any
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Any
 import random
 
+from .codes import CODES, OUT_V0, check_obs_mode, code_grid, summarize_v0
+
 # Simple symbolic palette (kept tiny on purpose)
 COLORS = ["R", "G", "B", "Y"]  # red, green, blue, yellow
 SHAPES = ["o", "^", "s"]        # circle, triangle, square
@@ -13,6 +17,21 @@ ACTIONS: List[str] = ["noop", "up", "down", "left", "right", "ping"]
 EMPTY = "."
 
 
+@dataclass(frozen=True)
+class V0Snapshot:
+    """GridWorldV0 state from `snapshot()`. `step` never writes to the grid, so the grid (and
+    the code grid) is shared by reference rather than copied; chunked worlds keep only the seed."""
+
+    size: int
+    view_radius: int
+    chunk: int
+    seed: int
+    agent: Tuple[int, int]
+    grid: Optional[List[List[str]]]
+    codes: Optional[Any]
+    rng: Tuple[Any, ...]
+
+
 class GridWorldV0:
     """A tiny 2D world with colored shapes. No rewards; just structure to perceive.
 
@@ -20,23 +39,55 @@ class GridWorldV0:
     - The agent has a position. Observation is a (2r+1)x(2r+1) viewport around the agent.
     - `reset(seed)` re-samples a new world.
     - `step(action)` moves the agent (or emits a ping) and returns a structured observation.
+    - `obs_mode="array"` also keeps the world as a padded uint8 grid (soma.sandbox.codes); the
+      view is then a read-only slice of it (center = agent, `agent_mark=True` in the obs).
+    - `chunk=C` (large worlds) never allocates the full grid: C x C chunks are generated on
+      first view from (seed, chunk coords) at the same object density and kept in an LRU of
+      `max_chunks`; an evicted chunk regenerates identically when seen again. Layouts differ
+      from the dense mode (chunk=0), whose seeds reproduce as before.
     """
 
-    def __init__(self, size: int = 9, n_objects: int = 12, view_radius: int = 1):
+    def __init__(
+        self,
+        size: int = 9,
+        n_objects: int = 12,
+        view_radius: int = 1,
+        *,
+        obs_mode: str = "tokens",
+        chunk: int = 0,
+        max_chunks: int = 256,
+    ):
         if size % 2 == 0:
             raise ValueError("size must be odd so the agent can start in the center")
         self.size = size
         self.n_objects = max(0, min(n_objects, size * size - 1))
         self.r = view_radius
-        self._rng: random.Random
+        self.obs_mode = check_obs_mode(obs_mode)
+        self.chunk = max(0, int(chunk))
+        if self.chunk and self.obs_mode != "tokens":
+            raise ValueError("chunked worlds only support obs_mode='tokens'")
+        # never fewer chunks than one view can overlap, so a view cannot evict itself
+        span = (2 * view_radius) // self.chunk + 2 if self.chunk else 1
+        self.max_chunks = max(int(max_chunks), span * span)
+        self._rng = random.Random(0)
+        self._seed = 0
         self.grid: List[List[str]]
         self.agent: Tuple[int, int]
+        self._codes: Optional[Any] = None  # padded code grid (array mode)
+        self._chunks: "OrderedDict[Tuple[int, int], List[List[str]]]" = OrderedDict()
+        self.chunks_generated = 0
+        self.chunks_evicted = 0
 
     # ---------------------------- helpers ----------------------------
     def _in_bounds(self, x: int, y: int) -> bool:
         return 0 <= x < self.size and 0 <= y < self.size
 
     def _place_objects(self) -> None:
+        if self.chunk:
+            c = self.size // 2
+            self.agent = (c, c)
+            self._chunks.clear()
+            return
         # Fill with empty
         self.grid = [[EMPTY for _ in range(self.size)] for _ in range(self.size)]
         # Place the agent in the center to keep things simple
@@ -54,6 +105,77 @@ class GridWorldV0:
                     break
             token = f"{self._rng.choice(COLORS)}{self._rng.choice(SHAPES)}"
             self.grid[y][x] = token
+        if self.obs_mode == "array":
+            r = self.r
+            self._codes = code_grid((self.size + 2 * r, self.size + 2 * r), OUT_V0)
+            self._codes[r : r + self.size, r : r + self.size] = [[CODES[t] for t in row] for row in self.grid]
+
+    def _make_chunk(self, cx: int, cy: int) -> List[List[str]]:
+        """Chunk (cx, cy), a function of (seed, cx, cy) only: same density as the dense world."""
+        rng = random.Random(f"{self._seed}:{cx}:{cy}")  # str seeds hash stably (sha512)
+        C = self.chunk
+        x0, y0 = cx * C, cy * C
+        w, h = min(C, self.size - x0), min(C, self.size - y0)
+        rows = [[EMPTY] * w for _ in range(h)]
+        c = self.size // 2
+        start = (c - y0) * w + (c - x0) if 0 <= c - x0 < w and 0 <= c - y0 < h else -1
+        free = w * h - (start >= 0)
+        expect = free * self.n_objects / max(1, self.size * self.size - 1)
+        k = int(expect)
+        if rng.random() < expect - k:
+            k += 1
+        for i in rng.sample(range(free), min(k, free)):
+            if 0 <= start <= i:
+                i += 1  # skip the agent's start cell
+            rows[i // w][i % w] = f"{rng.choice(COLORS)}{rng.choice(SHAPES)}"
+        return rows
+
+    def _chunk_rows(self, cx: int, cy: int) -> List[List[str]]:
+        """Rows of chunk (cx, cy), generated on first use; least recently used evicted."""
+        key = (cx, cy)
+        rows = self._chunks.get(key)
+        if rows is None:
+            rows = self._chunks[key] = self._make_chunk(cx, cy)
+            self.chunks_generated += 1
+            if len(self._chunks) > self.max_chunks:
+                self._chunks.popitem(last=False)
+                self.chunks_evicted += 1
+        else:
+            self._chunks.move_to_end(key)
+        return rows
+
+    def _cell(self, x: int, y: int) -> str:
+        """Token at an in-bounds cell of a chunked world."""
+        C = self.chunk
+        return self._chunk_rows(x // C, y // C)[y % C][x % C]
+
+    def _view_chunked(self) -> List[List[str]]:
+        """`_view_tokens` of a chunked world, copying row slices out of each chunk."""
+        vx, vy = self.agent
+        r, C = self.r, self.chunk
+        lo, hi = max(0, vx - r), min(self.size - 1, vx + r)
+        left, right = [" "] * (lo - (vx - r)), [" "] * (vx + r - hi)
+        spans = [(cx, max(lo - cx * C, 0), min(hi - cx * C + 1, C)) for cx in range(lo // C, hi // C + 1)]
+        rows: List[List[str]] = []
+        for y in range(vy - r, vy + r + 1):
+            if not 0 <= y < self.size:
+                rows.append([" "] * (2 * r + 1))
+                continue
+            row = list(left)
+            for cx, a, b in spans:
+                row += self._chunk_rows(cx, y // C)[y % C][a:b]
+            row += right
+            rows.append(row)
+        rows[r][r] = "@"
+        return rows
+
+    def chunk_stats(self) -> Dict[str, int]:
+        return {
+            "chunk": self.chunk,
+            "loaded": len(self._chunks),
+            "generated": self.chunks_generated,
+            "evicted": self.chunks_evicted,
+        }
 
     def _view_tokens(self) -> List[List[str]]:
         vx, vy = self.agent
@@ -89,17 +211,27 @@ class GridWorldV0:
             "counts": counts,
         }
 
+    def _view_codes(self):
+        ax, ay = self.agent
+        n = 2 * self.r + 1
+        view = self._codes[ay : ay + n, ax : ax + n]
+        view.flags.writeable = False
+        return view
+
+    def _observe(self) -> Dict[str, Any]:
+        agent = {"x": self.agent[0], "y": self.agent[1]}
+        if self._codes is not None:
+            view = self._view_codes()
+            return {"agent": agent, "view": view, "summary": summarize_v0(view), "agent_mark": True}
+        view = self._view_chunked() if self.chunk else self._view_tokens()
+        return {"agent": agent, "view": view, "summary": self._summarize(view)}
+
     # ------------------------------ API ------------------------------
     def reset(self, seed: int) -> Dict[str, Any]:
+        self._seed = int(seed)
         self._rng = random.Random(int(seed))
         self._place_objects()
-        view = self._view_tokens()
-        summary = self._summarize(view)
-        return {
-            "agent": {"x": self.agent[0], "y": self.agent[1]},
-            "view": view,
-            "summary": summary,
-        }
+        return self._observe()
 
     def step(self, action: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         ax, ay = self.agent
@@ -125,18 +257,40 @@ class GridWorldV0:
             pinged = True
         # noop does nothing
 
-        view = self._view_tokens()
-        summary = self._summarize(view)
-        obs = {
-            "agent": {"x": self.agent[0], "y": self.agent[1]},
-            "view": view,
-            "summary": summary,
-        }
         info = {"moved": moved, "pinged": pinged}
-        return obs, info
+        return self._observe(), info
+
+    def snapshot(self) -> V0Snapshot:
+        """Immutable copy of the current state, cheap enough to take every tick."""
+        return V0Snapshot(
+            size=self.size,
+            view_radius=self.r,
+            chunk=self.chunk,
+            seed=self._seed,
+            agent=self.agent,
+            grid=None if self.chunk else self.grid,
+            codes=self._codes,
+            rng=self._rng.getstate(),
+        )
+
+    def restore(self, snap: V0Snapshot) -> Dict[str, Any]:
+        """Return to `snap` (from this env or one built with the same parameters); returns the observation."""
+        if (snap.size, snap.view_radius, snap.chunk) != (self.size, self.r, self.chunk):
+            raise ValueError("snapshot is from a world with a different size, view radius or chunk size")
+        if self.obs_mode == "array" and snap.codes is None:
+            raise ValueError("snapshot has no code grid (taken with obs_mode='tokens')")
+        if self.chunk and snap.seed != self._seed:
+            self._chunks.clear()
+        self._seed = snap.seed
+        self.agent = snap.agent
+        if not self.chunk:
+            self.grid = snap.grid
+            self._codes = snap.codes if self.obs_mode == "array" else None
+        self._rng.setstate(snap.rng)
+        return self._observe()
 
     def render_ascii(self) -> str:
-        """Full-grid ASCII render for debugging."""
+        """Full-grid ASCII render for debugging (generates every chunk of a chunked world)."""
         ax, ay = self.agent
         rows: List[str] = []
         for y in range(self.size):
@@ -145,6 +299,6 @@ class GridWorldV0:
                 if (x, y) == (ax, ay):
                     row.append("@")
                 else:
-                    row.append(self.grid[y][x])
+                    row.append(self._cell(x, y) if self.chunk else self.grid[y][x])
             rows.append(" ".join(row))
         return "\n".join(rows)
\ No newline at end of file
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional
 import random
 
+from ..codes import BLANK, CODES, check_obs_mode, code_grid, summarize_v1
+
 
 # Tokens used elsewhere in SOMA runs (color + shape)
 #   Colors: R,G,B,Y  | Shapes: ^ (tri), s (sq), o (circ)
@@ -31,6 +33,26 @@ class Obj:
         return f"{self.color}{self.shape}"
 
 
+@dataclass(frozen=True)
+class V1Snapshot:
+    """GridWorldV1 state from `snapshot()`, as immutable tuples (forks share it freely).
+
+    `layout` (oid, kind, x, y, shape per object, insertion order) never changes within an
+    episode and is built once per reset, so a snapshot only copies the per-object colors and
+    states that `step` mutates.
+    """
+
+    size: int
+    view_radius: int
+    tick: int
+    agent: Tuple[int, int]
+    rng: Tuple[Any, ...]
+    pads_seq: Tuple[Tuple[int, str], ...]
+    layout: Tuple[Tuple[str, str, int, int, str], ...]
+    colors: Tuple[str, ...]
+    states: Tuple[Tuple[Tuple[str, float], ...], ...]
+
+
 class GridWorldV1:
     """GridWorld v1.5 — persistent objects + simple causal puzzles.
 
@@ -39,20 +61,31 @@ class GridWorldV1:
       - Chameleon object: changes color when pinged nearby.
       - Door (blocks movement when closed) + pads (G then R within a time window opens the door), and a switch that toggles door.
       - Summary exposes tokens so planner/channel can notice contradictions & pattern completion opportunities.
+
+    `obs_mode="array"` also keeps a padded uint8 grid of the cell tokens (soma.sandbox.codes),
+    updated when an object's token changes; the view is then a read-only slice of it.
     """
 
     ACTIONS = ["up", "down", "left", "right", "noop", "ping"]
 
-    def __init__(self, size: int = 9, n_objects: int = 14, view_radius: int = 1):
+    def __init__(self, size: int = 9, n_objects: int = 14, view_radius: int = 1, *, obs_mode: str = "tokens"):
         self.size = int(size)
         self.view_radius = int(view_radius)
         self.n_objects = int(n_objects)
+        self.obs_mode = check_obs_mode(obs_mode)
+        self._codes: Optional[Any] = None  # padded code grid (array mode)
         self.rng = random.Random(0)
         self.tick = 0
         self.agent = {"x": 0, "y": 0}
         self.objects: Dict[str, Obj] = {}
+        # Lookup indexes over self.objects (kept in sync by _add_object / _reindex):
+        #   _cells: (x, y) -> objects at that cell, _by_kind: kind -> objects, _order: oid -> insertion rank
+        self._cells: Dict[Tuple[int, int], List[Obj]] = {}
+        self._by_kind: Dict[str, List[Obj]] = {}
+        self._order: Dict[str, int] = {}
         self._pads_window = 8      # ticks
         self._pads_seq: List[Tuple[int, str]] = []  # (tick, color)
+        self._layout: Optional[Tuple[Tuple[str, str, int, int, str], ...]] = None  # snapshot() cache
 
     # ---------------- core API ----------------
     def reset(self, seed: int) -> Dict:
@@ -60,6 +93,10 @@ class GridWorldV1:
         self.tick = 0
         self.agent = {"x": self.size // 2, "y": self.size // 2}
         self.objects = {}
+        if self.obs_mode == "array":
+            pad = self.size + 2 * self.view_radius
+            self._codes = code_grid((pad, pad), BLANK)
+        self._reindex()
         self._pads_seq.clear()
 
         # Place a door roughly mid-top; blocks movement when closed
@@ -68,27 +105,27 @@ class GridWorldV1:
             x=self.size // 2, y=max(1, self.size // 3 - 1),
             color="B", shape="s", state={"open": 0.0, "timer": 0}
         )
-        self.objects[door.oid] = door
+        self._add_object(door)
 
         # Two pads: G then R sequence opens door for a while
         pg = self._place_any("pad", color="G", shape="o")
         pr = self._place_any("pad", color="R", shape="o")
-        self.objects[pg.oid] = pg
-        self.objects[pr.oid] = pr
+        self._add_object(pg)
+        self._add_object(pr)
 
         # A switch near the agent toggles the door when pinged
         sw = self._place_any("switch", color="Y", shape="s")
-        self.objects[sw.oid] = sw
+        self._add_object(sw)
 
         # One chameleon (color cycle R->G->B->Y)
         ch = self._place_any("chameleon", color=self.rng.choice(["R","G","B","Y"]), shape=self.rng.choice(["^","s","o"]))
         ch.state["cycle"] = 1
-        self.objects[ch.oid] = ch
+        self._add_object(ch)
 
         # Distractors (static)
         for _ in range(max(0, self.n_objects - len(self.objects))):
             o = self._place_any("static", color=self.rng.choice(["R","G","B","Y"]), shape=self.rng.choice(["^","s","o"]))
-            self.objects[o.oid] = o
+            self._add_object(o)
 
         return self._observe()
 
@@ -138,6 +175,7 @@ class GridWorldV1:
             d.state["timer"] -= 1
             if d.state["timer"] <= 0:
                 d.state["open"] = 0.0
+                self._sync(d.x, d.y)
 
         # Occasional distractor drift (tiny, to spice scenes)
         self._distractor_drift()
@@ -145,6 +183,98 @@ class GridWorldV1:
         self.tick += 1
         return self._observe(), info
 
+    # ---------------- snapshots ----------------
+    def snapshot(self) -> V1Snapshot:
+        """Immutable copy of the current state (no deepcopy: only colors/states are per tick)."""
+        objs = self.objects.values()
+        if self._layout is None:
+            self._layout = tuple((o.oid, o.kind, o.x, o.y, o.shape) for o in objs)
+        return V1Snapshot(
+            size=self.size,
+            view_radius=self.view_radius,
+            tick=self.tick,
+            agent=(self.agent["x"], self.agent["y"]),
+            rng=self.rng.getstate(),
+            pads_seq=tuple(self._pads_seq),
+            layout=self._layout,
+            colors=tuple(o.color for o in objs),
+            states=tuple(tuple(o.state.items()) if o.state else () for o in objs),
+        )
+
+    def restore(self, snap: V1Snapshot) -> Dict:
+        """Return to `snap` (from this env or one built with the same parameters); returns the observation.
+
+        Within the episode the snapshot came from, objects are updated in place and only cells
+        whose token changed are re-synced; otherwise the objects and indexes are rebuilt.
+        """
+        if (snap.size, snap.view_radius) != (self.size, self.view_radius):
+            raise ValueError("snapshot is from a world with a different size or view radius")
+        self.tick = snap.tick
+        self.agent = {"x": snap.agent[0], "y": snap.agent[1]}
+        self.rng.setstate(snap.rng)
+        self._pads_seq = list(snap.pads_seq)
+        if snap.layout is self._layout:
+            for o, color, state in zip(self.objects.values(), snap.colors, snap.states):
+                if o.color != color or (state or o.state) and tuple(o.state.items()) != state:
+                    o.color = color
+                    o.state = dict(state)
+                    self._sync(o.x, o.y)
+        else:
+            self.objects = {
+                oid: Obj(oid=oid, kind=kind, x=x, y=y, color=color, shape=shape, state=dict(state))
+                for (oid, kind, x, y, shape), color, state in zip(snap.layout, snap.colors, snap.states)
+            }
+            if self.obs_mode == "array":
+                pad = self.size + 2 * self.view_radius
+                self._codes = code_grid((pad, pad), BLANK)
+            self._reindex()
+            self._layout = snap.layout
+        return self._observe()
+
+    # ---------------- indexes ----------------
+    def _add_object(self, o: Obj) -> None:
+        """Insert `o` into self.objects and every lookup index.
+
+        Re-using an oid replaces the old object in place (dict semantics: the key keeps its
+        original position), which happens for the two pads placed back to back in reset().
+        """
+        old = self.objects.get(o.oid)
+        self.objects[o.oid] = o
+        self._layout = None
+        if old is None:
+            self._order[o.oid] = len(self._order)
+            self._by_kind.setdefault(o.kind, []).append(o)
+        else:
+            cell = self._cells[(old.x, old.y)]
+            cell.remove(old)
+            if not cell:
+                del self._cells[(old.x, old.y)]
+            kind = self._by_kind[old.kind]
+            kind.remove(old)
+            self._by_kind.setdefault(o.kind, []).append(o)
+            self._by_kind[o.kind].sort(key=lambda k: self._order[k.oid])
+        cell = self._cells.setdefault((o.x, o.y), [])
+        cell.append(o)
+        if len(cell) > 1:
+            cell.sort(key=lambda k: self._order[k.oid])
+        if old is not None:
+            self._sync(old.x, old.y)
+        self._sync(o.x, o.y)
+
+    def _sync(self, x: int, y: int) -> None:
+        """Refresh the code of cell (x, y) after its objects or their tokens changed."""
+        if self._codes is not None:
+            r = self.view_radius
+            self._codes[y + r, x + r] = CODES[self._token_at(x, y)]
+
+    def _reindex(self) -> None:
+        """Rebuild the lookup indexes from self.objects (after replacing it wholesale)."""
+        objs = list(self.objects.values())
+        self._cells, self._by_kind, self._order = {}, {}, {}
+        self.objects = {}
+        for o in objs:
+            self._add_object(o)
+
     # ---------------- helpers ----------------
     def _place_any(self, kind: str, color: str, shape: str) -> Obj:
         while True:
@@ -155,9 +285,9 @@ class GridWorldV1:
                 continue
             if self._door_coords() == (x, y):
                 continue
-            if any((o.x, o.y) == (x, y) for o in self.objects.values()):
+            if (x, y) in self._cells:
                 continue
-            oid = f"{kind}{len([k for k in self.objects if k.startswith(kind)])}"
+            oid = f"{kind}{len(self._by_kind.get(kind, ()))}"
             return Obj(oid=oid, kind=kind, x=x, y=y, color=color, shape=shape, state={})
 
     def _door_coords(self) -> Tuple[int, int]:
@@ -165,9 +295,9 @@ class GridWorldV1:
         return (d.x, d.y)
 
     def _get_door(self) -> Obj:
-        for o in self.objects.values():
-            if o.kind == "door":
-                return o
+        doors = self._by_kind.get("door")
+        if doors:
+            return doors[0]
         # Should not happen
         raise RuntimeError("door not found")
 
@@ -175,6 +305,7 @@ class GridWorldV1:
         d = self._get_door()
         d.state["open"] = 1.0
         d.state["timer"] = int(max(d.state.get("timer", 0), ticks))
+        self._sync(d.x, d.y)
 
     def _is_blocked(self, x: int, y: int) -> bool:
         dx, dy = self._door_coords()
@@ -183,17 +314,20 @@ class GridWorldV1:
         return False
 
     def _pad_at(self, x: int, y: int) -> Optional[str]:
-        for o in self.objects.values():
-            if o.kind == "pad" and (o.x, o.y) == (x, y):
+        for o in self._cells.get((x, y), ()):
+            if o.kind == "pad":
                 return o.color
         return None
 
     def _nearby_objects(self, radius: int = 1) -> List[Obj]:
         ax, ay = self.agent["x"], self.agent["y"]
         out: List[Obj] = []
-        for o in self.objects.values():
-            if abs(o.x - ax) + abs(o.y - ay) <= radius:
-                out.append(o)
+        for dy in range(-radius, radius + 1):
+            span = radius - abs(dy)
+            for dx in range(-span, span + 1):
+                out.extend(self._cells.get((ax + dx, ay + dy), ()))
+        # same order as a scan over self.objects
+        out.sort(key=lambda o: self._order[o.oid])
         return out
 
     def _trim_pads_seq(self) -> None:
@@ -216,11 +350,12 @@ class GridWorldV1:
         order = ["R", "G", "B", "Y"]
         i = order.index(o.color)
         o.color = order[(i + int(o.state.get("cycle", 1))) % len(order)]
+        self._sync(o.x, o.y)
 
     def _distractor_drift(self) -> None:
         # Small random color flip on a random static to increase variety
         if self.rng.random() < 0.10:  # 10% per tick
-            stats = [o for o in self.objects.values() if o.kind == "static"]
+            stats = self._by_kind.get("static")
             if not stats:
                 return
             o = self.rng.choice(stats)
@@ -229,6 +364,11 @@ class GridWorldV1:
     # ---------------- observation ----------------
     def _observe(self) -> Dict:
         ax, ay = self.agent["x"], self.agent["y"]
+        if self._codes is not None:
+            n = 2 * self.view_radius + 1
+            codes = self._codes[ay : ay + n, ax : ax + n]
+            codes.flags.writeable = False
+            return {"agent": {"x": ax, "y": ay}, "view": codes, "summary": summarize_v1(codes), "agent_mark": False}
 
         # Build a local view grid (square) centered on agent with side 2*view_radius+1
         R = int(self.view_radius)
@@ -262,7 +402,5 @@ class GridWorldV1:
         # Out of bounds = blank
         if x < 0 or y < 0 or x >= self.size or y >= self.size:
             return ""
-        for o in self.objects.values():
-            if (o.x, o.y) == (x, y):
-                return o.token()
-        return ""
\ No newline at end of file
+        objs = self._cells.get((x, y))
+        return objs[0].token() if objs else ""
\ No newline at end of file
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+import random
+
+from soma.compat import np, require_numpy
+
+from .codes import CODES, COLORS, SHAPES, summarize_v0, summarize_v1
+from .gridworld import ACTIONS, GridWorldV0
+from .v1 import GridWorldV1
+
+ACTION_INDEX: Dict[str, int] = {a: i for i, a in enumerate(ACTIONS)}
+PING = ACTION_INDEX["ping"]
+
+_NEVER = -(2**62)  # "pad color never stepped on"
+_R, _G = COLORS.index("R"), COLORS.index("G")
+
+
+def _moves():
+    dx = [0] * len(ACTIONS)
+    dy = [0] * len(ACTIONS)
+    dx[ACTION_INDEX["left"]], dx[ACTION_INDEX["right"]] = -1, 1
+    dy[ACTION_INDEX["up"]], dy[ACTION_INDEX["down"]] = -1, 1
+    return np.array(dx, dtype=np.int64), np.array(dy, dtype=np.int64)
+
+
+class VecGridWorld:
+    """B grid worlds (v0 or v1) kept as stacked arrays and stepped with one call per tick.
+
+    Worlds are generated by the single env's own `reset` (so layouts match seed for seed)
+    and copied into a (B, P, P) padded code grid plus per-object state arrays; `step` then
+    applies the single env's rules to all worlds at once. v1's distractor drift draws from
+    one `random.Random` per world, in the same order as `GridWorldV1.step`, so every world
+    follows the trajectory of a `GridWorldV1` reset with the same seed.
+
+    Observations are batched: {"agent": (B, 2) x/y, "view": (B, n, n) uint8 codes}; `obs(b)`
+    and `info_dict(info, b)` give world b's observation and info exactly as the single env
+    (in `obs_mode="array"`) returns them. With `max_steps > 0` a world that reaches it is
+    reset in the same `step` (`info["done"]`), its k-th episode using seed `seeds[b] + k * B`.
+    """
+
+    def __init__(
+        self,
+        env_cls: Type[Any],
+        batch: int,
+        *,
+        size: int,
+        n_objects: int,
+        view_radius: int,
+        max_steps: int = 0,
+    ) -> None:
+        require_numpy("VecGridWorld")
+        if batch < 1:
+            raise ValueError("batch must be >= 1")
+        self.B = int(batch)
+        self.v1 = env_cls is GridWorldV1
+        self._gen = env_cls(size=size, n_objects=n_objects, view_radius=view_radius, obs_mode="array")
+        self.size = int(size)
+        self.r = int(view_radius)
+        self.max_steps = max(0, int(max_steps))
+        pad = self.size + 2 * self.r
+        B = self.B
+        self.grids = np.zeros((B, pad, pad), dtype=np.uint8)
+        self.pos = np.zeros((B, 2), dtype=np.int64)
+        self.tick = np.zeros(B, dtype=np.int64)
+        self.seeds = np.zeros(B, dtype=np.int64)
+        self.episodes = np.zeros(B, dtype=np.int64)
+        self._rows = np.arange(B)
+        self._dx, self._dy = _moves()
+        off = np.arange(2 * self.r + 1)
+        self._off_y, self._off_x = off[None, :, None], off[None, None, :]
+        if self.v1:
+            self._init_v1()
+
+    # ---------------- v1 state ----------------
+    def _init_v1(self) -> None:
+        B = self.B
+        self.rngs: List[random.Random] = [random.Random(0) for _ in range(B)]
+        self.door_xy = np.zeros((B, 2), dtype=np.int64)
+        self.door_open = np.zeros(B, dtype=bool)
+        self.door_timer = np.zeros(B, dtype=np.int64)
+        self.pad_xy = np.zeros((B, 2, 2), dtype=np.int64)  # reset() places at most two pads
+        self.pad_color = np.full((B, 2), -1, dtype=np.int64)
+        self.pad_seen = np.full((B, len(COLORS)), _NEVER, dtype=np.int64)  # last tick on each pad color
+        self.sw_xy = np.zeros((B, 2), dtype=np.int64)
+        self.ch_xy = np.zeros((B, 2), dtype=np.int64)
+        self.ch_color = np.zeros(B, dtype=np.int64)
+        self.ch_shape = np.zeros(B, dtype=np.int64)
+        self.ch_cycle = np.ones(B, dtype=np.int64)
+        self.st_xy: Optional[Any] = None  # (B, S, 2), sized by the first reset
+        self.st_color: Optional[Any] = None
+        self.st_shape: Optional[Any] = None
+        self._oids: List[Tuple[str, str]] = [("switch0", "chameleon0")] * B
+        self._cs = np.array([[CODES[c + s] for s in SHAPES] for c in COLORS], dtype=np.uint8)
+        self._door_codes = np.array([CODES["DoorC"], CODES["DoorO"]], dtype=np.uint8)
+
+    def _load_v1(self, b: int, env: GridWorldV1) -> None:
+        kinds = env._by_kind
+        door, sw, ch = kinds["door"][0], kinds["switch"][0], kinds["chameleon"][0]
+        statics = kinds.get("static", [])
+        if self.st_xy is None:
+            S = len(statics)
+            self.st_xy = np.zeros((self.B, S, 2), dtype=np.int64)
+            self.st_color = np.zeros((self.B, S), dtype=np.int64)
+            self.st_shape = np.zeros((self.B, S), dtype=np.int64)
+        if len(statics) != self.st_xy.shape[1]:
+            raise RuntimeError("worlds of one batch must have the same number of distractors")
+        self.rngs[b] = env.rng  # the world's drift stream continues from here
+        self.door_xy[b] = (door.x, door.y)
+        self.door_open[b] = door.state.get("open", 0.0) >= 1.0
+        self.door_timer[b] = int(door.state.get("timer", 0))
+        self.pad_color[b] = -1
+        for i, p in enumerate(kinds.get("pad", [])):
+            self.pad_xy[b, i] = (p.x, p.y)
+            self.pad_color[b, i] = COLORS.index(p.color)
+        self.pad_seen[b] = _NEVER
+        self.sw_xy[b] = (sw.x, sw.y)
+        self.ch_xy[b] = (ch.x, ch.y)
+        self.ch_color[b] = COLORS.index(ch.color)
+        self.ch_shape[b] = SHAPES.index(ch.shape)
+        self.ch_cycle[b] = int(ch.state.get("cycle", 1))
+        for i, o in enumerate(statics):
+            self.st_xy[b, i] = (o.x, o.y)
+            self.st_color[b, i] = COLORS.index(o.color)
+            self.st_shape[b, i] = SHAPES.index(o.shape)
+        self._oids[b] = (sw.oid, ch.oid)
+
+    # ---------------- API ----------------
+    def _reset_world(self, b: int, seed: int) -> None:
+        env = self._gen
+        env.reset(seed)
+        self.grids[b] = env._codes
+        if self.v1:
+            self.pos[b] = (env.agent["x"], env.agent["y"])
+            self._load_v1(b, env)
+        else:
+            self.pos[b] = env.agent
+        self.tick[b] = 0
+
+    def reset(self, seeds: Sequence[int]) -> Dict[str, Any]:
+        if len(seeds) != self.B:
+            raise ValueError(f"expected {self.B} seeds, got {len(seeds)}")
+        self.seeds[:] = [int(s) for s in seeds]
+        self.episodes[:] = 0
+        for b, seed in enumerate(self.seeds.tolist()):
+            self._reset_world(b, seed)
+        return self._observe()
+
+    def _actions(self, actions: Any):
+        if isinstance(actions, np.ndarray) and actions.dtype.kind in "iu":
+            a = actions.astype(np.int64, copy=False)
+        else:
+            # unknown actions are no-ops, as in the single envs
+            a = np.fromiter((ACTION_INDEX.get(str(x), 0) for x in actions), dtype=np.int64, count=len(actions))
+        if a.shape != (self.B,):
+            raise ValueError(f"expected {self.B} actions, got shape {a.shape}")
+        return a
+
+    def step(self, actions: Any) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Advance every world by one action (names or indexes into ACTIONS)."""
+        a = self._actions(actions)
+        x, y = self.pos[:, 0], self.pos[:, 1]
+        hi = self.size - 1
+        nx = np.clip(x + self._dx[a], 0, hi)
+        ny = np.clip(y + self._dy[a], 0, hi)
+        ping = a == PING
+        if self.v1:
+            info = self._step_v1(nx, ny, ping)
+        else:
+            info = {"moved": (nx != x) | (ny != y), "pinged": ping}
+            self.pos[:, 0], self.pos[:, 1] = nx, ny
+        self.tick += 1
+        done = self.tick >= self.max_steps if self.max_steps else np.zeros(self.B, dtype=bool)
+        for b in np.flatnonzero(done).tolist():
+            self.episodes[b] += 1
+            self._reset_world(b, int(self.seeds[b] + self.episodes[b] * self.B))
+        info["done"] = done
+        return self._observe(), info
+
+    def _step_v1(self, nx, ny, ping) -> Dict[str, Any]:
+        rows, r, tick = self._rows, self.r, self.tick
+        dx, dy = self.door_xy[:, 0], self.door_xy[:, 1]
+
+        # Movement, blocked by a closed door
+        stay = (nx == dx) & (ny == dy) & ~self.door_open
+        x = np.where(stay, self.pos[:, 0], nx)
+        y = np.where(stay, self.pos[:, 1], ny)
+        self.pos[:, 0], self.pos[:, 1] = x, y
+
+        # Pads: the sequence opens the door when the last two distinct colors inside the
+        # window are G then R, i.e. standing on R with G the latest other color seen
+        pads_open = np.zeros(self.B, dtype=bool)
+        on = (self.pad_xy[:, :, 0] == x[:, None]) & (self.pad_xy[:, :, 1] == y[:, None]) & (self.pad_color >= 0)
+        hit = np.flatnonzero(on.any(axis=1))
+        if hit.size:
+            c = self.pad_color[hit, on[hit].argmax(axis=1)]
+            self.pad_seen[hit, c] = tick[hit]
+            other = self.pad_seen[hit]
+            other[:, _R] = _NEVER
+            last = other.argmax(axis=1)
+            ok = (c == _R) & (last == _G) & (other[np.arange(hit.size), last] >= tick[hit] - self._gen._pads_window)
+            pads_open[hit[ok]] = True
+            self.door_open |= pads_open
+            self.door_timer[pads_open] = np.maximum(self.door_timer[pads_open], 12)
+
+        # Ping: switch opens the door, chameleon advances its color (radius 1 Manhattan)
+        sw = ping & (np.abs(self.sw_xy[:, 0] - x) + np.abs(self.sw_xy[:, 1] - y) <= 1)
+        self.door_open |= sw
+        self.door_timer[sw] = np.maximum(self.door_timer[sw], 8)
+        ch = ping & (np.abs(self.ch_xy[:, 0] - x) + np.abs(self.ch_xy[:, 1] - y) <= 1)
+        self.ch_color[ch] = (self.ch_color[ch] + self.ch_cycle[ch]) % len(COLORS)
+
+        # Door timer ticks down
+        running = self.door_timer > 0
+        self.door_timer[running] -= 1
+        self.door_open[running & (self.door_timer <= 0)] = False
+
+        # Distractor drift from each world's own stream
+        S = self.st_xy.shape[1]
+        draws = np.array([rng.random() for rng in self.rngs])
+        for b in np.flatnonzero(draws < 0.10).tolist() if S else ():
+            i = self.rngs[b].choice(range(S))
+            k = self.st_color[b, i] = (self.st_color[b, i] + 1) % len(COLORS)
+            sx, sy = self.st_xy[b, i]
+            self.grids[b, sy + r, sx + r] = self._cs[k, self.st_shape[b, i]]
+
+        self.grids[rows, dy + r, dx + r] = self._door_codes[self.door_open.astype(np.int64)]
+        self.grids[rows, self.ch_xy[:, 1] + r, self.ch_xy[:, 0] + r] = self._cs[self.ch_color, self.ch_shape]
+        return {
+            "pads_open": pads_open,
+            "switch_toggle": sw,
+            "chameleon_flip": ch,
+            "chameleon_color": self.ch_color.copy(),
+            "at": tick.copy(),
+        }
+
+    # ---------------- observation ----------------
+    def _observe(self) -> Dict[str, Any]:
+        x, y = self.pos[:, 0], self.pos[:, 1]
+        view = self.grids[self._rows[:, None, None], y[:, None, None] + self._off_y, x[:, None, None] + self._off_x]
+        return {"agent": self.pos.copy(), "view": view}
+
+    def obs(self, b: int) -> Dict[str, Any]:
+        """World b's current observation, as the single env returns it in array mode."""
+        x, y = self.pos[b].tolist()
+        n = 2 * self.r + 1
+        view = self.grids[b, y : y + n, x : x + n]
+        view.flags.writeable = False
+        if self.v1:
+            return {"agent": {"x": x, "y": y}, "view": view, "summary": summarize_v1(view), "agent_mark": False}
+        return {"agent": {"x": x, "y": y}, "view": view, "summary": summarize_v0(view), "agent_mark": True}
+
+    def info_dict(self, info: Dict[str, Any], b: int) -> Dict[str, Any]:
+        """World b's entry of a batched `step` info, in the single env's format."""
+        if not self.v1:
+            return {"moved": bool(info["moved"][b]), "pinged": bool(info["pinged"][b])}
+        out: List[Dict[str, Any]] = []
+        if info["pads_open"][b]:
+            out.append({"kind": "pads_open", "at": int(info["at"][b])})
+        sw_oid, ch_oid = self._oids[b]
+        if info["switch_toggle"][b]:
+            out.append({"kind": "switch_toggle", "oid": sw_oid})
+        if info["chameleon_flip"][b]:
+            out.append({"kind": "chameleon_flip", "oid": ch_oid, "color": COLORS[int(info["chameleon_color"][b])]})
+        return {"interactions": out}
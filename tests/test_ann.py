@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import random
+import unittest
+
+from soma.cogs.memory.ann import LSHIndex
+from soma.cogs.memory.memory import MemorySystem
+
+
+class TestLSHRecall(unittest.TestCase):
+    def _vec(self, rng: random.Random):
+        return [rng.random() if rng.random() < 0.4 else 0.0 for _ in range(16)]
+
+    def test_single_bit_table_is_exact(self):
+        # one bit + one flip probe visits every bucket, so results must equal the exact scan
+        rng = random.Random(3)
+        mem = MemorySystem(dim=16, max_items=30, index=LSHIndex(16, n_tables=1, n_bits=1, probes=1))
+        for t in range(60):
+            v = self._vec(rng)
+            self.assertEqual(mem.query(v, top_k=4, min_score=0.3), mem.query(v, top_k=4, min_score=0.3, exact=True))
+            mem.add_vector(tick=t, vector=v)
+
+    def test_eviction_removes_ids(self):
+        rng = random.Random(5)
+        idx = LSHIndex(16, n_tables=3, n_bits=6)
+        mem = MemorySystem(dim=16, max_items=10, index=idx)
+        vecs = [self._vec(rng) for _ in range(25)]
+        for t, v in enumerate(vecs):
+            mem.add_vector(tick=t, vector=v)
+        self.assertEqual(len(idx), 10)
+        self.assertEqual(mem.query(vecs[0], top_k=5, min_score=0.999, probes=6), [])
+        self.assertEqual(mem.query(vecs[-1], top_k=1, min_score=0.999)[0][0], 24)
+
+
+if __name__ == "__main__":
+    unittest.main()
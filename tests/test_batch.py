@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from soma.compat import np
+
+
+def _events(run_dir: Path):
+    out = []
+    with (run_dir / "events.jsonl").open("r", encoding="utf-8") as f:
+        for line in f:
+            e = json.loads(line)
+            if isinstance(e.get("state"), dict):
+                e["state"].pop("timestamp", None)  # wall clock
+            out.append(e)
+    return out
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestBatchRunner(unittest.TestCase):
+    def test_matches_separate_run_loops(self):
+        from soma.core.batch import run_batch
+        from soma.core.tick import run_loop
+
+        seeds = [11, 12, 13]
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            dirs = [root / f"batch_{s}" for s in seeds]
+            for d in dirs:
+                d.mkdir()
+            run_batch(ticks=60, seeds=seeds, run_dirs=dirs, run_ids=[f"r{s}" for s in seeds], env_name="grid-v1", n_objects=16)
+            for s, d in zip(seeds, dirs):
+                single = root / f"single_{s}"
+                single.mkdir()
+                run_loop(ticks=60, seed=s, run_dir=single, run_id=f"r{s}", env_name="grid-v1", n_objects=16, memory_backend="numpy")
+                self.assertEqual(_events(single), _events(d))
+
+    def test_setup_failure_closes_opened_sinks(self):
+        from soma.core.batch import run_batch
+        from soma.core.catalog import find_runs
+        from soma.core.sinks import EventSinks
+
+        seeds = [1, 2]
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            dirs = [root / f"r{s}" for s in seeds]
+            for d in dirs:
+                d.mkdir()
+            with mock.patch("soma.core.batch.StalenessBatch", side_effect=RuntimeError("boom")), mock.patch.object(
+                EventSinks, "close", autospec=True, side_effect=EventSinks.close
+            ) as close:
+                with self.assertRaises(RuntimeError):
+                    run_batch(ticks=5, seeds=seeds, run_dirs=dirs, run_ids=[d.name for d in dirs], catalog=root)
+            self.assertEqual(close.call_count, 2)
+            self.assertEqual([r["status"] for r in find_runs(root)], ["failed", "failed"])
+
+
+class TestBatchCli(unittest.TestCase):
+    def test_unsupported_options_rejected(self):
+        from typer.testing import CliRunner
+
+        from scripts.run import app
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for extra in (["--sinks", "jsonl"], ["--warehouse", str(Path(tmp) / "wh.sqlite")], ["--memory-backend", "sparse"]):
+                res = CliRunner().invoke(app, ["--batch", "2", "--ticks", "2", "--runs-dir", tmp, *extra])
+                self.assertNotEqual(res.exit_code, 0, extra)
+                self.assertIn(extra[0], res.output)
+            self.assertEqual(list(Path(tmp).iterdir()), [])  # nothing was started
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from soma.core.binlog import BinaryEventLog, BinaryEventReader, binary_to_jsonl, jsonl_to_binary
+from soma.core.tick import run_loop
+
+
+class TestBinaryEventLog(unittest.TestCase):
+    def test_jsonl_round_trip_is_byte_identical(self):
+        with tempfile.TemporaryDirectory() as d:
+            run = Path(d)
+            run_loop(ticks=40, seed=2, run_dir=run, run_id="b", env_name="grid-v1", size=7, n_objects=8, quiet=True)
+            n = jsonl_to_binary(run / "events.jsonl", run / "events.bin")
+            self.assertEqual(binary_to_jsonl(run / "events.bin", run / "back.jsonl"), n)
+            self.assertEqual((run / "back.jsonl").read_bytes(), (run / "events.jsonl").read_bytes())
+            self.assertLess((run / "events.bin").stat().st_size, (run / "events.jsonl").stat().st_size / 2)
+
+            at = BinaryEventReader(run / "events.bin").events_at(17)
+            self.assertEqual([e["tick"] for e in at if e["type"] == "tick"], [17])
+
+    def test_append_and_torn_tail(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = Path(d) / "events.bin"
+            log = BinaryEventLog(path)
+            log.write({"type": "note", "kind": "startup", "payload": {"x": -3, "y": 1.5, "ok": True}})
+            log.write({"type": "tick", "tick": 0, "v": [None, "a" * 40]})
+            log.close()
+            log = BinaryEventLog(path)  # reopen: keys and index continue
+            log.write({"type": "tick", "tick": 1, "v": {"2": "é"}})
+            log.close()
+            with path.open("ab") as f:
+                f.write(b"\x7f\x02")  # torn record header + partial body
+            events = list(BinaryEventReader(path))
+            self.assertEqual(len(events), 3)
+            self.assertEqual(events[0]["payload"], {"x": -3, "y": 1.5, "ok": True})
+            self.assertEqual(BinaryEventReader(path).events_at(1), [{"type": "tick", "tick": 1, "v": {"2": "é"}}])
+            self.assertEqual(BinaryEventReader(path).events_at(5), [])
+
+    def test_reopen_after_crash_drops_the_torn_tail(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = Path(d) / "events.bin"
+            log = BinaryEventLog(path)
+            for t in range(3):
+                log.write({"type": "tick", "tick": t, "v": t})
+            log.close()
+            good = path.stat().st_size
+            # crash mid-tick 3: index entry and a new key written, record only half
+            log = BinaryEventLog(path)
+            log.write({"type": "tick", "tick": 3, "v": "fresh"})
+            log.close()
+            with path.open("r+b") as f:
+                f.truncate(path.stat().st_size - 2)
+            with Path(str(path) + ".keys").open("a", encoding="utf-8") as f:
+                f.write('"half')
+
+            log = BinaryEventLog(path)
+            self.assertEqual(path.stat().st_size, good)
+            log.write({"type": "tick", "tick": 3, "v": "again"})
+            log.write({"type": "tick", "tick": 4, "v": "fresh"})
+            log.close()
+            reader = BinaryEventReader(path)
+            self.assertEqual([e["v"] for e in reader], [0, 1, 2, "again", "fresh"])
+            self.assertEqual(reader.index_ticks, [0, 1, 2, 3, 4])
+            self.assertEqual(reader.events_at(3), [{"type": "tick", "tick": 3, "v": "again"}])
+            self.assertNotIn("half", reader.strings)
+
+
+if __name__ == "__main__":
+    unittest.main()
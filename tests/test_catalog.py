@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from soma.core.catalog import catalog_path, find_runs, resolve_run
+from soma.core.store import EventStore
+from soma.core.tick import run_loop
+from soma.core.writer import WriterError
+
+
+def _old_run(runs: Path, run_id: str, created_at: str, seed: int) -> Path:
+    d = runs / run_id
+    d.mkdir(parents=True)
+    meta = {"run_id": run_id, "created_at": created_at, "seed": seed, "ticks": 5, "env": {"name": "grid-v1", "size": 9}}
+    (d / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+    return d
+
+
+class TestRunCatalog(unittest.TestCase):
+    def test_register_filter_and_resolve(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            runs = Path(tmp) / "runs"
+            old = _old_run(runs, "old", "2020-01-02T00:00:00+00:00", 9)
+            self.assertEqual(resolve_run(runs, "last"), old)  # no catalog yet: built by scanning once
+            catalog_path(runs).unlink()
+            for seed in (1, 2, 3):
+                d = runs / "sweep" / f"cell{seed}"
+                d.mkdir(parents=True)
+                run_loop(ticks=5, seed=seed, run_dir=d, run_id=f"cell{seed}", quiet=True, catalog=runs)
+            rows = find_runs(runs)
+            self.assertEqual([r["run_id"] for r in rows], ["cell3", "cell2", "cell1", "old"])
+            self.assertEqual({r["run_id"]: r["status"] for r in rows}["cell2"], "done")
+            self.assertEqual({r["run_id"]: r["status"] for r in rows}["old"], "unknown")  # pre-catalog run
+            self.assertEqual(resolve_run(runs, "last"), runs / "sweep" / "cell3")
+            self.assertEqual(resolve_run(runs, "cell1"), runs / "sweep" / "cell1")
+            self.assertEqual([r["run_id"] for r in find_runs(runs, env="grid-v0", seed_min=2, seed_max=3)], ["cell3", "cell2"])
+            self.assertEqual([r["run_id"] for r in find_runs(runs, until="2021-01-01")], ["old"])
+            with self.assertRaises(FileNotFoundError):
+                resolve_run(runs, "nope")
+
+    def test_failed_run_is_marked(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            runs = Path(tmp) / "runs"
+            d = runs / "bad"
+            d.mkdir(parents=True)
+            with mock.patch("soma.core.tick.extract_features", side_effect=RuntimeError("boom")):
+                with self.assertRaises(RuntimeError):
+                    run_loop(ticks=5, seed=0, run_dir=d, run_id="bad", quiet=True, catalog=runs)
+            self.assertEqual(find_runs(runs)[0]["status"], "failed")
+
+    def test_failed_writer_still_finishes_the_run(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            runs = Path(tmp) / "runs"
+            d = runs / "bad"
+            d.mkdir(parents=True)
+            real_close = EventStore.close
+            with mock.patch.object(EventStore, "write_encoded", side_effect=OSError("disk full")), mock.patch.object(
+                EventStore, "close", autospec=True, side_effect=real_close
+            ) as close:
+                with self.assertRaises(WriterError):
+                    run_loop(ticks=5, seed=0, run_dir=d, run_id="bad", quiet=True, catalog=runs, async_io=True, profile=True)
+            self.assertEqual(find_runs(runs)[0]["status"], "failed")
+            self.assertTrue((d / "profile.json").exists())
+            self.assertEqual(close.call_count, 1)  # closed on the tick thread: the writer dropped it
+            self.assertFalse([t for t in threading.enumerate() if t.name == "soma-writer"])
+
+    def test_sink_close_error_marks_run_failed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            runs = Path(tmp) / "runs"
+            d = runs / "bad"
+            d.mkdir(parents=True)
+            with mock.patch.object(EventStore, "checkpoint", side_effect=sqlite3.OperationalError("disk I/O error")):
+                with self.assertRaises(sqlite3.OperationalError):
+                    run_loop(ticks=5, seed=0, run_dir=d, run_id="bad", quiet=True, catalog=runs, profile=True)
+            self.assertEqual(find_runs(runs)[0]["status"], "failed")
+            self.assertTrue((d / "profile.json").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
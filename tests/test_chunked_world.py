@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from soma.sandbox import GridWorldV0, make_env
+
+
+def _walk(env, seed, steps):
+    rng = random.Random(seed)
+    out = [env.reset(seed)]
+    for _ in range(steps):
+        out.append(env.step(rng.choice(["up", "down", "left", "right", "noop", "ping"]))[0])
+    return out
+
+
+class TestChunkedWorld(unittest.TestCase):
+    def test_eviction_does_not_change_the_world(self):
+        big = GridWorldV0(size=301, n_objects=20_000, view_radius=3, chunk=8, max_chunks=10_000)
+        small = GridWorldV0(size=301, n_objects=20_000, view_radius=3, chunk=8, max_chunks=4)
+        walk = _walk(big, 5, 600)
+        self.assertEqual(walk, _walk(small, 5, 600))
+        for obs in walk[::7]:  # row-slice views == cell-by-cell lookups
+            ax, ay = obs["agent"]["x"], obs["agent"]["y"]
+            ref = [
+                ["@" if (x, y) == (ax, ay) else big._cell(x, y) if big._in_bounds(x, y) else " " for x in range(ax - 3, ax + 4)]
+                for y in range(ay - 3, ay + 4)
+            ]
+            self.assertEqual(obs["view"], ref)
+        self.assertLessEqual(small.chunk_stats()["loaded"], small.max_chunks)
+        self.assertGreater(small.chunk_stats()["evicted"], 0)
+        self.assertEqual(big.chunk_stats()["evicted"], 0)
+
+    def test_chunks_depend_on_seed_and_coords_only(self):
+        a = GridWorldV0(size=41, n_objects=300, chunk=16)
+        b = GridWorldV0(size=41, n_objects=300, chunk=16)
+        a.reset(3)
+        b.reset(3)
+        a._cell(40, 40)  # load chunks in different orders
+        self.assertEqual(a.render_ascii(), b.render_ascii())
+        b.reset(4)
+        self.assertNotEqual(a.render_ascii(), b.render_ascii())
+
+    def test_density_and_start_cell(self):
+        env = GridWorldV0(size=201, n_objects=8_000, chunk=25)
+        env.reset(0)
+        cells = env.render_ascii().split("\n")
+        self.assertEqual(cells[100].split(" ")[100], "@")
+        n = sum(t != "." for row in cells for t in row.split(" ")) - 1
+        self.assertAlmostEqual(n / 8_000, 1.0, delta=0.03)
+        self.assertEqual(env.chunk_stats()["generated"], 81)
+
+    def test_large_world_memory_follows_explored_area(self):
+        env = make_env("grid-v0", size=1_000_001, n_objects=10**9, view_radius=2, chunk=64)
+        obs = _walk(env, 1, 200)[-1]
+        self.assertEqual(len(obs["view"]), 5)
+        self.assertLessEqual(env.chunk_stats()["loaded"], 9)
+
+    def test_dense_mode_unchanged(self):
+        # chunk=0 keeps the original generator: same layout as before the chunked mode existed
+        env = GridWorldV0(size=9, n_objects=18)
+        env.reset(123)
+        rng = random.Random(123)
+        used = {(4, 4)}
+        for _ in range(18):
+            while True:
+                x, y = rng.randrange(9), rng.randrange(9)
+                if (x, y) not in used:
+                    used.add((x, y))
+                    break
+            self.assertEqual(env.grid[y][x], rng.choice(["R", "G", "B", "Y"]) + rng.choice(["o", "^", "s"]))
+
+    def test_rejects_unsupported_modes(self):
+        with self.assertRaises(ValueError):
+            make_env("grid-v1", size=9, n_objects=10, view_radius=1, chunk=8)
+        with self.assertRaises(ValueError):
+            GridWorldV0(size=9, chunk=8, obs_mode="array")
+
+    def test_cli_rejects_chunk_with_batch(self):
+        from typer.testing import CliRunner
+
+        from scripts.run import app
+
+        with tempfile.TemporaryDirectory() as tmp:
+            args = ["--size", "20001", "--chunk", "64", "--batch", "4", "--ticks", "2", "--runs-dir", tmp]
+            res = CliRunner().invoke(app, args)
+            self.assertNotEqual(res.exit_code, 0)
+            self.assertIn("--chunk", res.output)
+            self.assertEqual(list(Path(tmp).iterdir()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
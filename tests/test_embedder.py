@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import random
+import unittest
+
+from soma.cogs.perception.embedder import COLORS, SHAPES, PerceptionEmbedderV2
+from soma.cogs.perception.features import extract_features
+from soma.compat import np
+from soma.sandbox import make_env
+
+
+def _reference(features, dim=64):
+    """The embedder before slot memoization and buffers."""
+    v = [0.0] * dim
+    for tok, c in features.get("counts", {}).items():
+        h = hashlib.blake2b(str(tok).encode("utf-8"), digest_size=8).digest()
+        v[int.from_bytes(h, "little") % dim] += float(c)
+    d, c, s = features.get("dir", {}), features.get("color", {}), features.get("shape", {})
+    f = [float(features.get(k, 0.0)) for k in ("density", "diversity", "entropy", "center_prox")]
+    f += [float(d.get(k, 0.0)) for k in ("up", "down", "left", "right")]
+    f += [float(c.get(k, 0.0)) for k in COLORS] + [float(s.get(k, 0.0)) for k in SHAPES]
+    for i, val in enumerate(f):
+        v[i] += 0.8 * val
+    n = math.sqrt(sum(x * x for x in v))
+    return [x / n for x in v] if n > 0 else v
+
+
+def _walk_features(env_name: str, n: int, seed: int):
+    rng = random.Random(seed)
+    env = make_env(env_name, size=15, n_objects=40, view_radius=2)
+    obs = env.reset(seed)
+    out = []
+    for _ in range(n):
+        out.append(extract_features(obs, grid_size=15))
+        obs, _ = env.step(rng.choice(["up", "down", "left", "right", "ping"]))
+    return out
+
+
+class TestEmbedderV2(unittest.TestCase):
+    def test_bit_identical_to_reference(self):
+        emb = PerceptionEmbedderV2(dim=64)
+        buf = [0.0] * 64
+        feats = _walk_features("grid-v0", 150, 1) + _walk_features("grid-v1", 150, 2) + [{}]
+        for f in feats:
+            ref = _reference(f)
+            self.assertEqual(emb.embed(f), ref)
+            self.assertEqual(emb.embed(f, out=buf), ref)
+        self.assertEqual(emb.embed_many(feats), [_reference(f) for f in feats])
+        self.assertTrue(emb._slots)
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_embed_many_into_array(self):
+        emb = PerceptionEmbedderV2(dim=64)
+        feats = _walk_features("grid-v1", 64, 3)
+        out = np.full((8, 64), np.nan)
+        for i in range(0, len(feats), 8):
+            rows = emb.embed_many(feats[i : i + 8], out=out)
+            self.assertIs(rows.base, out)
+            for b, f in enumerate(feats[i : i + 8]):
+                self.assertEqual(rows[b].tolist(), _reference(f))
+        one = np.zeros(64)
+        emb.embed(feats[0], out=one)
+        self.assertEqual(one.tolist(), _reference(feats[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import random
+import unittest
+from typing import List, Optional
+
+from soma.sandbox.v1.env import GridWorldV1, Obj
+
+
+class _LinearV1(GridWorldV1):
+    """Reference: the original linear scans over self.objects."""
+
+    def _place_any(self, kind: str, color: str, shape: str) -> Obj:
+        while True:
+            x = self.rng.randrange(self.size)
+            y = self.rng.randrange(self.size)
+            if (x, y) == (self.agent["x"], self.agent["y"]):
+                continue
+            if self._door_coords() == (x, y):
+                continue
+            if any((o.x, o.y) == (x, y) for o in self.objects.values()):
+                continue
+            oid = f"{kind}{len([k for k in self.objects if k.startswith(kind)])}"
+            return Obj(oid=oid, kind=kind, x=x, y=y, color=color, shape=shape, state={})
+
+    def _get_door(self) -> Obj:
+        for o in self.objects.values():
+            if o.kind == "door":
+                return o
+        raise RuntimeError("door not found")
+
+    def _pad_at(self, x: int, y: int) -> Optional[str]:
+        for o in self.objects.values():
+            if o.kind == "pad" and (o.x, o.y) == (x, y):
+                return o.color
+        return None
+
+    def _nearby_objects(self, radius: int = 1) -> List[Obj]:
+        ax, ay = self.agent["x"], self.agent["y"]
+        return [o for o in self.objects.values() if abs(o.x - ax) + abs(o.y - ay) <= radius]
+
+    def _distractor_drift(self) -> None:
+        if self.rng.random() < 0.10:
+            stats = [o for o in self.objects.values() if o.kind == "static"]
+            if not stats:
+                return
+            self._advance_color(self.rng.choice(stats))
+
+    def _token_at(self, x: int, y: int) -> str:
+        if x < 0 or y < 0 or x >= self.size or y >= self.size:
+            return ""
+        for o in self.objects.values():
+            if (o.x, o.y) == (x, y):
+                return o.token()
+        return ""
+
+
+class TestGridWorldV1Index(unittest.TestCase):
+    def test_matches_linear_reference(self):
+        for size, n_objects, radius in [(3, 4, 1), (9, 14, 1), (9, 40, 2), (15, 100, 3)]:
+            for seed in range(5):
+                fast = GridWorldV1(size=size, n_objects=n_objects, view_radius=radius)
+                ref = _LinearV1(size=size, n_objects=n_objects, view_radius=radius)
+                self.assertEqual(fast.reset(seed), ref.reset(seed))
+                actions = random.Random(seed)
+                for _ in range(200):
+                    # ping-heavy so switch/chameleon interactions are exercised
+                    a = actions.choice(GridWorldV1.ACTIONS + ["ping"] * 3)
+                    self.assertEqual(fast.step(a), ref.step(a), (size, n_objects, radius, seed))
+
+
+if __name__ == "__main__":
+    unittest.main()
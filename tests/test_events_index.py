@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from soma.core.events import JsonlEventLog, index_path, iter_events, load_index
+
+
+def _write(path: Path, ticks: range, *, every: int = 8) -> None:
+    log = JsonlEventLog(path, index_every=every)
+    for t in ticks:
+        log.write({"type": "tick", "tick": t, "v": t * 2})
+        if t % 5 == 0:
+            log.write({"type": "note", "tick": None, "payload": {"at": t}})
+    log.close()
+
+
+class TestEventIndex(unittest.TestCase):
+    def test_range_matches_filtered_scan(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "events.jsonl"
+            _write(path, range(200))
+            self.assertTrue(index_path(path).stat().st_size > 0)
+            full = list(iter_events(path))
+            for start, end in ((0, 10), (37, 91), (150, None), (199, 200), (300, None)):
+                want, inside = [], False
+                for e in full:
+                    t = e.get("tick")
+                    if isinstance(t, int):
+                        inside = t >= start and (end is None or t < end)
+                    if inside:
+                        want.append(e)
+                self.assertEqual(list(iter_events(path, start, end)), want, (start, end))
+
+    def test_missing_or_corrupt_index_is_rebuilt(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "events.jsonl"
+            _write(path, range(100))
+            want = list(iter_events(path, 40, 60))
+            index_path(path).unlink()
+            self.assertEqual(list(iter_events(path, 40, 60)), want)
+            index_path(path).write_bytes(b"\x07" * 48)
+            self.assertEqual(list(iter_events(path, 40, 60)), want)
+            entries = load_index(path)
+            self.assertEqual(entries, sorted(entries))
+            self.assertEqual(entries[0], (0, 0))
+
+    def test_torn_line_and_reopen(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "events.jsonl"
+            _write(path, range(30))
+            with path.open("ab") as fh:
+                fh.write(b'{"type": "tick", "tick": 30, "v"')  # crash mid-line
+            self.assertEqual(max(e["tick"] for e in iter_events(path) if e["tick"] is not None), 29)
+            _write(path, range(30, 60))
+            ticks = [e["tick"] for e in iter_events(path) if e["type"] == "tick"]
+            self.assertEqual(ticks, list(range(60)))
+            self.assertEqual([e["tick"] for e in iter_events(path, 45, 47)], [45, None, 46])  # the note after tick 45 belongs to it
+            self.assertEqual(json.loads(path.read_text(encoding="utf-8").splitlines()[-1])["tick"], 59)
+
+    def test_reopen_rebuilds_a_stale_index_at_the_log_stride(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "events.jsonl"
+            _write(path, range(40))
+            index_path(path).unlink()
+            _write(path, range(40, 80))
+            self.assertEqual([t for t, _ in load_index(path)], list(range(0, 80, 8)))
+
+
+if __name__ == "__main__":
+    unittest.main()
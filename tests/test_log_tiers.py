@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from soma.cogs.self_notes.notes import SelfNotes
+from soma.core.tick import run_loop
+from soma.eval.metrics import compute_metrics, iter_events
+
+
+class _Capture:
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event, *, event_type=None, tick=None):
+        self.events.append(event)
+
+
+class TestLogTiers(unittest.TestCase):
+    def test_sampled_run_keeps_metrics(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out, sizes = {}, {}
+            for name, every in (("full", 1), ("sampled", 10)):
+                run_dir = Path(tmp) / name
+                run_dir.mkdir()
+                run_loop(ticks=80, seed=5, run_dir=run_dir, run_id=name, quiet=True, full_every=every)
+                sizes[name] = (run_dir / "events.jsonl").stat().st_size
+                out[name] = {src: compute_metrics(run_dir, source=src) for src in ("jsonl", "sqlite")}
+                ticks = [e for e in iter_events(run_dir) if e["type"] == "tick"]
+                self.assertEqual([e["tick"] for e in ticks], list(range(80)))
+            self.assertLess(sizes["sampled"], sizes["full"])
+            full, sampled = out["full"]["jsonl"], out["sampled"]["jsonl"]
+            for key in ("novelty", "memory", "symbols", "coverage", "caregiver"):
+                self.assertEqual(sampled[key], full[key], key)
+            self.assertEqual(full["counts"]["full_ticks"], 80)
+            self.assertLess(sampled["counts"]["full_ticks"], 80)
+            self.assertGreaterEqual(sampled["counts"]["full_ticks"], 8)  # every 10th tick at least
+            self.assertEqual(out["sampled"]["sqlite"]["counts"], sampled["counts"])
+
+    def test_note_levels(self):
+        cap = _Capture()
+        notes = SelfNotes(cap, levels={"curiosity": "brief", "reflex": "off"})
+        notes.note("curiosity", {"tick": 1, "novelty": 0.9, "attention": ["A"]}, tick=1)
+        notes.note("reflex", {"tick": 1, "triggers": ["overload"]}, tick=1)
+        notes.note("symbol", {"tick": 1, "emit": ["N!"]}, tick=1)
+        self.assertEqual([e["kind"] for e in cap.events], ["curiosity", "symbol"])
+        self.assertEqual(cap.events[0]["payload"], {"tick": 1, "novelty": 0.9})
+        self.assertEqual(cap.events[1]["payload"], {"tick": 1, "emit": ["N!"]})
+        with self.assertRaises(ValueError):
+            SelfNotes(cap, levels={"*": "loud"})
+
+
+if __name__ == "__main__":
+    unittest.main()
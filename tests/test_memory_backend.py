@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import random
+import unittest
+
+from soma.cogs.memory.memory import MemorySystem
+from soma.compat import np
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestNumpyBackend(unittest.TestCase):
+    def test_matches_list_backend_across_eviction(self):
+        rng = random.Random(7)
+        prev = [1.0] * 16
+        ref = MemorySystem(dim=16, max_items=40)
+        arr = MemorySystem(dim=16, max_items=40, backend="numpy")
+        for t in range(130):
+            # sparse non-negative vectors with exact repeats (ties) and empty views
+            v = [rng.random() if rng.random() < 0.3 else 0.0 for _ in range(16)]
+            if t % 7 == 0:
+                v = list(prev)
+            if t % 9 == 0:
+                v = [0.0] * 16
+            prev = v
+            q = v if t % 5 else [float(rng.random()) for _ in range(16)]
+            for top_k, min_score in ((3, 0.5), (5, 0.0), (50, 0.2)):
+                a = ref.query(q, top_k=top_k, min_score=min_score)
+                b = arr.query(q, top_k=top_k, min_score=min_score)
+                self.assertEqual([x[0] for x in a], [x[0] for x in b])
+                for (_, sa), (_, sb) in zip(a, b):
+                    self.assertAlmostEqual(sa, sb, places=12)
+            ref.add_vector(tick=t, vector=v)
+            arr.add_vector(tick=t, vector=v)
+            self.assertEqual(len(ref), len(arr))
+
+
+if __name__ == "__main__":
+    unittest.main()
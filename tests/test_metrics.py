@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from soma.core.tick import run_loop
+from soma.eval.metrics import QuantileSketch, compute_metrics, p95
+
+
+def _tick(i: int, rng: random.Random) -> dict:
+    nov = rng.choice([0.0, 1.0, round(rng.random(), 6)])
+    toks = rng.choice([[], ["N!"], ["N!", "?"], ["Stab↓"]])
+    return {
+        "type": "tick",
+        "tick": i,
+        "curiosity": {"novelty": nov},
+        "recall": [{"tick": 0, "score": round(rng.random(), 6)}] if i else [],
+        "state": {"coverage": i / 1000.0},
+        "channel": {"tokens": toks, "caregiver_gloss": []},
+    }
+
+
+class TestStreamingMetrics(unittest.TestCase):
+    def test_sketch_close_to_exact(self):
+        rng = random.Random(0)
+        xs = [rng.random() for _ in range(5000)] + [0.0] * 100
+        sk = QuantileSketch()
+        for x in xs:
+            sk.add(x)
+        self.assertAlmostEqual(sk.quantile(0.95), p95(xs), delta=0.01 * p95(xs))
+        self.assertEqual(sk.quantile(1.0), max(xs))
+
+    def test_single_pass_matches_series(self):
+        rng = random.Random(1)
+        with tempfile.TemporaryDirectory() as d:
+            with (Path(d) / "events.jsonl").open("w", encoding="utf-8") as f:
+                for i in range(300):
+                    f.write(json.dumps(_tick(i, rng)) + "\n")
+                    f.write(json.dumps({"type": "note", "payload": {"novelty": 1.0}}) + "\n")
+                f.write('{"type": "tick", "tick": 30')  # torn last line is ignored
+            lean = compute_metrics(Path(d), series=False)
+            full = compute_metrics(Path(d))
+
+        self.assertNotIn("timeseries", lean)
+        self.assertIn("timeseries", full)  # the default keeps the pre-streaming result shape
+        self.assertEqual(len(lean["rows"]), 20)
+        self.assertEqual(len(full["rows"]), 300)
+        ts = full["timeseries"]
+        self.assertEqual(lean["counts"]["ticks"], 300)
+        self.assertEqual(lean["counts"]["notes"], 300)
+        self.assertAlmostEqual(lean["novelty"]["mean"], sum(ts["novelty"]) / 300)
+        self.assertAlmostEqual(lean["novelty"]["p95"], p95(ts["novelty"]), delta=0.01)
+        self.assertEqual(lean["coverage"]["final"], ts["coverage"][-1])
+        for key in ("memory", "symbols", "caregiver"):
+            self.assertEqual(lean[key], full[key])
+
+    def test_sqlite_source_matches_jsonl(self):
+        with tempfile.TemporaryDirectory() as d:
+            run_loop(ticks=60, seed=3, run_dir=Path(d), run_id="m", env_name="grid-v1", size=7, n_objects=8, quiet=True)
+            from_sql = compute_metrics(Path(d), series=True)
+            from_jsonl = compute_metrics(Path(d), series=True, source="jsonl")
+        self.assertEqual(from_sql.pop("source"), "sqlite")
+        self.assertEqual(from_jsonl.pop("source"), "jsonl")
+        self.assertEqual(from_sql, from_jsonl)
+
+
+if __name__ == "__main__":
+    unittest.main()
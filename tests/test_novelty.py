@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import math
 import unittest
 
 from soma.cogs.curiosity.curiosity import CuriosityEngine
@@ -19,6 +20,19 @@ class TestNovelty(unittest.TestCase):
         out = cur.assess(tick=0, summary=summary, matches=[], memory=mem)
         self.assertGreaterEqual(out.get("novelty", 0.0), 0.9)
 
+    def test_rarity_tracks_memory_doc_freq_through_eviction(self):
+        cur = CuriosityEngine(notes=_NotesStub(), top_k=2)
+        mem = MemorySystem(dim=8, max_items=3)
+        views = [["Ro"], ["Ro", "G^"], ["Ro"], ["Bs"], ["Bs", "G^"]]
+        for t, uniq in enumerate(views):
+            mem.add_vector(tick=t, vector=[1.0] * 8, meta={"features": {"unique": uniq}})
+        # only the last three views remain: Ro x1, Bs x2, G^ x1
+        self.assertEqual(mem.doc_freq, {"Ro": 1, "Bs": 2, "G^": 1})
+        out = cur.assess(tick=5, summary={"unique": ["Bs", "Yo"]}, matches=[], memory=mem)
+        self.assertEqual(out["attention"], ["Bs", "Yo"])  # both new vs. empty previous view
+        expected = (math.log(4 / 3) / math.log(4) + 1.0) / 2.0
+        self.assertAlmostEqual(out["rarity"], expected, places=9)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
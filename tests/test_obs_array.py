@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from soma.cogs.perception.features import extract_features
+from soma.compat import np
+from soma.core.tick import run_loop
+from soma.sandbox import GridWorldV0, GridWorldV1
+from soma.sandbox.codes import decode_view
+from tests.test_batch import _events
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestArrayObservations(unittest.TestCase):
+    def test_matches_token_observations(self):
+        for env_cls in (GridWorldV0, GridWorldV1):
+            for size, n_objects, radius in ((9, 18, 1), (15, 60, 3), (5, 12, 4)):
+                for seed in range(2):
+                    ref = env_cls(size=size, n_objects=n_objects, view_radius=radius)
+                    arr = env_cls(size=size, n_objects=n_objects, view_radius=radius, obs_mode="array")
+                    a, b = ref.reset(seed), arr.reset(seed)
+                    actions = random.Random(seed)
+                    for t in range(150):
+                        ctx = (env_cls.__name__, size, radius, seed, t)
+                        self.assertFalse(b["view"].flags.writeable)
+                        self.assertEqual(decode_view(b["view"], agent_mark=b["agent_mark"]), a["view"], ctx)
+                        self.assertEqual(b["summary"], a["summary"], ctx)
+                        self.assertEqual(extract_features(b, grid_size=size), extract_features(a, grid_size=size), ctx)
+                        act = actions.choice(["up", "down", "left", "right", "noop", "ping", "ping"])
+                        (a, ia), (b, ib) = ref.step(act), arr.step(act)
+                        self.assertEqual(ia, ib, ctx)
+
+    def test_run_identical(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            dirs = []
+            for mode in ("tokens", "array"):
+                d = Path(tmp) / mode
+                d.mkdir()
+                run_loop(ticks=80, seed=3, run_dir=d, run_id="r", env_name="grid-v1", quiet=True, obs_mode=mode, sinks=["jsonl"])
+                dirs.append(d)
+            self.assertEqual(_events(dirs[0]), _events(dirs[1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
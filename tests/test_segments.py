@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from soma.core.segments import SegmentedEventLog, iter_segment_events, load_manifest
+from soma.core.tick import run_loop
+from soma.eval.metrics import compute_metrics
+
+
+def _events(ticks: range):
+    for t in ticks:
+        yield {"type": "tick", "tick": t, "pad": "x" * 40}
+        if t % 7 == 0:
+            yield {"type": "note", "tick": None, "payload": {"at": t}}
+
+
+class TestSegmentedEventLog(unittest.TestCase):
+    def test_rotation_compression_and_reads(self):
+        for compress, suffix in (("gzip", ".gz"), ("lzma", ".xz")):
+            with tempfile.TemporaryDirectory() as tmp:
+                d = Path(tmp) / "events"
+                log = SegmentedEventLog(d, max_ticks=25, compress=compress)
+                written = list(_events(range(100)))
+                for e in written:
+                    log.write(e)
+                log.close()
+                segs = load_manifest(d)
+                self.assertEqual([(s["first_tick"], s["last_tick"]) for s in segs], [(0, 24), (25, 49), (50, 74), (75, 99)])
+                self.assertTrue(all(s["file"].endswith(suffix) and not s["active"] for s in segs))
+                self.assertEqual(sorted(p.name for p in d.iterdir()), sorted([s["file"] for s in segs] + ["manifest.json"]))
+                self.assertEqual(list(iter_segment_events(d)), written)
+                window = [e for e in iter_segment_events(d, 40, 60)]
+                self.assertEqual([e["tick"] for e in window if e["type"] == "tick"], list(range(40, 60)))
+                self.assertEqual(sum(e["type"] == "note" for e in window), 3)  # after ticks 42, 49, 56
+
+    def test_size_rotation_keeps_ticks_whole_and_reopen_appends(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            d = Path(tmp) / "events"
+            log = SegmentedEventLog(d, max_bytes=500, compress="none")
+            for e in _events(range(30)):
+                log.write(e)
+                log.write(dict(e, type="extra"))  # same tick: never split from its tick event
+            log.close()
+            log = SegmentedEventLog(d, max_bytes=500, compress="gzip")
+            for e in _events(range(30, 40)):
+                log.write(e)
+            log.close()
+            segs = load_manifest(d)
+            self.assertGreater(len(segs), 5)
+            self.assertTrue(all(s["file"].endswith(".gz") for s in segs))  # reopen compressed the old ones
+            for a, b in zip(segs, segs[1:]):
+                self.assertLess(a["last_tick"], b["first_tick"])
+            ticks = [e["tick"] for e in iter_segment_events(d) if e["type"] == "tick"]
+            self.assertEqual(ticks, list(range(40)))
+
+    def test_run_loop_metrics_match_plain_log(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = {}
+            for name, kw in (("plain", {}), ("seg", {"segment_ticks": 16})):
+                run_dir = Path(tmp) / name
+                run_dir.mkdir()
+                run_loop(ticks=60, seed=3, run_dir=run_dir, run_id=name, quiet=True, **kw)
+                out[name] = compute_metrics(run_dir, source="jsonl")
+            self.assertFalse((Path(tmp) / "seg" / "events.jsonl").exists())
+            self.assertGreater(len(load_manifest(Path(tmp) / "seg" / "events")), 3)
+            for key in ("counts", "novelty", "memory", "symbols"):
+                self.assertEqual(out["seg"][key], out["plain"][key], key)
+
+
+if __name__ == "__main__":
+    unittest.main()
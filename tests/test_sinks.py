@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from soma.core import sinks as sinks_mod
+from soma.core.sinks import EventSinks, NullSink, open_sinks, parse_sinks
+from soma.core.tick import run_loop
+
+
+class TestEventSinks(unittest.TestCase):
+    def test_serialized_once_and_shared(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            run_dir = Path(tmp)
+            out = open_sinks(run_dir, "r", ["jsonl", "sqlite", "null"])
+            with mock.patch.object(sinks_mod.json, "dumps", wraps=json.dumps) as dumps:
+                out.emit({"type": "tick", "tick": 3, "x": "é"})
+                out.emit({"type": "note", "kind": "k", "payload": {}}, tick=-1)
+                self.assertEqual(dumps.call_count, 2)
+            out.close()
+            lines = (run_dir / "events.jsonl").read_text(encoding="utf-8").splitlines()
+            conn = sqlite3.connect(str(run_dir / "events.sqlite"))
+            try:
+                rows = conn.execute("SELECT tick, type, data FROM events ORDER BY id").fetchall()
+            finally:
+                conn.close()
+        self.assertEqual([r[2] for r in rows], lines)
+        self.assertEqual([(r[0], r[1]) for r in rows], [(3, "tick"), (-1, "note")])
+
+    def test_binary_and_null_skip_json(self):
+        seen = []
+
+        class Recorder(NullSink):
+            def write_encoded(self, ev):
+                seen.append(ev)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            out = open_sinks(Path(tmp), "r", ["binary", "null"])
+            out.sinks.append(Recorder())
+            out.emit({"type": "tick", "tick": 0})
+            out.close()
+            self.assertIsNone(seen[0]._text)  # JSON text never built
+            self.assertEqual(sorted(p.name for p in Path(tmp).iterdir()), ["events.bin", "events.bin.idx", "events.bin.keys"])
+
+    def test_run_with_selected_sinks(self):
+        self.assertEqual(parse_sinks("jsonl, sqlite"), ["jsonl", "sqlite"])
+        with self.assertRaises(ValueError):
+            parse_sinks("jsonl,csv")
+        with tempfile.TemporaryDirectory() as tmp:
+            run_dir = Path(tmp)
+            run_loop(ticks=10, seed=1, run_dir=run_dir, run_id="r", quiet=True, sinks=["null"])
+            self.assertFalse((run_dir / "events.jsonl").exists())
+            self.assertFalse((run_dir / "events.sqlite").exists())
+            meta = json.loads((run_dir / "meta.json").read_text(encoding="utf-8"))
+            self.assertEqual(meta["store"]["sinks"], ["null"])
+
+    def test_close_reaches_every_sink(self):
+        closed = []
+
+        class Failing(NullSink):
+            def __init__(self, name, error=None):
+                self.name, self.error = name, error
+
+            def close(self):
+                closed.append(self.name)
+                if self.error is not None:
+                    raise self.error
+
+        sinks = EventSinks([Failing("a", OSError("first")), Failing("b", ValueError("second")), Failing("c")])
+        with self.assertRaisesRegex(OSError, "first"):
+            sinks.close()
+        self.assertEqual(closed, ["a", "b", "c"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import random
+import unittest
+
+from soma.compat import np
+from soma.sandbox import GridWorldV0, GridWorldV1
+from soma.sandbox.codes import loggable
+
+ACTS = ["up", "down", "left", "right", "noop", "ping", "ping"]
+
+
+def _trace(env, actions):
+    out = []
+    for a in actions:
+        obs, info = env.step(a)
+        out.append((loggable(obs), info))
+    return out
+
+
+class TestSnapshot(unittest.TestCase):
+    def _configs(self):
+        modes = ["tokens", "array"] if np is not None else ["tokens"]
+        for cls, size, n_objects in ((GridWorldV0, 9, 18), (GridWorldV1, 7, 14)):
+            for mode in modes:
+                yield cls, dict(size=size, n_objects=n_objects, view_radius=2, obs_mode=mode)
+        yield GridWorldV0, dict(size=301, n_objects=9000, view_radius=2, chunk=16)
+
+    def test_restore_replays_the_same_future(self):
+        for cls, kw in self._configs():
+            env = cls(**kw)
+            env.reset(7)
+            rng = random.Random(1)
+            _trace(env, [rng.choice(ACTS) for _ in range(40)])
+            snap = env.snapshot()
+            future = [rng.choice(ACTS) for _ in range(120)]
+            expected = _trace(env, future)
+            # branch off with other actions, then come back twice
+            for k in range(2):
+                env.restore(snap)
+                _trace(env, [rng.choice(ACTS) for _ in range(30 + k)])
+                env.restore(snap)
+                self.assertEqual(_trace(env, future), expected, (cls.__name__, kw, k))
+
+    def test_restore_into_another_env(self):
+        for cls, kw in self._configs():
+            a, b = cls(**kw), cls(**kw)
+            a.reset(3)
+            b.reset(4)
+            rng = random.Random(2)
+            _trace(a, [rng.choice(ACTS) for _ in range(25)])
+            snap = a.snapshot()
+            future = [rng.choice(ACTS) for _ in range(80)]
+            self.assertEqual(loggable(b.restore(snap)), loggable(a.restore(snap)))
+            self.assertEqual(_trace(b, future), _trace(a, future), (cls.__name__, kw))
+            # an older episode's snapshot after a fresh reset
+            a.reset(9)
+            a.restore(snap)
+            b.restore(snap)
+            self.assertEqual(_trace(a, future), _trace(b, future), (cls.__name__, kw))
+
+    def test_v1_snapshot_covers_door_and_pads(self):
+        env = GridWorldV1(size=5, n_objects=6, view_radius=1)
+        env.reset(0)
+        rng = random.Random(0)
+        while env._get_door().state["timer"] == 0:
+            env.step(rng.choice(ACTS))
+        env._pads_seq.append((env.tick, "G"))
+        snap = env.snapshot()
+        hash(snap)  # tuples all the way down
+        door = env._get_door().state.copy()
+        for _ in range(20):
+            env.step("noop")
+        env.restore(snap)
+        self.assertEqual(env._get_door().state, door)
+        self.assertEqual(env._pads_seq[-1], (snap.tick, "G"))
+        self.assertEqual(env.tick, snap.tick)
+
+    def test_mismatched_env_rejected(self):
+        env = GridWorldV1(size=7, n_objects=10)
+        env.reset(0)
+        with self.assertRaises(ValueError):
+            GridWorldV1(size=9, n_objects=10).restore(env.snapshot())
+        v0 = GridWorldV0(size=9)
+        v0.reset(0)
+        with self.assertRaises(ValueError):
+            GridWorldV0(size=9, chunk=4).restore(v0.snapshot())
+        with self.assertRaises(ValueError):
+            GridWorldV0(size=9, view_radius=2).restore(v0.snapshot())
+        chunked = GridWorldV0(size=41, chunk=8)
+        chunked.reset(0)
+        with self.assertRaises(ValueError):
+            GridWorldV0(size=41, chunk=16).restore(chunked.snapshot())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from soma.cogs.memory.ann import LSHIndex
+from soma.cogs.memory.memory import MemorySystem
+from soma.cogs.memory.sparse import SparseVector
+from soma.cogs.perception.embedder import PerceptionEmbedderV2
+from soma.core.tick import run_loop
+from tests.test_batch import _events
+from tests.test_embedder import _walk_features
+
+
+class TestSparseVectors(unittest.TestCase):
+    def test_embed_sparse_matches_dense(self):
+        for dim in (64, 1024):
+            emb = PerceptionEmbedderV2(dim=dim)
+            for f in _walk_features("grid-v0", 100, 5) + [{}]:
+                sv = emb.embed_sparse(f)
+                self.assertEqual(sv.to_dense(), emb.embed(f))
+                self.assertLessEqual(sv.nnz, 15 + len(f.get("counts", {})))
+
+    def test_sparse_backend_matches_list_backend(self):
+        rng = random.Random(3)
+        emb = PerceptionEmbedderV2(dim=256)
+        feats = _walk_features("grid-v0", 160, 6)
+        ref = MemorySystem(dim=256, max_items=50)
+        sp = MemorySystem(dim=256, max_items=50, backend="sparse")
+        for t, f in enumerate(feats):
+            dense, sparse = emb.embed(f), emb.embed_sparse(f)
+            for top_k, min_score in ((3, 0.5), (10, 0.0)):
+                want = ref.query(dense, top_k=top_k, min_score=min_score)
+                self.assertEqual(sp.query(sparse, top_k=top_k, min_score=min_score), want)
+                self.assertEqual(sp.query(dense, top_k=top_k, min_score=min_score), want)  # dense in, sparse inside
+            ref.add_vector(tick=t, vector=dense)
+            sp.add_vector(tick=t, vector=sparse if rng.random() < 0.5 else dense)
+        self.assertEqual(len(sp), 50)
+        self.assertTrue(all(isinstance(v, SparseVector) for v in sp.vecs))
+
+    def test_sparse_backend_with_lsh_index(self):
+        emb = PerceptionEmbedderV2(dim=512)
+        feats = _walk_features("grid-v0", 80, 8)
+        ref = MemorySystem(dim=512, max_items=40, index=LSHIndex(512, n_bits=8, seed=1))
+        sp = MemorySystem(dim=512, max_items=40, backend="sparse", index=LSHIndex(512, n_bits=8, seed=1))
+        for t, f in enumerate(feats):
+            self.assertEqual(sp.query(emb.embed_sparse(f), min_score=0.0), ref.query(emb.embed(f), min_score=0.0))
+            ref.add_vector(tick=t, vector=emb.embed(f))
+            sp.add_vector(tick=t, vector=emb.embed_sparse(f))
+
+    def test_run_with_large_dim(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            runs = {}
+            for backend in ("list", "sparse"):
+                d = Path(tmp) / backend
+                d.mkdir()
+                run_loop(ticks=30, seed=2, run_dir=d, run_id=backend, quiet=True, memory_backend=backend, dim=1024)
+                runs[backend] = _events(d)
+            meta = json.loads((Path(tmp) / "sparse" / "meta.json").read_text())
+            self.assertEqual((meta["perception"]["dim"], meta["memory"]["dim"]), (1024, 1024))
+            self.assertEqual(runs["list"], runs["sparse"])
+
+
+if __name__ == "__main__":
+    unittest.main()
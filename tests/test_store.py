@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from soma.core.store import EventStore
+
+
+def _count(db: Path) -> int:
+    conn = sqlite3.connect(str(db))
+    try:
+        return conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class TestBufferedStore(unittest.TestCase):
+    def test_group_commit_and_flush_on_close(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Path(tmp) / "events.sqlite"
+            st = EventStore(db, run_id="r", buffered=True, synchronous="NORMAL", commit_every=4, commit_interval=3600)
+            for t in range(6):
+                st.write(event_type="tick", tick=t, payload={"tick": t})
+            self.assertEqual(_count(db), 4)  # one group committed, two rows pending
+            st.close()
+            self.assertEqual(_count(db), 6)
+
+    def test_close_reports_flush_errors(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            st = EventStore(Path(tmp) / "events.sqlite", run_id="r", buffered=True, commit_every=100, commit_interval=3600)
+            st.write(event_type="tick", tick=0, payload={"tick": 0})
+            st.conn.execute("DROP TABLE events")
+            with self.assertRaises(sqlite3.OperationalError):
+                st.close()
+            with self.assertRaises(sqlite3.ProgrammingError):  # closed all the same
+                st.conn.execute("SELECT 1")
+
+    def test_rejects_unknown_synchronous(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(ValueError):
+                EventStore(Path(tmp) / "events.sqlite", run_id="r", synchronous="NORMAL; DROP TABLE events")
+            EventStore(Path(tmp) / "events.sqlite", run_id="r", synchronous="extra").close()
+
+    def test_tick_metrics_columns(self):
+        payload = {
+            "curiosity": {"novelty": 0.9, "change": 0.5, "rarity": 0.25},
+            "recall": [{"tick": 1, "score": 0.4}, {"tick": 2, "score": 0.7}],
+            "motivation": {"dominant": "curiosity"},
+            "planner": {"behavior": "explore"},
+            "action_final": "up",
+            "staleness": {"boredom": 0.1},
+            "state": {"coverage": 0.3},
+            "channel": {"tokens": ["N!", "?"], "caregiver_gloss": [["N!", "new"]]},
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Path(tmp) / "events.sqlite"
+            st = EventStore(db, run_id="r")
+            st.write(event_type="tick", tick=7, payload=payload)
+            st.write(event_type="note", tick=7, payload={"type": "note"})
+            st.close()
+            conn = sqlite3.connect(str(db))
+            try:
+                rows = conn.execute("SELECT * FROM tick_metrics").fetchall()
+            finally:
+                conn.close()
+        self.assertEqual(rows, [("r", 7, 0.9, 0.5, 0.25, 0.1, "curiosity", "explore", "up", 0.7, 0.3, "N! ?", 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from soma.core.catalog import find_runs
+from soma.core.sweep import DONE_FILE, cell_id, cell_options, expand_grid, parse_param, parse_seeds, run_sweep
+
+
+class TestSweep(unittest.TestCase):
+    def test_grid_and_ids(self):
+        cells = expand_grid(
+            seeds=parse_seeds("0-1,5"),
+            envs=["grid-v0", "grid-v1"],
+            sizes=[7],
+            n_objects=[6],
+            view_radii=[1],
+            params=[parse_param("curiosity.novelty_threshold=0.5,0.7")],
+        )
+        self.assertEqual(len(cells), 12)
+        ids = [cell_id(c, 10) for c in cells]
+        self.assertEqual(len(set(ids)), 12)
+        self.assertEqual(ids, [cell_id(c, 10) for c in cells])  # deterministic
+        self.assertNotEqual(cell_id(cells[0], 10), cell_id(cells[0], 11))
+        self.assertNotEqual(cell_id(cells[0], 10), cell_id(cells[0], 10, {"memory_backend": "sparse"}))
+        self.assertEqual(cell_id(cells[0], 10), cell_id(cells[0], 10, cell_options({"catalog": Path("runs")})))
+        with self.assertRaises(ValueError):
+            expand_grid(seeds=[0], envs=["grid-v0"], sizes=[7], n_objects=[6], view_radii=[1], params=[("curiosity", "nope", [1])])
+
+    def test_resume_skips_finished_cells(self):
+        cells = expand_grid(
+            seeds=[0, 1], envs=["grid-v0"], sizes=[7], n_objects=[6], view_radii=[1], params=[("reflex", "overload_unique_threshold", [4])]
+        )
+        with tempfile.TemporaryDirectory() as d:
+            ran = []
+            rows, errors = run_sweep(Path(d), cells, ticks=5, on_result=lambda cid, row, err: ran.append(cid))
+            self.assertEqual(errors, {})
+            self.assertEqual([r["seed"] for r in rows], [0, 1])
+            self.assertEqual(rows[0]["reflex.overload_unique_threshold"], 4)
+            meta = json.loads((Path(d) / rows[0]["cell"] / "meta.json").read_text(encoding="utf-8"))
+            self.assertEqual(meta["cogs"]["reflex"]["overload_unique_threshold"], 4)
+
+            # an interrupted cell (no done marker) is rerun; finished ones are reused
+            (Path(d) / rows[1]["cell"] / DONE_FILE).unlink()
+            done_before = (Path(d) / rows[0]["cell"] / DONE_FILE).stat().st_mtime_ns
+            rows2, _ = run_sweep(Path(d), cells, ticks=5)
+            self.assertEqual(rows2, rows)
+            self.assertEqual((Path(d) / rows[0]["cell"] / DONE_FILE).stat().st_mtime_ns, done_before)
+            self.assertTrue((Path(d) / rows[1]["cell"] / DONE_FILE).exists())
+
+            # other run options are other cells, not a resume
+            rows3, _ = run_sweep(Path(d), cells, ticks=5, run_kwargs={"dim": 32})
+            self.assertTrue(set(r["cell"] for r in rows3).isdisjoint(r["cell"] for r in rows))
+
+    def test_run_ids_unique_across_sweeps(self):
+        cells = expand_grid(seeds=[0], envs=["grid-v0"], sizes=[7], n_objects=[6], view_radii=[1])
+        with tempfile.TemporaryDirectory() as d:
+            runs = Path(d)
+            for name in ("a", "b"):
+                run_sweep(runs / name, cells, ticks=5, run_kwargs={"catalog": runs})
+            found = sorted((r["run_id"], r["path"]) for r in find_runs(runs))
+            cid = cell_id(cells[0], 5)
+            self.assertEqual(found, [(f"a/{cid}", f"a/{cid}"), (f"b/{cid}", f"b/{cid}")])
+
+    def test_quiet_cells_build_no_console_table(self):
+        cells = expand_grid(seeds=[0], envs=["grid-v0"], sizes=[7], n_objects=[6], view_radii=[1])
+        with tempfile.TemporaryDirectory() as d, mock.patch("soma.core.tick.Table") as table:
+            _, errors = run_sweep(Path(d), cells, ticks=5)
+        self.assertEqual(errors, {})
+        table.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
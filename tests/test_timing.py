@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from soma.core.tick import run_loop
+from soma.core.timing import LatencyHistogram, PhaseTimer, load_profile
+from soma.eval.metrics import compute_metrics
+from soma.eval.report import build_markdown
+
+
+class TestTiming(unittest.TestCase):
+    def test_histogram_quantiles(self):
+        h = LatencyHistogram()
+        for ns in range(1000, 101000, 100):  # uniform 1µs..101µs
+            h.add(ns)
+        for q in (0.5, 0.95, 0.99):
+            exact = 1000 + q * 100000
+            self.assertAlmostEqual(h.quantile(q) / exact, 1.0, delta=0.05)
+        h2 = LatencyHistogram.from_dict(h.to_dict())
+        self.assertEqual(h2.quantile(0.95), h.quantile(0.95))
+
+    def test_disabled_timer_records_nothing(self):
+        t = PhaseTimer(enabled=False)
+        with t.phase("tick"):
+            with t.phase("recall"):
+                pass
+        self.assertEqual(t.hists, {})
+
+    def test_profile_in_report(self):
+        with tempfile.TemporaryDirectory() as d:
+            run_loop(ticks=10, seed=1, run_dir=Path(d), run_id="prof", size=7, n_objects=6, quiet=True, profile=True)
+            phases = load_profile(Path(d))["phases"]
+            self.assertEqual(phases["tick"]["count"], 10)
+            self.assertEqual(phases["recall"]["count"], 10)
+            self.assertLessEqual(sum(p["share"] for n, p in phases.items() if n != "tick"), 1.0)
+            md = build_markdown(compute_metrics(Path(d)))
+            self.assertIn("## Tick latency", md)
+            self.assertIn("recall |", md)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import random
+import unittest
+
+from soma.compat import np
+from soma.sandbox import ACTIONS, GridWorldV0, GridWorldV1, make_env
+from soma.sandbox.codes import CODES
+from soma.sandbox.v1.env import Obj
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestVecGridWorld(unittest.TestCase):
+    def _check(self, env_name, env_cls, size, n_objects, radius, *, B=6, ticks=160, max_steps=0, as_index=False):
+        seeds = [11 * b + 3 for b in range(B)]
+        vec = make_env(env_name, size=size, n_objects=n_objects, view_radius=radius, batch=B, max_steps=max_steps)
+        singles = [env_cls(size=size, n_objects=n_objects, view_radius=radius, obs_mode="array") for _ in range(B)]
+        obs = vec.reset(seeds)
+        ref = [e.reset(s) for e, s in zip(singles, seeds)]
+        episodes = [0] * B
+        rng = random.Random(size)
+        for t in range(ticks):
+            for b in range(B):
+                ctx = (env_name, size, radius, b, t)
+                got = vec.obs(b)
+                self.assertEqual(got["agent"], ref[b]["agent"], ctx)
+                self.assertEqual(got["summary"], ref[b]["summary"], ctx)
+                self.assertEqual(got["agent_mark"], ref[b]["agent_mark"], ctx)
+                self.assertTrue(np.array_equal(got["view"], ref[b]["view"]), ctx)
+                self.assertTrue(np.array_equal(obs["view"][b], ref[b]["view"]), ctx)
+                self.assertEqual(obs["agent"][b].tolist(), [ref[b]["agent"]["x"], ref[b]["agent"]["y"]], ctx)
+            acts = [rng.choice(["up", "down", "left", "right", "noop", "ping", "ping"]) for _ in range(B)]
+            obs, info = vec.step(np.array([ACTIONS.index(a) for a in acts]) if as_index else acts)
+            for b in range(B):
+                o, i = singles[b].step(acts[b])
+                self.assertEqual(vec.info_dict(info, b), i, (env_name, b, t))
+                ref[b] = o
+                if info["done"][b]:
+                    episodes[b] += 1
+                    ref[b] = singles[b].reset(seeds[b] + episodes[b] * B)
+            self.assertEqual(list(info["done"]), [bool(max_steps) and (t + 1) % max_steps == 0] * B)
+        return episodes
+
+    def test_v0_matches_single_envs(self):
+        self._check("grid-v0", GridWorldV0, 9, 18, 1)
+        self._check("grid-v0", GridWorldV0, 7, 20, 3, as_index=True)
+
+    def test_v1_matches_single_envs(self):
+        self._check("grid-v1", GridWorldV1, 9, 16, 1)
+        self._check("grid-v1", GridWorldV1, 11, 30, 2, as_index=True)
+
+    def test_v1_door_puzzles(self):
+        # a tiny world keeps the agent near the switch, chameleon and pads
+        vec = make_env("grid-v1", size=5, n_objects=8, view_radius=2, batch=8)
+        vec.reset(list(range(8)))
+        rng = random.Random(0)
+        seen = {"switch_toggle": 0, "chameleon_flip": 0}
+        for _ in range(400):
+            _, info = vec.step([rng.choice(ACTIONS) for _ in range(8)])
+            for k in seen:
+                seen[k] += int(info[k].sum())
+        self.assertGreater(seen["switch_toggle"], 0)
+        self.assertGreater(seen["chameleon_flip"], 0)
+
+    def test_v1_pad_sequence(self):
+        # reset() leaves only the R pad (both pads get oid "pad0"); add a G pad to both sides
+        vec = make_env("grid-v1", size=5, n_objects=6, view_radius=1, batch=1)
+        vec.reset([4])
+        single = GridWorldV1(size=5, n_objects=6, view_radius=1, obs_mode="array")
+        single.reset(4)
+        free = [(x, y) for y in range(5) for x in range(5) if (x, y) not in single._cells and (x, y) != (2, 2)]
+        gx, gy = free[0]
+        single._add_object(Obj(oid="pad1", kind="pad", x=gx, y=gy, color="G", shape="o", state={}))
+        vec.pad_xy[0, 1], vec.pad_color[0, 1] = (gx, gy), 1
+        vec.grids[0, gy + 1, gx + 1] = CODES["PadG"]
+        rng = random.Random(1)
+        opened = 0
+        for t in range(3000):
+            a = rng.choice(["up", "down", "left", "right", "noop"])
+            (o, i), (_, info) = single.step(a), vec.step([a])
+            self.assertEqual(vec.info_dict(info, 0), i, t)
+            self.assertTrue(np.array_equal(vec.obs(0)["view"], o["view"]), t)
+            opened += int(info["pads_open"][0])
+        self.assertGreater(opened, 0)
+
+    def test_auto_reset(self):
+        episodes = self._check("grid-v1", GridWorldV1, 9, 16, 1, B=4, ticks=100, max_steps=30)
+        self.assertEqual(episodes, [3] * 4)
+        self._check("grid-v0", GridWorldV0, 9, 18, 2, B=3, ticks=50, max_steps=7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from soma.cogs.memory.memory import MemorySystem
+from soma.compat import np
+from soma.core.tick import run_loop
+from soma.eval.metrics import compute_metrics
+from soma.eval.report import build_markdown
+from tests.test_batch import _events
+
+
+class TestViewCache(unittest.TestCase):
+    def test_query_since_matches_query(self):
+        backends = ["list", "sparse"] + (["numpy"] if np is not None else [])
+        for backend in backends:
+            rng = random.Random(11)
+            mem = MemorySystem(dim=12, max_items=30, backend=backend)
+            pool = [[float(rng.randint(0, 2)) for _ in range(12)] for _ in range(8)]  # repeats -> ties
+            cached = {}
+            for t in range(200):
+                q = rng.choice(pool)
+                for args in ((3, 0.5), (5, 0.0)):
+                    want = mem.query(q, top_k=args[0], min_score=args[1])
+                    key = (tuple(q), args)
+                    if key in cached:
+                        prev, version = cached[key]
+                        got = mem.query_since(q, prev, version, top_k=args[0], min_score=args[1])
+                        if got is not None:
+                            self.assertEqual(got, want, (backend, t))
+                    cached[key] = (want, mem.version)
+                mem.add_vector(tick=t, vector=rng.choice(pool))
+
+    def test_run_identical_with_and_without_cache(self):
+        backends = ["sparse"] + (["numpy"] if np is not None else [])
+        with tempfile.TemporaryDirectory() as tmp:
+            for backend in backends:
+                runs = {}
+                for cache in (0, 64):
+                    d = Path(tmp) / f"{backend}{cache}"
+                    d.mkdir()
+                    run_loop(
+                        ticks=600, seed=5, run_dir=d, run_id="r", quiet=True, size=7, n_objects=6,
+                        memory_backend=backend, view_cache=cache, sinks=["jsonl"],
+                    )
+                    runs[cache] = d
+                self.assertEqual(_events(runs[0]), _events(runs[64]))
+                self.assertFalse((runs[0] / "view_cache.json").exists())
+                stats = json.loads((runs[64] / "view_cache.json").read_text())
+                self.assertEqual(stats["lookups"], 600)
+                self.assertGreater(stats["hits"], 0)
+                if backend == "sparse":  # the numpy ring always rescans (see MemorySystem.query_since)
+                    self.assertGreater(stats["recall_reused"], 0)
+                md = build_markdown(compute_metrics(runs[64]))
+                self.assertIn("- View cache: ", md)
+
+
+if __name__ == "__main__":
+    unittest.main()
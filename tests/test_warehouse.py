@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from soma.core.sinks import EncodedEvent
+from soma.core import tick as tick_mod
+from soma.core.tick import run_loop
+from soma.core.warehouse import WarehouseSink, connect, find_runs, ingest_run
+
+
+def _tick(t: int):
+    return {"type": "tick", "tick": t, "curiosity": {"novelty": t / 100}, "motivation": {"dominant": "curiosity"}}
+
+
+class TestWarehouse(unittest.TestCase):
+    def test_ingest_and_live_agree(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "runs"
+            db = Path(tmp) / "wh.sqlite"
+            for name, kw in (("a", {}), ("b", {"sinks": ["jsonl"]}), ("live", {"warehouse": db})):
+                run_dir = root / name
+                run_dir.mkdir(parents=True)
+                run_loop(ticks=25, seed=4, run_dir=run_dir, run_id=name, quiet=True, **kw)
+            conn = connect(db)
+            try:
+                self.assertEqual([ingest_run(conn, d) for d in find_runs(root) if d.name != "live"], ["a", "b"])
+                ingest_run(conn, root / "a")  # re-ingest replaces, never duplicates
+                self.assertIsNone(ingest_run(conn, root / "a", replace=False))
+                rows = dict(conn.execute("SELECT run_id, COUNT(*) FROM tick_metrics GROUP BY run_id").fetchall())
+                self.assertEqual(rows, {"a": 25, "b": 25, "live": 25})
+                runs = conn.execute("SELECT run_id, env, seed, ticks, status, ticks_logged FROM runs ORDER BY run_id").fetchall()
+                self.assertEqual([r[1:] for r in runs], [("grid-v0", 4, 25, "done", 25)] * 3)
+                # same seed: sqlite-copied, log-parsed and live rows are identical
+                cols = "tick, novelty, change, rarity, boredom, dominant, behavior, action, top_score, coverage, tokens, gloss_pairs"
+                per_run = [
+                    conn.execute(f"SELECT {cols} FROM tick_metrics WHERE run_id = ? ORDER BY tick", (r,)).fetchall()
+                    for r in ("a", "b", "live")
+                ]
+                self.assertEqual(per_run[0], per_run[1])
+                self.assertEqual(per_run[0], per_run[2])
+            finally:
+                conn.close()
+
+    def test_find_runs_includes_sweep_cells(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            for rel in ("a", "grid/c1", "sweeps/grid/c2"):
+                (root / rel).mkdir(parents=True)
+                (root / rel / "meta.json").write_text("{}", encoding="utf-8")
+            (root / "grid" / "sweep.csv").write_text("", encoding="utf-8")
+            self.assertEqual(find_runs(root), [root / "a", root / "grid/c1", root / "sweeps/grid/c2"])
+            self.assertEqual(find_runs(root / "a"), [root / "a"])
+
+    def test_failed_live_run_can_be_reingested(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            run_dir = Path(tmp) / "runs" / "bad"
+            run_dir.mkdir(parents=True)
+            db = Path(tmp) / "wh.sqlite"
+            real = tick_mod.extract_features
+            calls = []
+
+            def flaky(*args, **kwargs):
+                calls.append(1)
+                if len(calls) > 10:
+                    raise RuntimeError("boom")
+                return real(*args, **kwargs)
+
+            with mock.patch("soma.core.tick.extract_features", side_effect=flaky):
+                with self.assertRaises(RuntimeError):
+                    run_loop(ticks=40, seed=1, run_dir=run_dir, run_id="bad", quiet=True, warehouse=db, view_cache=0)
+            conn = connect(db)
+            try:
+                status, logged = conn.execute("SELECT status, ticks_logged FROM runs WHERE run_id = 'bad'").fetchone()
+                self.assertEqual((status, logged), ("failed", 10))
+                self.assertEqual(ingest_run(conn, run_dir, replace=False), "bad")
+                self.assertEqual(conn.execute("SELECT status FROM runs WHERE run_id = 'bad'").fetchone()[0], "done")
+            finally:
+                conn.close()
+
+    def test_concurrent_live_writers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Path(tmp) / "wh.sqlite"
+            connect(db).close()
+            errors = []
+
+            def writer(run_id: str) -> None:
+                try:
+                    sink = WarehouseSink(db, run_id, {"run_id": run_id}, commit_every=7)
+                    for t in range(200):
+                        sink.write_encoded(EncodedEvent(_tick(t)))
+                    sink.close()
+                except Exception as e:  # pragma: no cover - surfaced below
+                    errors.append(e)
+
+            threads = [threading.Thread(target=writer, args=(f"r{i}",)) for i in range(4)]
+            for th in threads:
+                th.start()
+            for th in threads:
+                th.join()
+            self.assertEqual(errors, [])
+            conn = connect(db)
+            try:
+                self.assertEqual(conn.execute("SELECT COUNT(*) FROM tick_metrics").fetchone()[0], 800)
+                self.assertEqual(conn.execute("SELECT COUNT(*) FROM runs WHERE status = 'done'").fetchone()[0], 4)
+            finally:
+                conn.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
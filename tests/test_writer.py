@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import unittest
+
+from soma.core.writer import BackgroundWriter, WriterError
+
+
+class TestBackgroundWriter(unittest.TestCase):
+    def test_close_drains_queue_in_order(self):
+        out = []
+        w = BackgroundWriter(maxsize=2)  # tiny queue exercises backpressure
+        for i in range(50):
+            w.submit(out.append, i)
+        w.close()
+        self.assertEqual(out, list(range(50)))
+
+    def test_error_surfaces_on_tick_thread(self):
+        def boom():
+            raise OSError("disk full")
+
+        w = BackgroundWriter()
+        w.submit(boom)
+        with self.assertRaises(WriterError):
+            w.flush()
+        with self.assertRaises(WriterError):
+            w.submit(print, "never runs")
+        with self.assertRaises(WriterError):
+            w.close()
+
+
+if __name__ == "__main__":
+    unittest.main()